@@ -0,0 +1,8 @@
+-- AlterTable
+ALTER TABLE "SequenceConfig" ADD COLUMN     "allocationBlockSize" INTEGER NOT NULL DEFAULT 1,
+ADD COLUMN     "allowGaps" BOOLEAN NOT NULL DEFAULT false;
+
+-- Enable block allocation for non-fiscal modules (fiscal documents stay gapless)
+UPDATE "SequenceConfig"
+SET "allowGaps" = true, "allocationBlockSize" = 50
+WHERE "moduleCode" IN ('CUST', 'LEAD', 'PROD', 'VEND', 'DEAL', 'QUOT', 'SO', 'TASK', 'ACT');
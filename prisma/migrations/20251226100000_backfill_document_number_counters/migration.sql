@@ -0,0 +1,62 @@
+-- Seed per-year document number counters (Q/PI/SO/INV) from the highest number already issued.
+-- Format: PREFIX-YYYY-NNNN. Counters for later years are created on first use.
+
+-- Quote
+INSERT INTO "SequenceCounter" ("id", "moduleCode", "currentValue", "year", "financialYear", "lastResetAt", "createdAt", "updatedAt")
+SELECT gen_random_uuid()::text, 'DOC-Q', seeded."maxNumber", seeded."year", NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+FROM (
+    SELECT CAST(substring("quoteNumber" FROM '^Q-(\d{4})-\d+$') AS INTEGER) AS "year",
+           MAX(CAST(substring("quoteNumber" FROM '^Q-\d{4}-(\d+)$') AS INTEGER)) AS "maxNumber"
+    FROM "Quote"
+    WHERE "quoteNumber" ~ '^Q-\d{4}-\d+$'
+    GROUP BY 1
+) AS seeded
+WHERE NOT EXISTS (
+    SELECT 1 FROM "SequenceCounter" c
+    WHERE c."moduleCode" = 'DOC-Q' AND c."year" = seeded."year" AND c."financialYear" IS NULL
+);
+
+-- ProformaInvoice
+INSERT INTO "SequenceCounter" ("id", "moduleCode", "currentValue", "year", "financialYear", "lastResetAt", "createdAt", "updatedAt")
+SELECT gen_random_uuid()::text, 'DOC-PI', seeded."maxNumber", seeded."year", NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+FROM (
+    SELECT CAST(substring("proformaNumber" FROM '^PI-(\d{4})-\d+$') AS INTEGER) AS "year",
+           MAX(CAST(substring("proformaNumber" FROM '^PI-\d{4}-(\d+)$') AS INTEGER)) AS "maxNumber"
+    FROM "ProformaInvoice"
+    WHERE "proformaNumber" ~ '^PI-\d{4}-\d+$'
+    GROUP BY 1
+) AS seeded
+WHERE NOT EXISTS (
+    SELECT 1 FROM "SequenceCounter" c
+    WHERE c."moduleCode" = 'DOC-PI' AND c."year" = seeded."year" AND c."financialYear" IS NULL
+);
+
+-- SalesOrder
+INSERT INTO "SequenceCounter" ("id", "moduleCode", "currentValue", "year", "financialYear", "lastResetAt", "createdAt", "updatedAt")
+SELECT gen_random_uuid()::text, 'DOC-SO', seeded."maxNumber", seeded."year", NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+FROM (
+    SELECT CAST(substring("orderNumber" FROM '^SO-(\d{4})-\d+$') AS INTEGER) AS "year",
+           MAX(CAST(substring("orderNumber" FROM '^SO-\d{4}-(\d+)$') AS INTEGER)) AS "maxNumber"
+    FROM "SalesOrder"
+    WHERE "orderNumber" ~ '^SO-\d{4}-\d+$'
+    GROUP BY 1
+) AS seeded
+WHERE NOT EXISTS (
+    SELECT 1 FROM "SequenceCounter" c
+    WHERE c."moduleCode" = 'DOC-SO' AND c."year" = seeded."year" AND c."financialYear" IS NULL
+);
+
+-- Invoice
+INSERT INTO "SequenceCounter" ("id", "moduleCode", "currentValue", "year", "financialYear", "lastResetAt", "createdAt", "updatedAt")
+SELECT gen_random_uuid()::text, 'DOC-INV', seeded."maxNumber", seeded."year", NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+FROM (
+    SELECT CAST(substring("invoiceNumber" FROM '^INV-(\d{4})-\d+$') AS INTEGER) AS "year",
+           MAX(CAST(substring("invoiceNumber" FROM '^INV-\d{4}-(\d+)$') AS INTEGER)) AS "maxNumber"
+    FROM "Invoice"
+    WHERE "invoiceNumber" ~ '^INV-\d{4}-\d+$'
+    GROUP BY 1
+) AS seeded
+WHERE NOT EXISTS (
+    SELECT 1 FROM "SequenceCounter" c
+    WHERE c."moduleCode" = 'DOC-INV' AND c."year" = seeded."year" AND c."financialYear" IS NULL
+);
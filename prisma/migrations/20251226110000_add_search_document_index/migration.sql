@@ -0,0 +1,194 @@
+-- Enable trigram matching for substring / fuzzy search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- CreateTable
+CREATE TABLE "SearchDocument" (
+    "id" TEXT NOT NULL,
+    "entityType" TEXT NOT NULL,
+    "entityId" TEXT NOT NULL,
+    "srplId" TEXT,
+    "title" TEXT NOT NULL,
+    "subtitle" TEXT,
+    "description" TEXT,
+    "ownerId" TEXT,
+    "searchText" TEXT NOT NULL,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "SearchDocument_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "SearchDocument_entityType_entityId_key" ON "SearchDocument"("entityType", "entityId");
+
+-- CreateIndex
+CREATE INDEX "SearchDocument_entityType_ownerId_idx" ON "SearchDocument"("entityType", "ownerId");
+
+-- CreateIndex
+CREATE INDEX "SearchDocument_searchText_idx" ON "SearchDocument" USING GIN ("searchText" gin_trgm_ops);
+
+-- Upsert helper shared by all entity triggers
+CREATE OR REPLACE FUNCTION search_document_upsert(
+    p_entity_type TEXT,
+    p_entity_id TEXT,
+    p_srpl_id TEXT,
+    p_title TEXT,
+    p_subtitle TEXT,
+    p_description TEXT,
+    p_owner_id TEXT,
+    p_search_text TEXT
+) RETURNS void AS $$
+BEGIN
+    INSERT INTO "SearchDocument" ("id", "entityType", "entityId", "srplId", "title", "subtitle", "description", "ownerId", "searchText", "updatedAt")
+    VALUES (gen_random_uuid()::text, p_entity_type, p_entity_id, p_srpl_id, p_title, p_subtitle, p_description, p_owner_id, lower(p_search_text), CURRENT_TIMESTAMP)
+    ON CONFLICT ("entityType", "entityId") DO UPDATE SET
+        "srplId" = EXCLUDED."srplId",
+        "title" = EXCLUDED."title",
+        "subtitle" = EXCLUDED."subtitle",
+        "description" = EXCLUDED."description",
+        "ownerId" = EXCLUDED."ownerId",
+        "searchText" = EXCLUDED."searchText",
+        "updatedAt" = EXCLUDED."updatedAt";
+END;
+$$ LANGUAGE plpgsql;
+
+-- Lead
+CREATE OR REPLACE FUNCTION search_document_sync_lead() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM "SearchDocument" WHERE "entityType" = 'lead' AND "entityId" = OLD."id";
+        RETURN OLD;
+    END IF;
+    PERFORM search_document_upsert('lead', NEW."id", NEW."srplId", NEW."companyName", NEW."contactName", NEW."status", NEW."ownerId",
+        concat_ws(' ', NEW."companyName", NEW."contactName", NEW."email", NEW."phone", NEW."srplId"));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "Lead_search_document_sync"
+AFTER INSERT OR UPDATE OR DELETE ON "Lead"
+FOR EACH ROW EXECUTE FUNCTION search_document_sync_lead();
+
+-- Customer (also refreshes the customer name shown on its deals, quotes and invoices)
+CREATE OR REPLACE FUNCTION search_document_sync_customer() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM "SearchDocument" WHERE "entityType" = 'customer' AND "entityId" = OLD."id";
+        RETURN OLD;
+    END IF;
+    PERFORM search_document_upsert('customer', NEW."id", NEW."srplId", NEW."companyName", COALESCE(NEW."contactName", NEW."contactEmail"), NEW."customerType", NULL,
+        concat_ws(' ', NEW."companyName", NEW."contactName", NEW."contactEmail", NEW."srplId"));
+    IF TG_OP = 'UPDATE' AND NEW."companyName" IS DISTINCT FROM OLD."companyName" THEN
+        UPDATE "SearchDocument" SET "subtitle" = NEW."companyName", "updatedAt" = CURRENT_TIMESTAMP
+        WHERE ("entityType" = 'deal' AND "entityId" IN (SELECT "id" FROM "Deal" WHERE "customerId" = NEW."id"))
+           OR ("entityType" = 'quote' AND "entityId" IN (SELECT "id" FROM "Quote" WHERE "customerId" = NEW."id"))
+           OR ("entityType" = 'invoice' AND "entityId" IN (SELECT "id" FROM "Invoice" WHERE "customerId" = NEW."id"));
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "Customer_search_document_sync"
+AFTER INSERT OR UPDATE OR DELETE ON "Customer"
+FOR EACH ROW EXECUTE FUNCTION search_document_sync_customer();
+
+-- Product (description holds the raw unit price; formatted by the application)
+CREATE OR REPLACE FUNCTION search_document_sync_product() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM "SearchDocument" WHERE "entityType" = 'product' AND "entityId" = OLD."id";
+        RETURN OLD;
+    END IF;
+    PERFORM search_document_upsert('product', NEW."id", NEW."srplId", NEW."name", NEW."sku", NEW."unitPrice"::text, NULL,
+        concat_ws(' ', NEW."name", NEW."sku", NEW."srplId"));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "Product_search_document_sync"
+AFTER INSERT OR UPDATE OR DELETE ON "Product"
+FOR EACH ROW EXECUTE FUNCTION search_document_sync_product();
+
+-- Deal
+CREATE OR REPLACE FUNCTION search_document_sync_deal() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM "SearchDocument" WHERE "entityType" = 'deal' AND "entityId" = OLD."id";
+        RETURN OLD;
+    END IF;
+    PERFORM search_document_upsert('deal', NEW."id", NEW."srplId", NEW."title",
+        (SELECT "companyName" FROM "Customer" WHERE "id" = NEW."customerId"), NEW."stage", NULL,
+        concat_ws(' ', NEW."title", NEW."srplId"));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "Deal_search_document_sync"
+AFTER INSERT OR UPDATE OR DELETE ON "Deal"
+FOR EACH ROW EXECUTE FUNCTION search_document_sync_deal();
+
+-- Quote
+CREATE OR REPLACE FUNCTION search_document_sync_quote() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM "SearchDocument" WHERE "entityType" = 'quote' AND "entityId" = OLD."id";
+        RETURN OLD;
+    END IF;
+    PERFORM search_document_upsert('quote', NEW."id", NEW."srplId", NEW."quoteNumber",
+        (SELECT "companyName" FROM "Customer" WHERE "id" = NEW."customerId"), NEW."status", NULL,
+        concat_ws(' ', NEW."quoteNumber", NEW."srplId"));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "Quote_search_document_sync"
+AFTER INSERT OR UPDATE OR DELETE ON "Quote"
+FOR EACH ROW EXECUTE FUNCTION search_document_sync_quote();
+
+-- Invoice
+CREATE OR REPLACE FUNCTION search_document_sync_invoice() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM "SearchDocument" WHERE "entityType" = 'invoice' AND "entityId" = OLD."id";
+        RETURN OLD;
+    END IF;
+    PERFORM search_document_upsert('invoice', NEW."id", NEW."srplId", NEW."invoiceNumber",
+        (SELECT "companyName" FROM "Customer" WHERE "id" = NEW."customerId"), NEW."status", NULL,
+        concat_ws(' ', NEW."invoiceNumber", NEW."srplId"));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "Invoice_search_document_sync"
+AFTER INSERT OR UPDATE OR DELETE ON "Invoice"
+FOR EACH ROW EXECUTE FUNCTION search_document_sync_invoice();
+
+-- Backfill existing rows
+INSERT INTO "SearchDocument" ("id", "entityType", "entityId", "srplId", "title", "subtitle", "description", "ownerId", "searchText", "updatedAt")
+SELECT gen_random_uuid()::text, 'lead', l."id", l."srplId", l."companyName", l."contactName", l."status", l."ownerId",
+       lower(concat_ws(' ', l."companyName", l."contactName", l."email", l."phone", l."srplId")), CURRENT_TIMESTAMP
+FROM "Lead" l;
+
+INSERT INTO "SearchDocument" ("id", "entityType", "entityId", "srplId", "title", "subtitle", "description", "ownerId", "searchText", "updatedAt")
+SELECT gen_random_uuid()::text, 'customer', c."id", c."srplId", c."companyName", COALESCE(c."contactName", c."contactEmail"), c."customerType", NULL,
+       lower(concat_ws(' ', c."companyName", c."contactName", c."contactEmail", c."srplId")), CURRENT_TIMESTAMP
+FROM "Customer" c;
+
+INSERT INTO "SearchDocument" ("id", "entityType", "entityId", "srplId", "title", "subtitle", "description", "ownerId", "searchText", "updatedAt")
+SELECT gen_random_uuid()::text, 'product', p."id", p."srplId", p."name", p."sku", p."unitPrice"::text, NULL,
+       lower(concat_ws(' ', p."name", p."sku", p."srplId")), CURRENT_TIMESTAMP
+FROM "Product" p;
+
+INSERT INTO "SearchDocument" ("id", "entityType", "entityId", "srplId", "title", "subtitle", "description", "ownerId", "searchText", "updatedAt")
+SELECT gen_random_uuid()::text, 'deal', d."id", d."srplId", d."title", c."companyName", d."stage", NULL,
+       lower(concat_ws(' ', d."title", d."srplId")), CURRENT_TIMESTAMP
+FROM "Deal" d JOIN "Customer" c ON c."id" = d."customerId";
+
+INSERT INTO "SearchDocument" ("id", "entityType", "entityId", "srplId", "title", "subtitle", "description", "ownerId", "searchText", "updatedAt")
+SELECT gen_random_uuid()::text, 'quote', q."id", q."srplId", q."quoteNumber", c."companyName", q."status", NULL,
+       lower(concat_ws(' ', q."quoteNumber", q."srplId")), CURRENT_TIMESTAMP
+FROM "Quote" q JOIN "Customer" c ON c."id" = q."customerId";
+
+INSERT INTO "SearchDocument" ("id", "entityType", "entityId", "srplId", "title", "subtitle", "description", "ownerId", "searchText", "updatedAt")
+SELECT gen_random_uuid()::text, 'invoice', i."id", i."srplId", i."invoiceNumber", c."companyName", i."status", NULL,
+       lower(concat_ws(' ', i."invoiceNumber", i."srplId")), CURRENT_TIMESTAMP
+FROM "Invoice" i JOIN "Customer" c ON c."id" = i."customerId";
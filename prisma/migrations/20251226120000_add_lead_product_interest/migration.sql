@@ -0,0 +1,95 @@
+-- CreateTable
+CREATE TABLE "LeadProductInterest" (
+    "id" TEXT NOT NULL,
+    "leadId" TEXT NOT NULL,
+    "productId" TEXT NOT NULL,
+    "monthlyRequirement" DOUBLE PRECISION,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "LeadProductInterest_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "LeadProductInterest_leadId_productId_key" ON "LeadProductInterest"("leadId", "productId");
+
+-- CreateIndex
+CREATE INDEX "LeadProductInterest_productId_leadId_idx" ON "LeadProductInterest"("productId", "leadId");
+
+-- AddForeignKey
+ALTER TABLE "LeadProductInterest" ADD CONSTRAINT "LeadProductInterest_leadId_fkey" FOREIGN KEY ("leadId") REFERENCES "Lead"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "LeadProductInterest" ADD CONSTRAINT "LeadProductInterest_productId_fkey" FOREIGN KEY ("productId") REFERENCES "Product"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- Leading number of a free-text requirement, like JavaScript parseFloat ("500 kg" -> 500)
+CREATE OR REPLACE FUNCTION lead_requirement_quantity(p_value TEXT) RETURNS DOUBLE PRECISION AS $$
+    SELECT substring(p_value FROM '^\s*([+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+))')::DOUBLE PRECISION;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Rebuild one lead's rows from its productInterest.
+-- JSON arrays of { productId, monthlyRequirement } link each listed product once (first entry wins);
+-- legacy non-JSON values are matched against product name or id using Lead.monthlyRequirement.
+CREATE OR REPLACE FUNCTION lead_product_interest_refresh(
+    p_lead_id TEXT,
+    p_product_interest TEXT,
+    p_monthly_requirement TEXT
+) RETURNS void AS $$
+DECLARE
+    interest JSONB;
+    is_json BOOLEAN := true;
+BEGIN
+    DELETE FROM "LeadProductInterest" WHERE "leadId" = p_lead_id;
+
+    IF p_product_interest IS NULL THEN
+        RETURN;
+    END IF;
+
+    BEGIN
+        interest := p_product_interest::JSONB;
+    EXCEPTION WHEN others THEN
+        is_json := false;
+    END;
+
+    IF NOT is_json THEN
+        INSERT INTO "LeadProductInterest" ("id", "leadId", "productId", "monthlyRequirement")
+        SELECT gen_random_uuid()::text, p_lead_id, p."id", lead_requirement_quantity(p_monthly_requirement)
+        FROM "Product" p
+        WHERE p."name" = p_product_interest OR p."id" = p_product_interest
+        ON CONFLICT ("leadId", "productId") DO NOTHING;
+    ELSIF jsonb_typeof(interest) = 'array' THEN
+        INSERT INTO "LeadProductInterest" ("id", "leadId", "productId", "monthlyRequirement")
+        SELECT DISTINCT ON (p."id")
+            gen_random_uuid()::text, p_lead_id, p."id", lead_requirement_quantity(e.value->>'monthlyRequirement')
+        FROM jsonb_array_elements(interest) WITH ORDINALITY AS e(value, ord)
+        JOIN "Product" p ON p."id" = e.value->>'productId'
+        ORDER BY p."id", e.ord
+        ON CONFLICT ("leadId", "productId") DO NOTHING;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION lead_product_interest_sync() RETURNS trigger AS $$
+BEGIN
+    PERFORM lead_product_interest_refresh(NEW."id", NEW."productInterest", NEW."monthlyRequirement");
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Covers single creates, updates, createMany imports and raw writes alike
+CREATE TRIGGER lead_product_interest_insert
+AFTER INSERT ON "Lead"
+FOR EACH ROW WHEN (NEW."productInterest" IS NOT NULL)
+EXECUTE FUNCTION lead_product_interest_sync();
+
+CREATE TRIGGER lead_product_interest_update
+AFTER UPDATE OF "productInterest", "monthlyRequirement" ON "Lead"
+FOR EACH ROW WHEN (
+    NEW."productInterest" IS DISTINCT FROM OLD."productInterest"
+    OR NEW."monthlyRequirement" IS DISTINCT FROM OLD."monthlyRequirement"
+)
+EXECUTE FUNCTION lead_product_interest_sync();
+
+-- Backfill from existing JSON
+SELECT lead_product_interest_refresh("id", "productInterest", "monthlyRequirement")
+FROM "Lead"
+WHERE "productInterest" IS NOT NULL;
@@ -0,0 +1,176 @@
+-- CreateTable
+CREATE TABLE "ProductSalesRollup" (
+    "productId" TEXT NOT NULL,
+    "period" DATE NOT NULL,
+    "customerType" TEXT NOT NULL,
+    "quantity" INTEGER NOT NULL DEFAULT 0,
+    "revenue" DECIMAL(14,2) NOT NULL DEFAULT 0,
+    "orderCount" INTEGER NOT NULL DEFAULT 0,
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "ProductSalesRollup_pkey" PRIMARY KEY ("productId","period","customerType")
+);
+
+-- CreateIndex
+CREATE INDEX "ProductSalesRollup_period_idx" ON "ProductSalesRollup"("period");
+
+-- CreateIndex
+CREATE INDEX "InvoiceItem_productId_idx" ON "InvoiceItem"("productId");
+
+-- AddForeignKey
+ALTER TABLE "ProductSalesRollup" ADD CONSTRAINT "ProductSalesRollup_productId_fkey" FOREIGN KEY ("productId") REFERENCES "Product"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- Recompute a single (product, month, customer type) cell from invoice items.
+-- Recomputing instead of applying deltas keeps the distinct invoice count exact.
+CREATE OR REPLACE FUNCTION product_sales_rollup_refresh(
+    p_product_id TEXT,
+    p_period DATE,
+    p_customer_type TEXT
+) RETURNS void AS $$
+DECLARE
+    v_quantity BIGINT;
+    v_revenue NUMERIC;
+    v_orders INTEGER;
+BEGIN
+    IF p_product_id IS NULL OR p_period IS NULL OR p_customer_type IS NULL THEN
+        RETURN;
+    END IF;
+
+    -- Serialize refreshes of a cell: the SELECT below then sees items committed by
+    -- a concurrent writer of the same cell instead of overwriting its totals
+    PERFORM pg_advisory_xact_lock(hashtext('product_sales_rollup|' || p_product_id || '|' || p_period || '|' || p_customer_type));
+
+    SELECT
+        COALESCE(SUM(i."quantity"), 0),
+        COALESCE(SUM(i."unitPrice" * i."quantity" * (1 - COALESCE(i."discountPct", 0) / 100)), 0),
+        COUNT(DISTINCT inv."id")
+    INTO v_quantity, v_revenue, v_orders
+    FROM "InvoiceItem" i
+    JOIN "Invoice" inv ON inv."id" = i."invoiceId"
+    JOIN "Customer" c ON c."id" = inv."customerId"
+    WHERE i."productId" = p_product_id
+      AND inv."issueDate" >= p_period
+      AND inv."issueDate" < p_period + INTERVAL '1 month'
+      AND c."customerType" = p_customer_type;
+
+    IF v_orders = 0 THEN
+        DELETE FROM "ProductSalesRollup"
+        WHERE "productId" = p_product_id AND "period" = p_period AND "customerType" = p_customer_type;
+    ELSE
+        INSERT INTO "ProductSalesRollup" ("productId", "period", "customerType", "quantity", "revenue", "orderCount", "updatedAt")
+        VALUES (p_product_id, p_period, p_customer_type, v_quantity, v_revenue, v_orders, NOW())
+        ON CONFLICT ("productId", "period", "customerType") DO UPDATE SET
+            "quantity" = EXCLUDED."quantity",
+            "revenue" = EXCLUDED."revenue",
+            "orderCount" = EXCLUDED."orderCount",
+            "updatedAt" = NOW();
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Refresh every cell an invoice's items contribute to, for a given date and customer
+CREATE OR REPLACE FUNCTION product_sales_rollup_refresh_invoice(
+    p_invoice_id TEXT,
+    p_issue_date TIMESTAMP,
+    p_customer_id TEXT
+) RETURNS void AS $$
+DECLARE
+    v_customer_type TEXT;
+    v_product_id TEXT;
+BEGIN
+    SELECT "customerType" INTO v_customer_type FROM "Customer" WHERE "id" = p_customer_id;
+
+    FOR v_product_id IN
+        -- Fixed order, so transactions refreshing overlapping cells take their locks alike
+        SELECT DISTINCT "productId" FROM "InvoiceItem" WHERE "invoiceId" = p_invoice_id ORDER BY 1
+    LOOP
+        PERFORM product_sales_rollup_refresh(v_product_id, date_trunc('month', p_issue_date)::date, v_customer_type);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION product_sales_rollup_sync_item() RETURNS trigger AS $$
+DECLARE
+    v_period DATE;
+    v_customer_type TEXT;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT date_trunc('month', inv."issueDate")::date, c."customerType"
+        INTO v_period, v_customer_type
+        FROM "Invoice" inv JOIN "Customer" c ON c."id" = inv."customerId"
+        WHERE inv."id" = OLD."invoiceId";
+
+        PERFORM product_sales_rollup_refresh(OLD."productId", v_period, v_customer_type);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT date_trunc('month', inv."issueDate")::date, c."customerType"
+        INTO v_period, v_customer_type
+        FROM "Invoice" inv JOIN "Customer" c ON c."id" = inv."customerId"
+        WHERE inv."id" = NEW."invoiceId";
+
+        PERFORM product_sales_rollup_refresh(NEW."productId", v_period, v_customer_type);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER product_sales_rollup_item
+AFTER INSERT OR UPDATE OR DELETE ON "InvoiceItem"
+FOR EACH ROW EXECUTE FUNCTION product_sales_rollup_sync_item();
+
+-- Moving an invoice to another month or customer shifts all of its items
+CREATE OR REPLACE FUNCTION product_sales_rollup_sync_invoice() RETURNS trigger AS $$
+BEGIN
+    PERFORM product_sales_rollup_refresh_invoice(OLD."id", OLD."issueDate", OLD."customerId");
+    PERFORM product_sales_rollup_refresh_invoice(NEW."id", NEW."issueDate", NEW."customerId");
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER product_sales_rollup_invoice
+AFTER UPDATE OF "issueDate", "customerId" ON "Invoice"
+FOR EACH ROW WHEN (
+    NEW."issueDate" IS DISTINCT FROM OLD."issueDate"
+    OR NEW."customerId" IS DISTINCT FROM OLD."customerId"
+)
+EXECUTE FUNCTION product_sales_rollup_sync_invoice();
+
+-- Reclassifying a customer moves its invoices between customer type series
+CREATE OR REPLACE FUNCTION product_sales_rollup_sync_customer() RETURNS trigger AS $$
+DECLARE
+    v_cell RECORD;
+BEGIN
+    FOR v_cell IN
+        SELECT DISTINCT i."productId", date_trunc('month', inv."issueDate")::date AS period
+        FROM "Invoice" inv
+        JOIN "InvoiceItem" i ON i."invoiceId" = inv."id"
+        WHERE inv."customerId" = NEW."id"
+    LOOP
+        PERFORM product_sales_rollup_refresh(v_cell."productId", v_cell.period, OLD."customerType");
+        PERFORM product_sales_rollup_refresh(v_cell."productId", v_cell.period, NEW."customerType");
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER product_sales_rollup_customer
+AFTER UPDATE OF "customerType" ON "Customer"
+FOR EACH ROW WHEN (NEW."customerType" IS DISTINCT FROM OLD."customerType")
+EXECUTE FUNCTION product_sales_rollup_sync_customer();
+
+-- Backfill
+INSERT INTO "ProductSalesRollup" ("productId", "period", "customerType", "quantity", "revenue", "orderCount", "updatedAt")
+SELECT
+    i."productId",
+    date_trunc('month', inv."issueDate")::date,
+    c."customerType",
+    SUM(i."quantity"),
+    SUM(i."unitPrice" * i."quantity" * (1 - COALESCE(i."discountPct", 0) / 100)),
+    COUNT(DISTINCT inv."id"),
+    NOW()
+FROM "InvoiceItem" i
+JOIN "Invoice" inv ON inv."id" = i."invoiceId"
+JOIN "Customer" c ON c."id" = inv."customerId"
+GROUP BY i."productId", date_trunc('month', inv."issueDate")::date, c."customerType";
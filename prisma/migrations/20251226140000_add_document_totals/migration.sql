@@ -0,0 +1,160 @@
+-- AlterTable
+ALTER TABLE "Quote" ADD COLUMN     "subtotal" DECIMAL(14,2) NOT NULL DEFAULT 0,
+ADD COLUMN     "taxTotal" DECIMAL(14,2) NOT NULL DEFAULT 0,
+ADD COLUMN     "grandTotal" DECIMAL(14,2) NOT NULL DEFAULT 0;
+
+-- AlterTable
+ALTER TABLE "ProformaInvoice" ADD COLUMN     "subtotal" DECIMAL(14,2) NOT NULL DEFAULT 0,
+ADD COLUMN     "taxTotal" DECIMAL(14,2) NOT NULL DEFAULT 0,
+ADD COLUMN     "grandTotal" DECIMAL(14,2) NOT NULL DEFAULT 0;
+
+-- AlterTable
+ALTER TABLE "SalesOrder" ADD COLUMN     "subtotal" DECIMAL(14,2) NOT NULL DEFAULT 0,
+ADD COLUMN     "taxTotal" DECIMAL(14,2) NOT NULL DEFAULT 0,
+ADD COLUMN     "grandTotal" DECIMAL(14,2) NOT NULL DEFAULT 0;
+
+-- AlterTable
+ALTER TABLE "Invoice" ADD COLUMN     "subtotal" DECIMAL(14,2) NOT NULL DEFAULT 0,
+ADD COLUMN     "taxTotal" DECIMAL(14,2) NOT NULL DEFAULT 0,
+ADD COLUMN     "grandTotal" DECIMAL(14,2) NOT NULL DEFAULT 0;
+
+-- GST rate applied to a customer's documents (same rule as the document form and PDFs):
+-- domestic customers with a state pay 18% (CGST+SGST within Gujarat, IGST elsewhere)
+CREATE OR REPLACE FUNCTION document_tax_rate(p_country TEXT, p_state TEXT) RETURNS NUMERIC AS $$
+    SELECT CASE WHEN p_country = 'India' AND COALESCE(p_state, '') <> '' THEN 0.18 ELSE 0 END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Recompute stored totals for documents in p_document_table.
+-- p_filter_column/p_filter_value select which documents: "id" for one document, "customerId" for all of a
+-- customer's, or NULL for every document (backfill). p_drafts_only leaves documents past Draft untouched.
+CREATE OR REPLACE FUNCTION document_totals_refresh(
+    p_document_table TEXT,
+    p_item_table TEXT,
+    p_foreign_key TEXT,
+    p_filter_column TEXT,
+    p_filter_value TEXT,
+    p_drafts_only BOOLEAN DEFAULT false
+) RETURNS void AS $$
+BEGIN
+    -- Lock the documents first: the totals below are then aggregated from a snapshot
+    -- that includes items committed by a concurrent writer, instead of overwriting them
+    IF p_filter_value IS NOT NULL THEN
+        EXECUTE format(
+            'SELECT 1 FROM %1$I WHERE %2$I = $1 AND (NOT $2 OR "status" = ''Draft'') ORDER BY "id" FOR UPDATE',
+            p_document_table, COALESCE(p_filter_column, 'id')
+        ) USING p_filter_value, p_drafts_only;
+    END IF;
+
+    EXECUTE format(
+        'WITH totals AS (
+            SELECT d."id",
+                ROUND(COALESCE(SUM(i."unitPrice" * i."quantity" * (1 - COALESCE(i."discountPct", 0) / 100)), 0)::NUMERIC, 2) AS subtotal,
+                document_tax_rate(c."country", c."state") AS rate
+            FROM %1$I d
+            JOIN "Customer" c ON c."id" = d."customerId"
+            LEFT JOIN %2$I i ON i.%3$I = d."id"
+            WHERE ($1 IS NULL OR d.%4$I = $1) AND (NOT $2 OR d."status" = ''Draft'')
+            GROUP BY d."id", c."country", c."state"
+        )
+        UPDATE %1$I d SET
+            "subtotal" = t.subtotal,
+            "taxTotal" = ROUND(t.subtotal * t.rate, 2),
+            "grandTotal" = t.subtotal + ROUND(t.subtotal * t.rate, 2)
+        FROM totals t
+        WHERE d."id" = t."id"',
+        p_document_table, p_item_table, p_foreign_key, COALESCE(p_filter_column, 'id')
+    ) USING p_filter_value, p_drafts_only;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Line item trigger. TG_ARGV: document table, foreign key column on the item table
+CREATE OR REPLACE FUNCTION document_totals_sync_item() RETURNS trigger AS $$
+DECLARE
+    v_old_id TEXT;
+    v_new_id TEXT;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        v_old_id := to_jsonb(OLD) ->> TG_ARGV[1];
+        PERFORM document_totals_refresh(TG_ARGV[0], TG_TABLE_NAME, TG_ARGV[1], 'id', v_old_id);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        v_new_id := to_jsonb(NEW) ->> TG_ARGV[1];
+        IF v_new_id IS DISTINCT FROM v_old_id THEN
+            PERFORM document_totals_refresh(TG_ARGV[0], TG_TABLE_NAME, TG_ARGV[1], 'id', v_new_id);
+        END IF;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER document_totals_quote_item
+AFTER INSERT OR UPDATE OR DELETE ON "QuoteItem"
+FOR EACH ROW EXECUTE FUNCTION document_totals_sync_item('Quote', 'quoteId');
+
+CREATE TRIGGER document_totals_proforma_item
+AFTER INSERT OR UPDATE OR DELETE ON "ProformaItem"
+FOR EACH ROW EXECUTE FUNCTION document_totals_sync_item('ProformaInvoice', 'proformaId');
+
+CREATE TRIGGER document_totals_sales_order_item
+AFTER INSERT OR UPDATE OR DELETE ON "SalesOrderItem"
+FOR EACH ROW EXECUTE FUNCTION document_totals_sync_item('SalesOrder', 'salesOrderId');
+
+CREATE TRIGGER document_totals_invoice_item
+AFTER INSERT OR UPDATE OR DELETE ON "InvoiceItem"
+FOR EACH ROW EXECUTE FUNCTION document_totals_sync_item('Invoice', 'invoiceId');
+
+-- Document moved to another customer: tax rate may change. TG_ARGV: item table, foreign key column
+CREATE OR REPLACE FUNCTION document_totals_sync_document() RETURNS trigger AS $$
+BEGIN
+    PERFORM document_totals_refresh(TG_TABLE_NAME, TG_ARGV[0], TG_ARGV[1], 'id', NEW."id");
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER document_totals_quote
+AFTER UPDATE OF "customerId" ON "Quote"
+FOR EACH ROW WHEN (NEW."customerId" IS DISTINCT FROM OLD."customerId")
+EXECUTE FUNCTION document_totals_sync_document('QuoteItem', 'quoteId');
+
+CREATE TRIGGER document_totals_proforma
+AFTER UPDATE OF "customerId" ON "ProformaInvoice"
+FOR EACH ROW WHEN (NEW."customerId" IS DISTINCT FROM OLD."customerId")
+EXECUTE FUNCTION document_totals_sync_document('ProformaItem', 'proformaId');
+
+CREATE TRIGGER document_totals_sales_order
+AFTER UPDATE OF "customerId" ON "SalesOrder"
+FOR EACH ROW WHEN (NEW."customerId" IS DISTINCT FROM OLD."customerId")
+EXECUTE FUNCTION document_totals_sync_document('SalesOrderItem', 'salesOrderId');
+
+CREATE TRIGGER document_totals_invoice
+AFTER UPDATE OF "customerId" ON "Invoice"
+FOR EACH ROW WHEN (NEW."customerId" IS DISTINCT FROM OLD."customerId")
+EXECUTE FUNCTION document_totals_sync_document('InvoiceItem', 'invoiceId');
+
+-- Customer address change: GST applicability may change for its draft documents.
+-- Issued documents keep the totals they were issued with.
+CREATE OR REPLACE FUNCTION document_totals_sync_customer() RETURNS trigger AS $$
+BEGIN
+    PERFORM document_totals_refresh('Quote', 'QuoteItem', 'quoteId', 'customerId', NEW."id", true);
+    PERFORM document_totals_refresh('ProformaInvoice', 'ProformaItem', 'proformaId', 'customerId', NEW."id", true);
+    PERFORM document_totals_refresh('SalesOrder', 'SalesOrderItem', 'salesOrderId', 'customerId', NEW."id", true);
+    PERFORM document_totals_refresh('Invoice', 'InvoiceItem', 'invoiceId', 'customerId', NEW."id", true);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER document_totals_customer
+AFTER UPDATE OF "country", "state" ON "Customer"
+FOR EACH ROW WHEN (
+    NEW."country" IS DISTINCT FROM OLD."country"
+    OR NEW."state" IS DISTINCT FROM OLD."state"
+)
+EXECUTE FUNCTION document_totals_sync_customer();
+
+-- Backfill
+SELECT document_totals_refresh('Quote', 'QuoteItem', 'quoteId', NULL, NULL);
+SELECT document_totals_refresh('ProformaInvoice', 'ProformaItem', 'proformaId', NULL, NULL);
+SELECT document_totals_refresh('SalesOrder', 'SalesOrderItem', 'salesOrderId', NULL, NULL);
+SELECT document_totals_refresh('Invoice', 'InvoiceItem', 'invoiceId', NULL, NULL);
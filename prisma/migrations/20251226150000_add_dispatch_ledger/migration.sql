@@ -0,0 +1,181 @@
+-- CreateTable
+CREATE TABLE "DispatchLedger" (
+    "salesOrderItemId" TEXT NOT NULL,
+    "salesOrderId" TEXT NOT NULL,
+    "customerId" TEXT NOT NULL,
+    "productId" TEXT NOT NULL,
+    "salesRepId" TEXT,
+    "orderNumber" TEXT NOT NULL,
+    "orderDate" TIMESTAMP(3) NOT NULL,
+    "expectedShip" TIMESTAMP(3),
+    "orderStatus" TEXT NOT NULL,
+    "orderedQty" INTEGER NOT NULL,
+    "dispatchedQty" INTEGER NOT NULL DEFAULT 0,
+    "pendingQty" INTEGER NOT NULL,
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "DispatchLedger_pkey" PRIMARY KEY ("salesOrderItemId")
+);
+
+-- CreateIndex
+CREATE INDEX "DispatchLedger_customerId_productId_idx" ON "DispatchLedger"("customerId", "productId");
+
+-- CreateIndex
+CREATE INDEX "DispatchLedger_productId_orderDate_idx" ON "DispatchLedger"("productId", "orderDate");
+
+-- CreateIndex
+CREATE INDEX "DispatchLedger_orderDate_idx" ON "DispatchLedger"("orderDate");
+
+-- CreateIndex
+CREATE INDEX "DispatchLedger_salesOrderId_idx" ON "DispatchLedger"("salesOrderId");
+
+-- CreateIndex
+CREATE INDEX "Invoice_salesOrderId_idx" ON "Invoice"("salesOrderId");
+
+-- AddForeignKey
+ALTER TABLE "DispatchLedger" ADD CONSTRAINT "DispatchLedger_salesOrderItemId_fkey" FOREIGN KEY ("salesOrderItemId") REFERENCES "SalesOrderItem"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- Rebuild ledger rows for a sales order's lines (optionally only lines for one product).
+-- Rows for lines that no longer exist are removed by the foreign key cascade.
+CREATE OR REPLACE FUNCTION dispatch_ledger_refresh(p_sales_order_id TEXT, p_product_id TEXT) RETURNS void AS $$
+BEGIN
+    IF p_sales_order_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    -- Serialize refreshes of one order: once the lock is held, the INSERT below
+    -- sees invoice lines committed by a concurrent writer instead of overwriting
+    -- the quantities with a snapshot that lacks them
+    PERFORM 1 FROM "SalesOrder" WHERE "id" = p_sales_order_id FOR UPDATE;
+
+    INSERT INTO "DispatchLedger" (
+        "salesOrderItemId", "salesOrderId", "customerId", "productId", "salesRepId",
+        "orderNumber", "orderDate", "expectedShip", "orderStatus",
+        "orderedQty", "dispatchedQty", "pendingQty", "updatedAt"
+    )
+    SELECT
+        soi."id", so."id", so."customerId", soi."productId", so."salesRepId",
+        so."orderNumber", so."orderDate", so."expectedShip", so."status",
+        soi."quantity", COALESCE(d.qty, 0), soi."quantity" - COALESCE(d.qty, 0), NOW()
+    FROM "SalesOrderItem" soi
+    JOIN "SalesOrder" so ON so."id" = soi."salesOrderId"
+    LEFT JOIN LATERAL (
+        SELECT SUM(ii."quantity")::int AS qty
+        FROM "Invoice" inv
+        JOIN "InvoiceItem" ii ON ii."invoiceId" = inv."id"
+        WHERE inv."salesOrderId" = so."id" AND ii."productId" = soi."productId"
+    ) d ON true
+    WHERE so."id" = p_sales_order_id
+      AND (p_product_id IS NULL OR soi."productId" = p_product_id)
+    ON CONFLICT ("salesOrderItemId") DO UPDATE SET
+        "salesOrderId" = EXCLUDED."salesOrderId",
+        "customerId" = EXCLUDED."customerId",
+        "productId" = EXCLUDED."productId",
+        "salesRepId" = EXCLUDED."salesRepId",
+        "orderNumber" = EXCLUDED."orderNumber",
+        "orderDate" = EXCLUDED."orderDate",
+        "expectedShip" = EXCLUDED."expectedShip",
+        "orderStatus" = EXCLUDED."orderStatus",
+        "orderedQty" = EXCLUDED."orderedQty",
+        "dispatchedQty" = EXCLUDED."dispatchedQty",
+        "pendingQty" = EXCLUDED."pendingQty",
+        "updatedAt" = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Sales order line written
+CREATE OR REPLACE FUNCTION dispatch_ledger_sync_order_item() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD."salesOrderId" IS DISTINCT FROM NEW."salesOrderId" THEN
+        PERFORM dispatch_ledger_refresh(OLD."salesOrderId", NULL);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM dispatch_ledger_refresh(NEW."salesOrderId", NEW."productId");
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER dispatch_ledger_order_item
+AFTER INSERT OR UPDATE ON "SalesOrderItem"
+FOR EACH ROW EXECUTE FUNCTION dispatch_ledger_sync_order_item();
+
+-- Sales order header fields copied onto its ledger rows
+CREATE OR REPLACE FUNCTION dispatch_ledger_sync_order() RETURNS trigger AS $$
+BEGIN
+    UPDATE "DispatchLedger" SET
+        "customerId" = NEW."customerId",
+        "salesRepId" = NEW."salesRepId",
+        "orderNumber" = NEW."orderNumber",
+        "orderDate" = NEW."orderDate",
+        "expectedShip" = NEW."expectedShip",
+        "orderStatus" = NEW."status",
+        "updatedAt" = NOW()
+    WHERE "salesOrderId" = NEW."id";
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER dispatch_ledger_order
+AFTER UPDATE OF "customerId", "salesRepId", "orderNumber", "orderDate", "expectedShip", "status" ON "SalesOrder"
+FOR EACH ROW EXECUTE FUNCTION dispatch_ledger_sync_order();
+
+-- Invoice line written: dispatched quantity changes for the matching order lines
+CREATE OR REPLACE FUNCTION dispatch_ledger_sync_invoice_item() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM dispatch_ledger_refresh(
+            (SELECT "salesOrderId" FROM "Invoice" WHERE "id" = OLD."invoiceId"),
+            OLD."productId"
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM dispatch_ledger_refresh(
+            (SELECT "salesOrderId" FROM "Invoice" WHERE "id" = NEW."invoiceId"),
+            NEW."productId"
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER dispatch_ledger_invoice_item
+AFTER INSERT OR UPDATE OR DELETE ON "InvoiceItem"
+FOR EACH ROW EXECUTE FUNCTION dispatch_ledger_sync_invoice_item();
+
+-- Invoice linked to a different sales order (or unlinked)
+CREATE OR REPLACE FUNCTION dispatch_ledger_sync_invoice() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM dispatch_ledger_refresh(OLD."salesOrderId", NULL);
+    END IF;
+    IF TG_OP = 'UPDATE' THEN
+        PERFORM dispatch_ledger_refresh(NEW."salesOrderId", NULL);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER dispatch_ledger_invoice
+AFTER UPDATE OF "salesOrderId" OR DELETE ON "Invoice"
+FOR EACH ROW EXECUTE FUNCTION dispatch_ledger_sync_invoice();
+
+-- Backfill
+INSERT INTO "DispatchLedger" (
+    "salesOrderItemId", "salesOrderId", "customerId", "productId", "salesRepId",
+    "orderNumber", "orderDate", "expectedShip", "orderStatus",
+    "orderedQty", "dispatchedQty", "pendingQty", "updatedAt"
+)
+SELECT
+    soi."id", so."id", so."customerId", soi."productId", so."salesRepId",
+    so."orderNumber", so."orderDate", so."expectedShip", so."status",
+    soi."quantity", COALESCE(d.qty, 0), soi."quantity" - COALESCE(d.qty, 0), NOW()
+FROM "SalesOrderItem" soi
+JOIN "SalesOrder" so ON so."id" = soi."salesOrderId"
+LEFT JOIN (
+    SELECT inv."salesOrderId", ii."productId", SUM(ii."quantity")::int AS qty
+    FROM "Invoice" inv
+    JOIN "InvoiceItem" ii ON ii."invoiceId" = inv."id"
+    WHERE inv."salesOrderId" IS NOT NULL
+    GROUP BY inv."salesOrderId", ii."productId"
+) d ON d."salesOrderId" = so."id" AND d."productId" = soi."productId";
@@ -0,0 +1,15 @@
+-- AlterTable
+ALTER TABLE "ImportJob" ADD COLUMN "duplicateRows" INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN "duplicates" TEXT;
+
+-- CreateIndex
+CREATE INDEX "Customer_contactEmail_idx" ON "Customer"("contactEmail");
+
+-- CreateIndex
+CREATE INDEX "Customer_companyName_idx" ON "Customer" USING GIN ("companyName" gin_trgm_ops);
+
+-- CreateIndex
+CREATE INDEX "Lead_email_idx" ON "Lead"("email");
+
+-- CreateIndex
+CREATE INDEX "Lead_companyName_idx" ON "Lead" USING GIN ("companyName" gin_trgm_ops);
@@ -0,0 +1,90 @@
+-- AlterTable
+ALTER TABLE "Customer" ADD COLUMN "contactPhoneDigits" TEXT,
+ADD COLUMN "contactPhoneE164" TEXT;
+
+-- AlterTable
+ALTER TABLE "Lead" ADD COLUMN "phoneDigits" TEXT,
+ADD COLUMN "phoneE164" TEXT;
+
+-- Digits-only phone; NULL when there are no digits
+CREATE OR REPLACE FUNCTION phone_digits(p_phone TEXT) RETURNS TEXT AS $$
+    SELECT NULLIF(regexp_replace(p_phone, '\D', '', 'g'), '');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- E.164 phone. Keep in sync with toE164() in src/lib/data-hygiene.ts:
+-- explicit +/00 prefixes are kept, Indian national numbers get +91, anything else is NULL.
+CREATE OR REPLACE FUNCTION phone_e164(p_phone TEXT, p_country TEXT) RETURNS TEXT AS $$
+DECLARE
+    digits TEXT := phone_digits(p_phone);
+    e164 TEXT;
+BEGIN
+    IF digits IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    IF btrim(p_phone) LIKE '+%' THEN
+        e164 := digits;
+    ELSIF digits LIKE '00%' THEN
+        e164 := substr(digits, 3);
+    ELSIF p_country = 'India' THEN
+        IF length(digits) = 11 AND digits LIKE '0%' THEN
+            digits := substr(digits, 2);
+        END IF;
+        IF length(digits) = 10 THEN
+            e164 := '91' || digits;
+        ELSIF length(digits) = 12 AND digits LIKE '91%' THEN
+            e164 := digits;
+        END IF;
+    END IF;
+
+    IF e164 IS NULL OR length(e164) NOT BETWEEN 8 AND 15 THEN
+        RETURN NULL;
+    END IF;
+    RETURN '+' || e164;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION lead_normalize_phone() RETURNS trigger AS $$
+BEGIN
+    NEW."phoneDigits" := phone_digits(NEW."phone");
+    NEW."phoneE164" := phone_e164(NEW."phone", NEW."country");
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER lead_normalize_phone
+BEFORE INSERT OR UPDATE OF "phone", "country" ON "Lead"
+FOR EACH ROW EXECUTE FUNCTION lead_normalize_phone();
+
+CREATE OR REPLACE FUNCTION customer_normalize_phone() RETURNS trigger AS $$
+BEGIN
+    NEW."contactPhoneDigits" := phone_digits(NEW."contactPhone");
+    NEW."contactPhoneE164" := phone_e164(NEW."contactPhone", NEW."country");
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER customer_normalize_phone
+BEFORE INSERT OR UPDATE OF "contactPhone", "country" ON "Customer"
+FOR EACH ROW EXECUTE FUNCTION customer_normalize_phone();
+
+-- Backfill
+UPDATE "Lead"
+SET "phoneDigits" = phone_digits("phone"), "phoneE164" = phone_e164("phone", "country")
+WHERE "phone" IS NOT NULL;
+
+UPDATE "Customer"
+SET "contactPhoneDigits" = phone_digits("contactPhone"), "contactPhoneE164" = phone_e164("contactPhone", "country")
+WHERE "contactPhone" IS NOT NULL;
+
+-- CreateIndex
+CREATE INDEX "Customer_contactPhoneDigits_idx" ON "Customer"("contactPhoneDigits");
+
+-- CreateIndex
+CREATE INDEX "Customer_contactPhoneE164_idx" ON "Customer"("contactPhoneE164");
+
+-- CreateIndex
+CREATE INDEX "Lead_phoneDigits_idx" ON "Lead"("phoneDigits");
+
+-- CreateIndex
+CREATE INDEX "Lead_phoneE164_idx" ON "Lead"("phoneE164");
@@ -0,0 +1,54 @@
+-- CreateTable
+CREATE TABLE "DuplicateClusterRun" (
+    "id" TEXT NOT NULL,
+    "status" TEXT NOT NULL DEFAULT 'running',
+    "threshold" DOUBLE PRECISION NOT NULL,
+    "recordCount" INTEGER NOT NULL DEFAULT 0,
+    "clusterCount" INTEGER NOT NULL DEFAULT 0,
+    "startedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "completedAt" TIMESTAMP(3),
+
+    CONSTRAINT "DuplicateClusterRun_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "DuplicateCluster" (
+    "id" TEXT NOT NULL,
+    "runId" TEXT NOT NULL,
+    "size" INTEGER NOT NULL,
+    "score" DOUBLE PRECISION NOT NULL,
+    "label" TEXT NOT NULL,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "DuplicateCluster_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable
+CREATE TABLE "DuplicateClusterMember" (
+    "id" TEXT NOT NULL,
+    "clusterId" TEXT NOT NULL,
+    "entityType" TEXT NOT NULL,
+    "entityId" TEXT NOT NULL,
+    "srplId" TEXT,
+    "companyName" TEXT NOT NULL,
+
+    CONSTRAINT "DuplicateClusterMember_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE INDEX "DuplicateClusterRun_status_completedAt_idx" ON "DuplicateClusterRun"("status", "completedAt");
+
+-- CreateIndex
+CREATE INDEX "DuplicateCluster_runId_size_idx" ON "DuplicateCluster"("runId", "size");
+
+-- CreateIndex
+CREATE INDEX "DuplicateClusterMember_clusterId_idx" ON "DuplicateClusterMember"("clusterId");
+
+-- CreateIndex
+CREATE INDEX "DuplicateClusterMember_entityType_entityId_idx" ON "DuplicateClusterMember"("entityType", "entityId");
+
+-- AddForeignKey
+ALTER TABLE "DuplicateCluster" ADD CONSTRAINT "DuplicateCluster_runId_fkey" FOREIGN KEY ("runId") REFERENCES "DuplicateClusterRun"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "DuplicateClusterMember" ADD CONSTRAINT "DuplicateClusterMember_clusterId_fkey" FOREIGN KEY ("clusterId") REFERENCES "DuplicateCluster"("id") ON DELETE CASCADE ON UPDATE CASCADE;
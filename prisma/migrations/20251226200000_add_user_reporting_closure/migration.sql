@@ -0,0 +1,55 @@
+-- CreateTable
+CREATE TABLE "UserReportingClosure" (
+    "ancestorId" TEXT NOT NULL,
+    "descendantId" TEXT NOT NULL,
+    "depth" INTEGER NOT NULL,
+
+    CONSTRAINT "UserReportingClosure_pkey" PRIMARY KEY ("ancestorId","descendantId")
+);
+
+-- CreateIndex
+CREATE INDEX "UserReportingClosure_descendantId_idx" ON "UserReportingClosure"("descendantId");
+
+-- Rebuild the closure of the managerId hierarchy: one row per (manager at any
+-- level, report) pair plus a depth-0 row per user. Org charts are small, so a
+-- full rebuild per change is cheaper than maintaining paths incrementally.
+-- Cycles in managerId are cut where they close.
+CREATE OR REPLACE FUNCTION rebuild_user_reporting_closure() RETURNS void AS $$
+BEGIN
+  -- Serialize rebuilds: a concurrent rebuild's DELETE can't see rows another
+  -- uncommitted rebuild inserted, so its INSERT would hit the primary key. Once
+  -- the lock is held, each statement below sees the other transaction's commit.
+  PERFORM pg_advisory_xact_lock(hashtext('user_reporting_closure'));
+
+  DELETE FROM "UserReportingClosure";
+
+  INSERT INTO "UserReportingClosure" ("ancestorId", "descendantId", "depth")
+  WITH RECURSIVE chain AS (
+    SELECT u.id AS ancestor_id, u.id AS descendant_id, 0 AS depth, ARRAY[u.id] AS path
+    FROM "User" u
+    UNION ALL
+    SELECT c.ancestor_id, u.id, c.depth + 1, c.path || u.id
+    FROM chain c
+    JOIN "User" u ON u."managerId" = c.descendant_id
+    WHERE NOT u.id = ANY(c.path)
+  )
+  SELECT ancestor_id, descendant_id, MIN(depth)
+  FROM chain
+  GROUP BY ancestor_id, descendant_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION user_reporting_closure_sync() RETURNS trigger AS $$
+BEGIN
+  PERFORM rebuild_user_reporting_closure();
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement-level so bulk changes rebuild once
+CREATE TRIGGER "User_reporting_closure_sync"
+AFTER INSERT OR DELETE OR UPDATE OF "managerId" ON "User"
+FOR EACH STATEMENT EXECUTE FUNCTION user_reporting_closure_sync();
+
+-- Backfill
+SELECT rebuild_user_reporting_closure();
@@ -0,0 +1,33 @@
+/**
+ * Backfill stored document totals (subtotal, taxTotal, grandTotal) on quotes,
+ * proforma invoices, sales orders and invoices from their line items.
+ * Triggers maintain the totals on every write; run this after bulk data fixes or restores.
+ *
+ * Usage: npx tsx scripts/backfill-document-totals.ts [quote,proforma,salesOrder,invoice]
+ */
+
+import { PrismaClient } from '@prisma/client';
+import { recalculateDocumentTotals, type TotalledDocumentType } from '../src/lib/document-totals';
+
+const prisma = new PrismaClient();
+
+async function main() {
+  const documentTypes = process.argv[2]
+    ? (process.argv[2].split(',') as TotalledDocumentType[])
+    : undefined;
+
+  console.log(`Backfilling document totals${documentTypes ? ` for ${documentTypes.join(', ')}` : ''}...`);
+
+  try {
+    const startedAt = Date.now();
+    await recalculateDocumentTotals(prisma, documentTypes);
+    console.log(`✓ Document totals recalculated in ${Date.now() - startedAt} ms`);
+  } catch (error) {
+    console.error('✗ Backfill failed:', error);
+    process.exitCode = 1;
+  } finally {
+    await prisma.$disconnect();
+  }
+}
+
+main();
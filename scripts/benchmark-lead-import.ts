@@ -0,0 +1,85 @@
+/**
+ * Benchmark for the streamed lead import (PUT /api/leads/import/jobs/[id]).
+ * Generates a CSV in memory, feeds it to runLeadImport as a byte stream in small
+ * pieces (like an upload), and reports throughput. Target: 100k leads in under a minute.
+ *
+ * Usage: npx tsx scripts/benchmark-lead-import.ts [leads=100000] [chunkSize=1000]
+ */
+
+import { PrismaClient } from '@prisma/client';
+import { runLeadImport } from '../src/lib/lead-import';
+
+const prisma = new PrismaClient();
+
+const BENCH_PREFIX = 'BENCH-LI';
+// Upload piece size; deliberately unaligned with rows so records span reads
+const UPLOAD_PIECE_BYTES = 64 * 1024 + 7;
+
+const leadCount = Number(process.argv[2]) || 100000;
+const chunkSize = Number(process.argv[3]) || 1000;
+
+function buildCsv(): Uint8Array {
+  const lines = ['companyName,contactName,email,phone,status,leadSource,country'];
+  for (let i = 0; i < leadCount; i++) {
+    // Every 1000th row is invalid to exercise per-row errors
+    const email = i % 1000 === 999 ? 'not-an-email' : `lead${i}@example.com`;
+    lines.push(`"${BENCH_PREFIX} Lead ${i}, Ltd",Contact ${i},${email},+91 98${String(i).padStart(8, '0')},New,Import,India`);
+  }
+  return new TextEncoder().encode(lines.join('\n'));
+}
+
+function toStream(bytes: Uint8Array): ReadableStream<Uint8Array> {
+  let offset = 0;
+  return new ReadableStream<Uint8Array>({
+    pull(controller) {
+      if (offset >= bytes.length) {
+        controller.close();
+        return;
+      }
+      controller.enqueue(bytes.subarray(offset, offset + UPLOAD_PIECE_BYTES));
+      offset += UPLOAD_PIECE_BYTES;
+    },
+  });
+}
+
+async function cleanup() {
+  await prisma.lead.deleteMany({ where: { companyName: { startsWith: BENCH_PREFIX } } });
+  await (prisma as any).importJob.deleteMany({ where: { createdById: BENCH_PREFIX } });
+}
+
+async function main() {
+  console.log(`Lead import benchmark: ${leadCount} leads, chunks of ${chunkSize}`);
+
+  try {
+    await cleanup();
+
+    const csv = buildCsv();
+    const job = await (prisma as any).importJob.create({
+      data: { entityType: 'lead', format: 'csv', chunkSize, totalBytes: csv.length, createdById: BENCH_PREFIX },
+    });
+
+    const startedAt = process.hrtime.bigint();
+    await runLeadImport(prisma, job.id, toStream(csv), { format: 'csv', chunkSize, ownerId: null });
+    const elapsedMs = Number(process.hrtime.bigint() - startedAt) / 1e6;
+
+    const finished = await (prisma as any).importJob.findUnique({ where: { id: job.id } });
+    console.log(`\nStatus:    ${finished.status}${finished.message ? ` (${finished.message})` : ''}`);
+    console.log(`  Rows:      ${finished.processedRows}`);
+    console.log(`  Created:   ${finished.createdRows}`);
+    console.log(`  Failed:    ${finished.failedRows}`);
+    console.log(`  Elapsed:   ${elapsedMs.toFixed(0)} ms`);
+    console.log(`  Rate:      ${((finished.createdRows / elapsedMs) * 1000).toFixed(0)} leads/s`);
+
+    if (finished.status !== 'completed') {
+      process.exitCode = 1;
+    }
+  } catch (error) {
+    console.error('\n✗ Benchmark failed:', error);
+    process.exitCode = 1;
+  } finally {
+    await cleanup();
+    await prisma.$disconnect();
+  }
+}
+
+main();
@@ -0,0 +1,203 @@
+/**
+ * Benchmark for product demand aggregation.
+ * Seeds a throwaway fixture (2k products, 200k line items spread across deals,
+ * quotes, sales orders and invoices, plus leads with JSON product interest),
+ * then compares getProductDemand with the previous per-product query loop.
+ * The legacy loop runs on a sample of products and is extrapolated, since the
+ * full run takes too long to be useful.
+ *
+ * Usage: npx tsx scripts/benchmark-product-demand.ts [products=2000] [lineItems=200000] [leads=20000] [legacySample=20]
+ */
+
+import { randomUUID } from 'crypto';
+import { PrismaClient } from '@prisma/client';
+import { getProductDemand } from '../src/lib/product-analytics';
+
+const prisma = new PrismaClient();
+
+const BENCH_PREFIX = 'BENCH-PD';
+const ITEMS_PER_DOCUMENT = 10;
+const CHUNK_SIZE = 5000;
+
+const productCount = Number(process.argv[2]) || 2000;
+const lineItemCount = Number(process.argv[3]) || 200000;
+const leadCount = Number(process.argv[4]) || 20000;
+const legacySample = Number(process.argv[5]) || 20;
+
+const pick = <T>(values: T[]): T => values[Math.floor(Math.random() * values.length)];
+
+async function createInChunks(model: any, rows: any[]) {
+  for (let i = 0; i < rows.length; i += CHUNK_SIZE) {
+    await model.createMany({ data: rows.slice(i, i + CHUNK_SIZE) });
+  }
+}
+
+async function seedFixture() {
+  const products = Array.from({ length: productCount }, (_, i) => ({
+    id: randomUUID(),
+    name: `${BENCH_PREFIX} Product ${i}`,
+    sku: `${BENCH_PREFIX}-${i}`,
+    unitPrice: 100 + (i % 50),
+  }));
+  await createInChunks(prisma.product, products);
+
+  const customers = Array.from({ length: 200 }, (_, i) => ({
+    id: randomUUID(),
+    companyName: `${BENCH_PREFIX} Customer ${i}`,
+    customerType: i % 2 === 0 ? 'domestic' : 'international',
+    country: i % 2 === 0 ? 'India' : 'Germany',
+  }));
+  await createInChunks(prisma.customer, customers);
+
+  const productIds = products.map((p) => p.id);
+  const customerIds = customers.map((c) => c.id);
+  const now = Date.now();
+  const randomDate = () => new Date(now - Math.floor(Math.random() * 365) * 86400000);
+
+  // Split line items evenly across the four document types
+  const documentsPerType = Math.ceil(lineItemCount / 4 / ITEMS_PER_DOCUMENT);
+  const documentIds = (prefix: string) =>
+    Array.from({ length: documentsPerType }, (_, i) => ({ id: randomUUID(), number: `${BENCH_PREFIX}-${prefix}-${i}` }));
+
+  const deals = documentIds('DEAL');
+  await createInChunks(
+    prisma.deal,
+    deals.map((d) => ({ id: d.id, title: d.number, customerId: pick(customerIds), createdAt: randomDate() })),
+  );
+  const quotes = documentIds('Q');
+  await createInChunks(
+    prisma.quote,
+    quotes.map((d) => ({ id: d.id, quoteNumber: d.number, customerId: pick(customerIds), issueDate: randomDate() })),
+  );
+  const salesOrders = documentIds('SO');
+  await createInChunks(
+    prisma.salesOrder,
+    salesOrders.map((d) => ({ id: d.id, orderNumber: d.number, customerId: pick(customerIds), orderDate: randomDate() })),
+  );
+  const invoices = documentIds('INV');
+  await createInChunks(
+    prisma.invoice,
+    invoices.map((d) => ({ id: d.id, invoiceNumber: d.number, customerId: pick(customerIds), issueDate: randomDate() })),
+  );
+
+  const itemsFor = (docs: Array<{ id: string }>, foreignKey: string, priced: boolean) =>
+    docs.flatMap((doc) =>
+      Array.from({ length: ITEMS_PER_DOCUMENT }, () => ({
+        [foreignKey]: doc.id,
+        productId: pick(productIds),
+        quantity: 1 + Math.floor(Math.random() * 100),
+        ...(priced && { unitPrice: 100 + Math.floor(Math.random() * 50), discountPct: Math.random() < 0.2 ? 5 : 0 }),
+      })),
+    );
+
+  await createInChunks(prisma.dealItem, itemsFor(deals, 'dealId', false));
+  await createInChunks(prisma.quoteItem, itemsFor(quotes, 'quoteId', true));
+  await createInChunks(prisma.salesOrderItem, itemsFor(salesOrders, 'salesOrderId', true));
+  await createInChunks(prisma.invoiceItem, itemsFor(invoices, 'invoiceId', true));
+
+  const leads = Array.from({ length: leadCount }, (_, i) => ({
+    companyName: `${BENCH_PREFIX} Lead ${i}`,
+    status: 'New',
+    productInterest: JSON.stringify(
+      Array.from({ length: 1 + (i % 3) }, () => ({
+        productId: pick(productIds),
+        monthlyRequirement: String(10 + (i % 90)),
+      })),
+    ),
+  }));
+  await createInChunks(prisma.lead, leads);
+
+  return products;
+}
+
+/**
+ * The previous implementation: five queries per product plus a JSON parse of every lead
+ */
+async function legacyProductDemand(product: { id: string; name: string }) {
+  const leads = await prisma.lead.findMany({
+    where: { productInterest: { not: null } },
+    select: { id: true, productInterest: true, monthlyRequirement: true },
+  });
+  let leadQuantity = 0;
+  for (const lead of leads) {
+    try {
+      const entries = JSON.parse(lead.productInterest!);
+      const entry = Array.isArray(entries) ? entries.find((p: any) => p.productId === product.id) : null;
+      if (entry?.monthlyRequirement) leadQuantity += parseFloat(entry.monthlyRequirement) || 0;
+    } catch {
+      // Legacy string interest
+    }
+  }
+
+  await prisma.dealItem.findMany({ where: { productId: product.id }, include: { deal: { select: { id: true } } } });
+  await prisma.quoteItem.findMany({ where: { productId: product.id }, include: { quote: { select: { id: true } } } });
+  await prisma.salesOrderItem.findMany({ where: { productId: product.id }, include: { salesOrder: { select: { id: true } } } });
+  await prisma.invoiceItem.findMany({ where: { productId: product.id }, include: { invoice: { select: { id: true } } } });
+  await prisma.product.findUnique({ where: { id: product.id }, select: { unitPrice: true } });
+
+  return leadQuantity;
+}
+
+async function cleanup() {
+  const products = { product: { sku: { startsWith: BENCH_PREFIX } } };
+  await prisma.dealItem.deleteMany({ where: products });
+  await prisma.quoteItem.deleteMany({ where: products });
+  await prisma.salesOrderItem.deleteMany({ where: products });
+  await prisma.invoiceItem.deleteMany({ where: products });
+  await prisma.deal.deleteMany({ where: { title: { startsWith: BENCH_PREFIX } } });
+  await prisma.quote.deleteMany({ where: { quoteNumber: { startsWith: BENCH_PREFIX } } });
+  await prisma.salesOrder.deleteMany({ where: { orderNumber: { startsWith: BENCH_PREFIX } } });
+  await prisma.invoice.deleteMany({ where: { invoiceNumber: { startsWith: BENCH_PREFIX } } });
+  await prisma.lead.deleteMany({ where: { companyName: { startsWith: BENCH_PREFIX } } });
+  await prisma.customer.deleteMany({ where: { companyName: { startsWith: BENCH_PREFIX } } });
+  await prisma.product.deleteMany({ where: { sku: { startsWith: BENCH_PREFIX } } });
+}
+
+async function main() {
+  console.log(
+    `Product demand benchmark: ${productCount} products, ${lineItemCount} line items, ${leadCount} leads`,
+  );
+
+  try {
+    await cleanup();
+
+    let startedAt = process.hrtime.bigint();
+    const products = await seedFixture();
+    console.log(`✓ Fixture seeded in ${(Number(process.hrtime.bigint() - startedAt) / 1e6).toFixed(0)} ms`);
+
+    startedAt = process.hrtime.bigint();
+    const demand = await getProductDemand(prisma);
+    const aggregatedMs = Number(process.hrtime.bigint() - startedAt) / 1e6;
+    const totalItems = demand.reduce(
+      (sum, row) => sum + row.dealQuantity + row.quoteQuantity + row.salesOrderQuantity + row.invoiceQuantity,
+      0,
+    );
+
+    console.log(`\nGrouped aggregation`);
+    console.log(`  Products:  ${demand.length}`);
+    console.log(`  Quantity:  ${totalItems}`);
+    console.log(`  Elapsed:   ${aggregatedMs.toFixed(0)} ms`);
+
+    const sample = products.slice(0, Math.min(legacySample, products.length));
+    startedAt = process.hrtime.bigint();
+    for (const product of sample) {
+      await legacyProductDemand(product);
+    }
+    const sampleMs = Number(process.hrtime.bigint() - startedAt) / 1e6;
+    const legacyMs = (sampleMs / sample.length) * products.length;
+
+    console.log(`\nPer-product loop (${sample.length} products sampled)`);
+    console.log(`  Per product: ${(sampleMs / sample.length).toFixed(1)} ms`);
+    console.log(`  Projected:   ${legacyMs.toFixed(0)} ms for ${products.length} products`);
+
+    console.log(`\nSpeedup: ${(legacyMs / aggregatedMs).toFixed(1)}x`);
+  } catch (error) {
+    console.error('\n✗ Benchmark failed:', error);
+    process.exitCode = 1;
+  } finally {
+    await cleanup();
+    await prisma.$disconnect();
+  }
+}
+
+main();
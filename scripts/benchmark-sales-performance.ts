@@ -0,0 +1,199 @@
+/**
+ * Regression benchmark for the sales performance reports.
+ * Seeds a throwaway fixture (200 reps, 100k quotes, plus sales orders and invoices),
+ * then times calculateSalespersonPerformance (/api/reports/performance) against the
+ * previous per-rep query loop, and calculateSalesOrderPerformance
+ * (/api/reports/sales-performance). The legacy loop runs on a sample of reps and is
+ * extrapolated.
+ *
+ * Usage: npx tsx scripts/benchmark-sales-performance.ts [reps=200] [quotes=100000] [salesOrders=20000] [legacySample=10]
+ */
+
+import { randomUUID } from 'crypto';
+import { PrismaClient } from '@prisma/client';
+import {
+  calculateSalesOrderPerformance,
+  calculateSalespersonPerformance,
+  calculateWeightedPipeline,
+} from '../src/lib/reporting';
+
+const prisma = new PrismaClient();
+
+const BENCH_PREFIX = 'BENCH-SP';
+const CHUNK_SIZE = 5000;
+
+const repCount = Number(process.argv[2]) || 200;
+const quoteCount = Number(process.argv[3]) || 100000;
+const salesOrderCount = Number(process.argv[4]) || 20000;
+const legacySample = Number(process.argv[5]) || 10;
+
+const pick = <T>(values: T[]): T => values[Math.floor(Math.random() * values.length)];
+
+async function createInChunks(model: any, rows: any[]) {
+  for (let i = 0; i < rows.length; i += CHUNK_SIZE) {
+    await model.createMany({ data: rows.slice(i, i + CHUNK_SIZE) });
+  }
+}
+
+async function seedFixture() {
+  const reps = Array.from({ length: repCount }, (_, i) => ({
+    id: randomUUID(),
+    firebaseUid: `${BENCH_PREFIX}-${i}`,
+    email: `${BENCH_PREFIX.toLowerCase()}-${i}@example.com`,
+    name: `${BENCH_PREFIX} Rep ${i}`,
+    role: 'sales',
+  }));
+  await createInChunks(prisma.user, reps);
+
+  const products = Array.from({ length: 100 }, (_, i) => ({
+    id: randomUUID(),
+    name: `${BENCH_PREFIX} Product ${i}`,
+    sku: `${BENCH_PREFIX}-${i}`,
+    unitPrice: 100 + i,
+  }));
+  await createInChunks(prisma.product, products);
+
+  const customers = Array.from({ length: 100 }, (_, i) => ({
+    id: randomUUID(),
+    companyName: `${BENCH_PREFIX} Customer ${i}`,
+    customerType: 'domestic',
+    country: 'India',
+  }));
+  await createInChunks(prisma.customer, customers);
+
+  const repIds = reps.map((r) => r.id);
+  const productIds = products.map((p) => p.id);
+  const customerIds = customers.map((c) => c.id);
+  const now = Date.now();
+  const randomDate = () => new Date(now - Math.floor(Math.random() * 365) * 86400000);
+  const lineItems = (foreignKey: string, documentId: string) =>
+    Array.from({ length: 2 }, () => ({
+      [foreignKey]: documentId,
+      productId: pick(productIds),
+      quantity: 1 + Math.floor(Math.random() * 50),
+      unitPrice: 100 + Math.floor(Math.random() * 100),
+    }));
+
+  const quotes = Array.from({ length: quoteCount }, (_, i) => ({
+    id: randomUUID(),
+    quoteNumber: `${BENCH_PREFIX}-Q-${i}`,
+    customerId: pick(customerIds),
+    salesRepId: pick(repIds),
+    issueDate: randomDate(),
+  }));
+  await createInChunks(prisma.quote, quotes);
+  await createInChunks(prisma.quoteItem, quotes.flatMap((q) => lineItems('quoteId', q.id)));
+
+  const salesOrders = Array.from({ length: salesOrderCount }, (_, i) => ({
+    id: randomUUID(),
+    orderNumber: `${BENCH_PREFIX}-SO-${i}`,
+    customerId: pick(customerIds),
+    salesRepId: pick(repIds),
+    orderDate: randomDate(),
+  }));
+  await createInChunks(prisma.salesOrder, salesOrders);
+  await createInChunks(prisma.salesOrderItem, salesOrders.flatMap((so) => lineItems('salesOrderId', so.id)));
+
+  // Invoice roughly half of the orders
+  const invoices = salesOrders
+    .filter((_, i) => i % 2 === 0)
+    .map((so, i) => ({
+      id: randomUUID(),
+      invoiceNumber: `${BENCH_PREFIX}-INV-${i}`,
+      customerId: so.customerId,
+      salesOrderId: so.id,
+      issueDate: so.orderDate,
+    }));
+  await createInChunks(prisma.invoice, invoices);
+  await createInChunks(prisma.invoiceItem, invoices.flatMap((inv) => lineItems('invoiceId', inv.id)));
+
+  return reps;
+}
+
+/**
+ * The previous implementation: a quote query and a full pipeline load per rep
+ */
+async function legacyRepPerformance(repId: string) {
+  const quotes = await prisma.quote.findMany({
+    where: { salesRepId: repId },
+    include: { items: { include: { product: { select: { unitPrice: true } } } } },
+  });
+  const revenue = quotes.reduce(
+    (sum, quote) =>
+      sum +
+      quote.items.reduce(
+        (itemSum, item) => itemSum + Number(item.product.unitPrice) * item.quantity * (1 - (item.discountPct || 0) / 100),
+        0,
+      ),
+    0,
+  );
+  await calculateWeightedPipeline(prisma, { salesRepId: repId });
+  return revenue;
+}
+
+async function cleanup() {
+  await prisma.invoiceItem.deleteMany({ where: { invoice: { invoiceNumber: { startsWith: BENCH_PREFIX } } } });
+  await prisma.invoice.deleteMany({ where: { invoiceNumber: { startsWith: BENCH_PREFIX } } });
+  await prisma.salesOrderItem.deleteMany({ where: { salesOrder: { orderNumber: { startsWith: BENCH_PREFIX } } } });
+  await prisma.salesOrder.deleteMany({ where: { orderNumber: { startsWith: BENCH_PREFIX } } });
+  await prisma.quoteItem.deleteMany({ where: { quote: { quoteNumber: { startsWith: BENCH_PREFIX } } } });
+  await prisma.quote.deleteMany({ where: { quoteNumber: { startsWith: BENCH_PREFIX } } });
+  await prisma.customer.deleteMany({ where: { companyName: { startsWith: BENCH_PREFIX } } });
+  await prisma.product.deleteMany({ where: { sku: { startsWith: BENCH_PREFIX } } });
+  await prisma.user.deleteMany({ where: { firebaseUid: { startsWith: BENCH_PREFIX } } });
+}
+
+const elapsedSince = (startedAt: bigint) => Number(process.hrtime.bigint() - startedAt) / 1e6;
+
+async function main() {
+  console.log(
+    `Sales performance benchmark: ${repCount} reps, ${quoteCount} quotes, ${salesOrderCount} sales orders`,
+  );
+
+  try {
+    await cleanup();
+
+    let startedAt = process.hrtime.bigint();
+    const reps = await seedFixture();
+    console.log(`✓ Fixture seeded in ${elapsedSince(startedAt).toFixed(0)} ms`);
+
+    const repIds = reps.map((r) => r.id);
+
+    startedAt = process.hrtime.bigint();
+    const performance = await calculateSalespersonPerformance(prisma, { salesRepIds: repIds });
+    const groupedMs = elapsedSince(startedAt);
+
+    console.log(`\n/api/reports/performance (grouped)`);
+    console.log(`  Reps:      ${performance.length}`);
+    console.log(`  Quotes:    ${performance.reduce((sum, p) => sum + p.totalDeals, 0)}`);
+    console.log(`  Elapsed:   ${groupedMs.toFixed(0)} ms`);
+
+    const sample = repIds.slice(0, Math.min(legacySample, repIds.length));
+    startedAt = process.hrtime.bigint();
+    for (const repId of sample) {
+      await legacyRepPerformance(repId);
+    }
+    const sampleMs = elapsedSince(startedAt);
+    const legacyMs = (sampleMs / sample.length) * repIds.length;
+
+    console.log(`\nPer-rep loop (${sample.length} reps sampled)`);
+    console.log(`  Per rep:   ${(sampleMs / sample.length).toFixed(1)} ms`);
+    console.log(`  Projected: ${legacyMs.toFixed(0)} ms for ${repIds.length} reps`);
+    console.log(`\nSpeedup: ${(legacyMs / groupedMs).toFixed(1)}x`);
+
+    startedAt = process.hrtime.bigint();
+    const orders = await calculateSalesOrderPerformance(prisma);
+    console.log(`\n/api/reports/sales-performance`);
+    console.log(`  Reps:      ${orders.length}`);
+    console.log(`  Orders:    ${orders.reduce((sum, p) => sum + p.totalOrders, 0)}`);
+    console.log(`  Elapsed:   ${elapsedSince(startedAt).toFixed(0)} ms`);
+  } catch (error) {
+    console.error('\n✗ Benchmark failed:', error);
+    process.exitCode = 1;
+  } finally {
+    await cleanup();
+    await prisma.$disconnect();
+  }
+}
+
+main();
@@ -0,0 +1,80 @@
+/**
+ * Benchmark for SRPL ID generation under concurrent writers.
+ * Compares the strict (one locked transaction per ID) path with block allocation.
+ * Uses a throwaway module code so real counters are never touched.
+ *
+ * Usage: npx tsx scripts/benchmark-srpl-ids.ts [writers=50] [idsPerWriter=100] [blockSize=50]
+ */
+
+import { PrismaClient } from '@prisma/client';
+import { generateSRPLId, invalidateSequenceConfigCache } from '../src/lib/srpl-id-generator';
+
+const prisma = new PrismaClient();
+
+const BENCH_MODULE = 'BENCH';
+
+const writers = Number(process.argv[2]) || 50;
+const idsPerWriter = Number(process.argv[3]) || 100;
+const blockSize = Number(process.argv[4]) || 50;
+
+async function resetBenchSequence(allowGaps: boolean, allocationBlockSize: number) {
+  await (prisma as any).sequenceCounter.deleteMany({ where: { moduleCode: BENCH_MODULE } });
+  await (prisma as any).sequenceConfig.upsert({
+    where: { moduleCode: BENCH_MODULE },
+    create: { moduleCode: BENCH_MODULE, allowGaps, allocationBlockSize },
+    update: { allowGaps, allocationBlockSize },
+  });
+  invalidateSequenceConfigCache(BENCH_MODULE);
+}
+
+async function runScenario(label: string, allowGaps: boolean, allocationBlockSize: number) {
+  await resetBenchSequence(allowGaps, allocationBlockSize);
+
+  const ids: string[] = [];
+  let failures = 0;
+
+  const writer = async () => {
+    for (let i = 0; i < idsPerWriter; i++) {
+      try {
+        ids.push(await generateSRPLId({ moduleCode: BENCH_MODULE as any, prisma }));
+      } catch {
+        failures++;
+      }
+    }
+  };
+
+  const startedAt = process.hrtime.bigint();
+  await Promise.all(Array.from({ length: writers }, writer));
+  const elapsedMs = Number(process.hrtime.bigint() - startedAt) / 1e6;
+
+  const unique = new Set(ids).size;
+  const idsPerSec = (ids.length / elapsedMs) * 1000;
+
+  console.log(`\n${label}`);
+  console.log(`  Generated: ${ids.length} (${failures} failed)`);
+  console.log(`  Unique:    ${unique}${unique === ids.length ? '' : '  ✗ DUPLICATES DETECTED'}`);
+  console.log(`  Elapsed:   ${elapsedMs.toFixed(0)} ms`);
+  console.log(`  Rate:      ${idsPerSec.toFixed(1)} IDs/sec`);
+
+  return idsPerSec;
+}
+
+async function main() {
+  console.log(`SRPL ID benchmark: ${writers} concurrent writers x ${idsPerWriter} IDs`);
+
+  try {
+    const strict = await runScenario('Strict (Serializable, one transaction per ID)', false, 1);
+    const block = await runScenario(`Block allocation (block size ${blockSize})`, true, blockSize);
+
+    console.log(`\nSpeedup: ${(block / strict).toFixed(1)}x`);
+  } catch (error) {
+    console.error('\n✗ Benchmark failed:', error);
+    process.exitCode = 1;
+  } finally {
+    await (prisma as any).sequenceCounter.deleteMany({ where: { moduleCode: BENCH_MODULE } });
+    await (prisma as any).sequenceConfig.deleteMany({ where: { moduleCode: BENCH_MODULE } });
+    await prisma.$disconnect();
+  }
+}
+
+main();
@@ -0,0 +1,40 @@
+/**
+ * Cluster near-duplicate company names across all leads and customers.
+ * Results are served by GET /api/hygiene/duplicates; each run replaces the
+ * previous run's clusters. Schedule nightly, or run after large imports.
+ *
+ * Usage: npx tsx scripts/cluster-duplicate-companies.ts [threshold=0.8] [maxBlockSize=200]
+ */
+
+import { PrismaClient } from '@prisma/client';
+import { buildDuplicateClusters } from '../src/lib/duplicate-clustering';
+
+const prisma = new PrismaClient();
+
+const threshold = Number(process.argv[2]) || undefined;
+const maxBlockSize = Number(process.argv[3]) || undefined;
+
+async function main() {
+  console.log('Clustering duplicate companies...');
+
+  try {
+    const startedAt = Date.now();
+    const result = await buildDuplicateClusters(prisma, {
+      threshold,
+      maxBlockSize,
+      onProgress: (message) => console.log(`  ${message}`),
+    });
+    console.log(
+      `✓ Run ${result.runId}: ${result.clusterCount} clusters from ${result.recordCount} records ` +
+        `(${result.comparisons} comparisons, ${result.skippedBlocks} oversized blocks skipped) ` +
+        `in ${Date.now() - startedAt} ms`,
+    );
+  } catch (error) {
+    console.error('✗ Clustering failed:', error);
+    process.exitCode = 1;
+  } finally {
+    await prisma.$disconnect();
+  }
+}
+
+main();
@@ -0,0 +1,29 @@
+/**
+ * Rebuild the ProductSalesRollup table from invoice items.
+ * Database triggers keep the rollup current on every invoice write; run this after
+ * bulk data fixes, restores, or changes to the rollup triggers.
+ *
+ * Usage: npx tsx scripts/rebuild-product-rollups.ts
+ */
+
+import { PrismaClient } from '@prisma/client';
+import { rebuildProductSalesRollups } from '../src/lib/product-analytics';
+
+const prisma = new PrismaClient();
+
+async function main() {
+  console.log('Rebuilding product sales rollups...');
+
+  try {
+    const startedAt = Date.now();
+    const rows = await rebuildProductSalesRollups(prisma);
+    console.log(`✓ Rebuilt ${rows} rollup rows in ${Date.now() - startedAt} ms`);
+  } catch (error) {
+    console.error('✗ Rebuild failed:', error);
+    process.exitCode = 1;
+  } finally {
+    await prisma.$disconnect();
+  }
+}
+
+main();
@@ -4,6 +4,8 @@
  */
 
 import { PrismaClient } from '@prisma/client';
+import { invalidatePermissionMatrix } from '../src/lib/permission-matrix';
+import { getRedisClient } from '../src/lib/rate-limit-redis';
 
 const prisma = new PrismaClient();
 
@@ -177,6 +179,9 @@ async function seedPermissions() {
     }
   }
 
+  // With REDIS_URL set, app processes reload their permission matrix at their next
+  // version check; without it they only pick the changes up at the matrix's max age
+  await invalidatePermissionMatrix();
   console.log('Done seeding permissions!');
 }
 
@@ -187,5 +192,7 @@ seedPermissions()
   })
   .finally(async () => {
     await prisma.$disconnect();
+    // The version stamp was bumped through Redis; an open connection would keep the script alive
+    if (process.env.REDIS_URL) await getRedisClient().quit();
   });
 
@@ -1,16 +1,18 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { requireAuth } from '@/lib/auth-utils';
-import { getProductTimeSeries } from '@/lib/product-analytics';
+import { getProductSalesTrend, getProductTimeSeries } from '@/lib/product-analytics';
 
 /**
  * GET /api/analytics/products/timeseries
- * Returns time-series product data (monthly or quarterly)
+ * Returns time-series product data (monthly or quarterly) from the monthly sales rollup
  * Query params:
  *   - startDate: ISO date string
  *   - endDate: ISO date string
  *   - groupBy: 'month' | 'quarter' (default: 'month')
  *   - productId: string (optional)
+ *   - customerType: 'domestic' | 'international' (optional)
+ *   - aggregate: 'total' to return one series summed across products (optional)
  */
 export async function GET(req: Request) {
   const authError = await requireAuth();
@@ -33,8 +35,13 @@ export async function GET(req: Request) {
     if (searchParams.get('productId')) {
       filters.productId = searchParams.get('productId')!;
     }
+    if (searchParams.get('customerType')) {
+      filters.customerType = searchParams.get('customerType') as 'domestic' | 'international';
+    }
 
-    const data = await getProductTimeSeries(prisma, filters);
+    const data = searchParams.get('aggregate') === 'total'
+      ? await getProductSalesTrend(prisma, filters)
+      : await getProductTimeSeries(prisma, filters);
 
     return NextResponse.json(data);
   } catch (error) {
@@ -3,6 +3,7 @@ import { cookies } from 'next/headers';
 import { getPrismaClient } from '@/lib/prisma';
 import { getAuthContext } from '@/lib/auth';
 import { logAuditEvent } from '@/lib/audit-log';
+import { invalidateSessionToken } from '@/lib/session-cache';
 
 export async function POST(req: Request) {
   const cookieStore = await cookies();
@@ -28,6 +29,7 @@ export async function POST(req: Request) {
       await prisma.session.deleteMany({
         where: { token: sessionCookie.value },
       });
+      invalidateSessionToken(sessionCookie.value);
 
       // Log logout event (non-blocking)
       if (userId) {
@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { cookies } from 'next/headers';
+import { recordSessionActivity } from '@/lib/session-activity';
 
 // GET /api/auth/me - Get current logged-in user from secure session
 export async function GET(req: Request) {
@@ -27,13 +28,8 @@ export async function GET(req: Request) {
     return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
   }
 
-  // Optionally refresh lastActivityAt here if desired
-  try {
-    const { updateSessionActivity } = await import('@/lib/session-timeout');
-    await updateSessionActivity(session.token);
-  } catch {
-    // Best-effort; ignore errors
-  }
+  // Refresh lastActivityAt (buffered, written in batches)
+  recordSessionActivity(session.id);
 
   const user = session.user;
 
@@ -2,6 +2,7 @@ import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import bcrypt from 'bcryptjs';
 import { rateLimit, getClientIP } from '@/lib/rate-limit';
+import { invalidateUserSessions } from '@/lib/session-cache';
 
 export async function POST(req: Request) {
   // SECURITY: Rate limiting - 5 attempts per hour per IP
@@ -63,6 +64,9 @@ export async function POST(req: Request) {
     }),
   ]);
 
+  // Don't serve the user's sessions from cache after a password change
+  invalidateUserSessions(resetToken.userId);
+
   return NextResponse.json({ success: true });
 }
 
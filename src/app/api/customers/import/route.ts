@@ -1,7 +1,15 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
+import { reserveSRPLIdRange } from '@/lib/srpl-id-generator';
+import { checkDuplicatesBatch } from '@/lib/data-hygiene';
 
+/**
+ * POST /api/customers/import
+ * Import a JSON array of customers in one transaction.
+ * Response: { created, duplicates: [{ index, matches }] } for rows matching existing
+ * leads or customers (reported, not skipped)
+ */
 export async function POST(req: Request) {
   const auth = await getAuthContext(req);
   if (!auth.userId || !isRoleAllowed(auth.role, ['admin', 'sales'])) {
@@ -31,10 +39,34 @@ export async function POST(req: Request) {
   }
 
   const prisma = await getPrismaClient();
+
+  // Checked before the insert so rows don't match themselves
+  const matches = await checkDuplicatesBatch(
+    prisma,
+    customers.map((c) => ({
+      companyName: c.companyName,
+      email: c.contactPerson?.email,
+      phone: c.contactPerson?.phone,
+      gstNo: c.gstNo,
+      country: c.country,
+    })),
+  );
+  const duplicates = matches
+    .map((rowMatches, index) => ({ index, matches: rowMatches }))
+    .filter((row) => row.matches.length > 0);
+
+  // Assign all SRPL IDs up front in one round trip instead of once per row
+  const { ids: srplIds } = await reserveSRPLIdRange({
+    moduleCode: 'CUST',
+    prisma,
+    count: customers.length,
+  });
+
   const created = await prisma.$transaction(
-    customers.map(c =>
+    customers.map((c, index) =>
       prisma.customer.create({
         data: {
+          srplId: srplIds[index],
           companyName: c.companyName,
           customerType: c.customerType,
           country: c.country,
@@ -51,7 +83,7 @@ export async function POST(req: Request) {
     ),
   );
 
-  return NextResponse.json(created, { status: 201 });
+  return NextResponse.json({ created, duplicates }, { status: 201 });
 }
 
 
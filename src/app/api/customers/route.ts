@@ -4,6 +4,27 @@ import { getAuthContext, isRoleAllowed } from '@/lib/auth';
 import { requireAuth } from '@/lib/auth-utils';
 import { customerSchema, validateInput } from '@/lib/validation';
 import { logActivity } from '@/lib/activity-logger';
+import { getFieldSelect } from '@/lib/rbac';
+
+// Columns returned by the list endpoint; narrowed per user by getFieldSelect
+const CUSTOMER_LIST_SELECT = {
+  id: true,
+  srplId: true,
+  companyName: true,
+  customerType: true,
+  isActive: true,
+  contactName: true,
+  contactEmail: true,
+  contactPhone: true,
+  contactTitle: true,
+  billingAddress: true,
+  shippingAddress: true,
+  country: true,
+  state: true,
+  city: true,
+  gstNo: true,
+  createdAt: true,
+} as const;
 
 // GET /api/customers - list customers
 export async function GET(req: Request) {
@@ -115,6 +136,9 @@ export async function GET(req: Request) {
       ? whereClauseBase
       : { AND: [whereClauseBase, { isActive: { not: false } }] };
     
+    // Hidden fields are left out of the query rather than stripped afterwards
+    const customerSelect = await getFieldSelect(prisma, auth, 'customer', CUSTOMER_LIST_SELECT);
+
     let customers;
     try {
       // First, try a simple query to test database connection
@@ -140,24 +164,7 @@ export async function GET(req: Request) {
       
       // Now run the actual query - only include where if filter has keys
       const queryOptions: any = {
-        select: {
-          id: true,
-          srplId: true,
-          companyName: true,
-          customerType: true,
-          isActive: true,
-          contactName: true,
-          contactEmail: true,
-          contactPhone: true,
-          contactTitle: true,
-          billingAddress: true,
-          shippingAddress: true,
-          country: true,
-          state: true,
-          city: true,
-          gstNo: true,
-          createdAt: true,
-        },
+        select: customerSelect,
         orderBy: { createdAt: 'desc' },
       };
       
@@ -189,24 +196,7 @@ export async function GET(req: Request) {
       try {
         console.log('Customers GET - attempting fallback query without filter...');
         customers = await prisma.customer.findMany({
-          select: {
-            id: true,
-            srplId: true,
-            companyName: true,
-            customerType: true,
-            isActive: true,
-            contactName: true,
-            contactEmail: true,
-            contactPhone: true,
-            contactTitle: true,
-            billingAddress: true,
-            shippingAddress: true,
-            country: true,
-            state: true,
-            city: true,
-            gstNo: true,
-            createdAt: true,
-          },
+          select: customerSelect,
           orderBy: { createdAt: 'desc' },
           take: 100, // Limit to prevent huge results
         });
@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { requireAuth } from '@/lib/auth-utils';
+import { getDispatchInvoiceLines, getDispatchLedgerRows, groupInvoiceLines } from '@/lib/dispatch-ledger';
 
 /**
  * GET /api/dispatch-backlog
@@ -20,42 +21,19 @@ export async function GET(req: Request) {
 
     const prisma = await getPrismaClient();
 
-    // Fetch sales orders with their items and invoices
-    const salesOrders = await prisma.salesOrder.findMany({
-      where: {
-        ...(customerId && { customerId }),
-      },
-      include: {
-        customer: {
-          select: {
-            id: true,
-            companyName: true,
-            srplId: true,
-          },
-        },
-        items: {
-          where: {
-            ...(productId && { productId }),
-          },
-          include: {
-            product: {
-              select: {
-                id: true,
-                name: true,
-                sku: true,
-                srplId: true,
-              },
-            },
-          },
-        },
-        invoices: {
-          include: {
-            items: true,
-          },
-        },
-      },
+    // Ledger lines for customer/product combinations that still have pending quantity
+    const ledgerRows = await getDispatchLedgerRows(prisma, {
+      customerId: customerId || undefined,
+      productId: productId || undefined,
+      pendingOnly: true,
     });
 
+    // Invoice references only for orders that have dispatched anything
+    const dispatchedOrderIds = Array.from(
+      new Set(ledgerRows.filter((row) => row.dispatchedQty > 0).map((row) => row.salesOrderId))
+    );
+    const invoiceLines = groupInvoiceLines(await getDispatchInvoiceLines(prisma, dispatchedOrderIds));
+
     // Aggregate by customer and product
     const backlogMap = new Map<
       string,
@@ -87,73 +65,55 @@ export async function GET(req: Request) {
       }
     >();
 
-    salesOrders.forEach((order) => {
-      order.items.forEach((item) => {
-        const key = `${order.customerId}-${item.productId}`;
-
-        // Calculate dispatched quantity for this line item
-        let dispatchedQty = 0;
-        const invoiceList: Array<{
-          id: string;
-          invoiceNumber: string;
-          invoiceDate: string;
-          quantity: number;
-        }> = [];
-
-        order.invoices.forEach((invoice) => {
-          invoice.items.forEach((invoiceItem) => {
-            if (invoiceItem.productId === item.productId) {
-              const qty = Number(invoiceItem.quantity);
-              dispatchedQty += qty;
-              invoiceList.push({
-                id: invoice.id,
-                invoiceNumber: invoice.invoiceNumber,
-                invoiceDate: invoice.issueDate.toISOString(),
-                quantity: qty,
-              });
-            }
-          });
+    ledgerRows.forEach((row) => {
+      const key = `${row.customerId}-${row.productId}`;
+
+      const invoiceList = (invoiceLines.get(`${row.salesOrderId}-${row.productId}`) || []).map((line) => ({
+        id: line.invoiceId,
+        invoiceNumber: line.invoiceNumber,
+        invoiceDate: line.invoiceDate.toISOString(),
+        quantity: Number(line.quantity),
+      }));
+
+      const orderedQty = Number(row.orderedQty);
+      const dispatchedQty = Number(row.dispatchedQty);
+      const pendingQty = Number(row.pendingQty);
+
+      if (!backlogMap.has(key)) {
+        backlogMap.set(key, {
+          customerId: row.customerId,
+          customerName: row.customerName,
+          customerSrplId: row.customerSrplId,
+          productId: row.productId,
+          productName: row.productName,
+          productSku: row.productSku,
+          productSrplId: row.productSrplId,
+          ordered: 0,
+          dispatched: 0,
+          pending: 0,
+          salesOrders: [],
+          invoices: [],
         });
+      }
 
-        const orderedQty = Number(item.quantity);
-        const pendingQty = orderedQty - dispatchedQty;
-
-        if (!backlogMap.has(key)) {
-          backlogMap.set(key, {
-            customerId: order.customerId,
-            customerName: order.customer.companyName,
-            customerSrplId: order.customer.srplId,
-            productId: item.productId,
-            productName: item.product.name,
-            productSku: item.product.sku,
-            productSrplId: item.product.srplId,
-            ordered: 0,
-            dispatched: 0,
-            pending: 0,
-            salesOrders: [],
-            invoices: [],
-          });
-        }
-
-        const backlogEntry = backlogMap.get(key)!;
-        backlogEntry.ordered += orderedQty;
-        backlogEntry.dispatched += dispatchedQty;
-        backlogEntry.pending = backlogEntry.ordered - backlogEntry.dispatched;
-
-        // Add sales order reference
-        backlogEntry.salesOrders.push({
-          id: order.id,
-          orderNumber: order.orderNumber,
-          orderDate: order.orderDate.toISOString(),
-          quantity: orderedQty,
-          dispatchedQuantity: dispatchedQty,
-          pendingQuantity: pendingQty,
-        });
+      const backlogEntry = backlogMap.get(key)!;
+      backlogEntry.ordered += orderedQty;
+      backlogEntry.dispatched += dispatchedQty;
+      backlogEntry.pending = backlogEntry.ordered - backlogEntry.dispatched;
+
+      // Add sales order reference
+      backlogEntry.salesOrders.push({
+        id: row.salesOrderId,
+        orderNumber: row.orderNumber,
+        orderDate: row.orderDate.toISOString(),
+        quantity: orderedQty,
+        dispatchedQuantity: dispatchedQty,
+        pendingQuantity: pendingQty,
+      });
 
-        // Add invoice references
-        invoiceList.forEach((inv) => {
-          backlogEntry.invoices.push(inv);
-        });
+      // Add invoice references
+      invoiceList.forEach((inv) => {
+        backlogEntry.invoices.push(inv);
       });
     });
 
@@ -1,13 +1,182 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { getAuthContext } from '@/lib/auth';
+import { getDispatchRegister, type DispatchRegisterEntry } from '@/lib/dispatch-register';
+
+// Rows encoded per pull; keeps chunks reasonably sized without buffering the whole export
+const ROWS_PER_CHUNK = 500;
+
+const CSV_HEADER = [
+  'Customer ID',
+  'Customer Name',
+  'Product ID',
+  'Product Name',
+  'Product SKU',
+  'Primary PO Number',
+  'Primary PO Date',
+  'Total Order Received (MTS)',
+  'Total Dispatched (MTS)',
+  'Total Pending (MTS)',
+  'Dispatch Status',
+  'Has Anomaly',
+  'Anomaly Message',
+  'Sales Person',
+  'Sales Person Email',
+  'Unit of Measure',
+  'Sales Order ID',
+  'Sales Order Number',
+  'Sales Order Date',
+  'Sales Order Item ID',
+  'Ordered Quantity (MTS)',
+  'Dispatched Quantity (MTS)',
+  'Pending Quantity (MTS)',
+  'Invoice ID',
+  'Invoice Number',
+  'Invoice Date',
+  'Invoice Quantity (MTS)',
+].join(',');
+
+const EMPTY_LINE_ITEM_COLUMNS = ['', '', '', '', '', '', ''];
+const EMPTY_INVOICE_COLUMNS = ['', '', '', ''];
+
+/**
+ * Quote a free-text CSV field, escaping embedded quotes
+ */
+function quote(value: string): string {
+  return `"${value.replace(/"/g, '""')}"`;
+}
+
+/**
+ * CSV lines for the register, one per invoice line for full traceability.
+ * Line items without invoices, and entries without line items, get a single row.
+ */
+function* csvLines(entries: DispatchRegisterEntry[]): Generator<string> {
+  yield CSV_HEADER;
+
+  for (const entry of entries) {
+    const entryColumns = [
+      entry.customerId,
+      quote(entry.customerName),
+      entry.productId,
+      quote(entry.productName),
+      entry.productSKU || '',
+      entry.primaryPONumber,
+      entry.primaryPODate || '',
+      entry.totalOrderReceived.toFixed(2),
+      entry.totalDispatched.toFixed(2),
+      entry.totalPending.toFixed(2),
+      entry.dispatchStatus,
+      entry.hasAnomaly ? 'Yes' : 'No',
+      entry.anomalyMessage ? quote(entry.anomalyMessage) : '',
+      quote(entry.salesPerson),
+      entry.salesPersonEmail,
+      'MTS',
+    ];
+
+    if (entry.lineItems.length === 0) {
+      yield [...entryColumns, ...EMPTY_LINE_ITEM_COLUMNS, ...EMPTY_INVOICE_COLUMNS].join(',');
+      continue;
+    }
+
+    for (const lineItem of entry.lineItems) {
+      const lineItemColumns = [
+        lineItem.salesOrderId,
+        lineItem.salesOrderNumber,
+        lineItem.salesOrderDate,
+        lineItem.salesOrderItemId,
+        lineItem.orderedQuantity.toFixed(2),
+        lineItem.dispatchedQuantity.toFixed(2),
+        lineItem.pendingQuantity.toFixed(2),
+      ];
+
+      if (lineItem.invoices.length === 0) {
+        yield [...entryColumns, ...lineItemColumns, ...EMPTY_INVOICE_COLUMNS].join(',');
+        continue;
+      }
+
+      for (const invoice of lineItem.invoices) {
+        yield [
+          ...entryColumns,
+          ...lineItemColumns,
+          invoice.invoiceId,
+          invoice.invoiceNumber,
+          invoice.invoiceDate,
+          invoice.quantity.toFixed(2),
+        ].join(',');
+      }
+    }
+  }
+}
+
+/**
+ * NDJSON lines for the register, one entry per line
+ */
+function* ndjsonLines(entries: DispatchRegisterEntry[]): Generator<string> {
+  for (const entry of entries) {
+    yield JSON.stringify({
+      customerId: entry.customerId,
+      customerName: entry.customerName,
+      productId: entry.productId,
+      productName: entry.productName,
+      productSKU: entry.productSKU || '',
+      primaryPONumber: entry.primaryPONumber,
+      primaryPODate: entry.primaryPODate,
+      totalOrderReceived: entry.totalOrderReceived,
+      totalDispatched: entry.totalDispatched,
+      totalPending: entry.totalPending,
+      dispatchStatus: entry.dispatchStatus,
+      hasAnomaly: entry.hasAnomaly,
+      anomalyMessage: entry.anomalyMessage,
+      salesPerson: entry.salesPerson,
+      salesPersonEmail: entry.salesPersonEmail,
+      unitOfMeasure: 'MTS',
+      lineItems: entry.lineItems.map((li) => ({
+        salesOrderId: li.salesOrderId,
+        salesOrderNumber: li.salesOrderNumber,
+        salesOrderDate: li.salesOrderDate,
+        salesOrderItemId: li.salesOrderItemId,
+        orderedQuantity: li.orderedQuantity,
+        dispatchedQuantity: li.dispatchedQuantity,
+        pendingQuantity: li.pendingQuantity,
+        invoices: li.invoices.map((inv) => ({
+          invoiceId: inv.invoiceId,
+          invoiceNumber: inv.invoiceNumber,
+          invoiceDate: inv.invoiceDate,
+          quantity: inv.quantity,
+        })),
+      })),
+    });
+  }
+}
+
+/**
+ * Encode lines into a byte stream lazily, a chunk of rows per pull
+ */
+function streamLines(lines: Iterator<string>): ReadableStream<Uint8Array> {
+  const encoder = new TextEncoder();
+  return new ReadableStream<Uint8Array>({
+    pull(controller) {
+      let chunk = '';
+      for (let i = 0; i < ROWS_PER_CHUNK; i++) {
+        const next = lines.next();
+        if (next.done) {
+          if (chunk) controller.enqueue(encoder.encode(chunk));
+          controller.close();
+          return;
+        }
+        chunk += `${next.value}\n`;
+      }
+      controller.enqueue(encoder.encode(chunk));
+    },
+  });
+}
 
 /**
  * GET /api/dispatch-register/export
- * Export dispatch register in audit-friendly CSV format
+ * Export dispatch register in audit-friendly CSV format, streamed row by row
  * Query params:
  *   - asOfDate: ISO date string (optional)
- *   - format: 'csv' (default) or 'json'
+ *   - format: 'csv' (default) or 'json' (NDJSON, one register entry per line)
  */
 export async function GET(req: Request) {
   try {
@@ -20,217 +189,31 @@ export async function GET(req: Request) {
     const asOfDateParam = searchParams.get('asOfDate');
     const format = searchParams.get('format') || 'csv';
 
-    // Fetch dispatch register data
-    const baseUrl = new URL(req.url);
-    baseUrl.pathname = '/api/dispatch-register';
-    if (asOfDateParam) {
-      baseUrl.searchParams.set('asOfDate', asOfDateParam);
-    }
+    // Same as-of semantics and cache entry as GET /api/dispatch-register
+    const asOfDate = asOfDateParam ? new Date(asOfDateParam) : new Date();
+    asOfDate.setHours(23, 59, 59, 999);
 
-    const dispatchRes = await fetch(baseUrl.toString(), {
-      headers: {
-        cookie: req.headers.get('cookie') || '',
-      },
-    });
-
-    if (!dispatchRes.ok) {
-      throw new Error('Failed to fetch dispatch register data');
-    }
+    const prisma = await getPrismaClient();
+    const { value: register } = await getDispatchRegister(prisma, { asOfDate });
 
-    const dispatchData = await dispatchRes.json();
-    const entries = dispatchData.data || [];
+    const exportDate = new Date().toISOString();
+    const fileDate = exportDate.split('T')[0];
 
     if (format === 'json') {
-      return NextResponse.json({
-        exportDate: new Date().toISOString(),
-        asOfDate: dispatchData.asOfDate,
-        entries: entries.map((entry: any) => ({
-          customerId: entry.customerId,
-          customerName: entry.customerName,
-          productId: entry.productId,
-          productName: entry.productName,
-          productSKU: entry.productSKU || '',
-          primaryPONumber: entry.primaryPONumber,
-          primaryPODate: entry.primaryPODate,
-          totalOrderReceived: entry.totalOrderReceived,
-          totalDispatched: entry.totalDispatched,
-          totalPending: entry.totalPending,
-          dispatchStatus: entry.dispatchStatus,
-          hasAnomaly: entry.hasAnomaly,
-          anomalyMessage: entry.anomalyMessage,
-          salesPerson: entry.salesPerson,
-          salesPersonEmail: entry.salesPersonEmail,
-          unitOfMeasure: 'MTS',
-          lineItems: entry.lineItems.map((li: any) => ({
-            salesOrderId: li.salesOrderId,
-            salesOrderNumber: li.salesOrderNumber,
-            salesOrderDate: li.salesOrderDate,
-            salesOrderItemId: li.salesOrderItemId,
-            orderedQuantity: li.orderedQuantity,
-            dispatchedQuantity: li.dispatchedQuantity,
-            pendingQuantity: li.pendingQuantity,
-            invoices: li.invoices.map((inv: any) => ({
-              invoiceId: inv.invoiceId,
-              invoiceNumber: inv.invoiceNumber,
-              invoiceDate: inv.invoiceDate,
-              quantity: inv.quantity,
-            })),
-          })),
-        })),
+      return new NextResponse(streamLines(ndjsonLines(register.data)), {
+        headers: {
+          'Content-Type': 'application/x-ndjson',
+          'Content-Disposition': `attachment; filename="dispatch-register-${fileDate}.ndjson"`,
+          'X-Export-Date': exportDate,
+          'X-As-Of-Date': register.asOfDate,
+        },
       });
     }
 
-    // CSV format
-    const csvRows: string[] = [];
-
-    // Header row
-    csvRows.push(
-      [
-        'Customer ID',
-        'Customer Name',
-        'Product ID',
-        'Product Name',
-        'Product SKU',
-        'Primary PO Number',
-        'Primary PO Date',
-        'Total Order Received (MTS)',
-        'Total Dispatched (MTS)',
-        'Total Pending (MTS)',
-        'Dispatch Status',
-        'Has Anomaly',
-        'Anomaly Message',
-        'Sales Person',
-        'Sales Person Email',
-        'Unit of Measure',
-        'Sales Order ID',
-        'Sales Order Number',
-        'Sales Order Date',
-        'Sales Order Item ID',
-        'Ordered Quantity (MTS)',
-        'Dispatched Quantity (MTS)',
-        'Pending Quantity (MTS)',
-        'Invoice ID',
-        'Invoice Number',
-        'Invoice Date',
-        'Invoice Quantity (MTS)',
-      ].join(',')
-    );
-
-    // Data rows (one row per invoice line item for full traceability)
-    entries.forEach((entry: any) => {
-      if (entry.lineItems.length === 0) {
-        // No line items, add summary row
-        csvRows.push(
-          [
-            entry.customerId,
-            `"${entry.customerName}"`,
-            entry.productId,
-            `"${entry.productName}"`,
-            entry.productSKU || '',
-            entry.primaryPONumber,
-            entry.primaryPODate || '',
-            entry.totalOrderReceived.toFixed(2),
-            entry.totalDispatched.toFixed(2),
-            entry.totalPending.toFixed(2),
-            entry.dispatchStatus,
-            entry.hasAnomaly ? 'Yes' : 'No',
-            entry.anomalyMessage ? `"${entry.anomalyMessage}"` : '',
-            `"${entry.salesPerson}"`,
-            entry.salesPersonEmail,
-            'MTS',
-            '',
-            '',
-            '',
-            '',
-            '',
-            '',
-            '',
-            '',
-            '',
-            '',
-            '',
-          ].join(',')
-        );
-      } else {
-        entry.lineItems.forEach((lineItem: any) => {
-          if (lineItem.invoices.length === 0) {
-            // No invoices, add line item row
-            csvRows.push(
-              [
-                entry.customerId,
-                `"${entry.customerName}"`,
-                entry.productId,
-                `"${entry.productName}"`,
-                entry.productSKU || '',
-                entry.primaryPONumber,
-                entry.primaryPODate || '',
-                entry.totalOrderReceived.toFixed(2),
-                entry.totalDispatched.toFixed(2),
-                entry.totalPending.toFixed(2),
-                entry.dispatchStatus,
-                entry.hasAnomaly ? 'Yes' : 'No',
-                entry.anomalyMessage ? `"${entry.anomalyMessage}"` : '',
-                `"${entry.salesPerson}"`,
-                entry.salesPersonEmail,
-                'MTS',
-                lineItem.salesOrderId,
-                lineItem.salesOrderNumber,
-                lineItem.salesOrderDate,
-                lineItem.salesOrderItemId,
-                lineItem.orderedQuantity.toFixed(2),
-                lineItem.dispatchedQuantity.toFixed(2),
-                lineItem.pendingQuantity.toFixed(2),
-                '',
-                '',
-                '',
-                '',
-              ].join(',')
-            );
-          } else {
-            lineItem.invoices.forEach((invoice: any) => {
-              csvRows.push(
-                [
-                  entry.customerId,
-                  `"${entry.customerName}"`,
-                  entry.productId,
-                  `"${entry.productName}"`,
-                  entry.productSKU || '',
-                  entry.primaryPONumber,
-                  entry.primaryPODate || '',
-                  entry.totalOrderReceived.toFixed(2),
-                  entry.totalDispatched.toFixed(2),
-                  entry.totalPending.toFixed(2),
-                  entry.dispatchStatus,
-                  entry.hasAnomaly ? 'Yes' : 'No',
-                  entry.anomalyMessage ? `"${entry.anomalyMessage}"` : '',
-                  `"${entry.salesPerson}"`,
-                  entry.salesPersonEmail,
-                  'MTS',
-                  lineItem.salesOrderId,
-                  lineItem.salesOrderNumber,
-                  lineItem.salesOrderDate,
-                  lineItem.salesOrderItemId,
-                  lineItem.orderedQuantity.toFixed(2),
-                  lineItem.dispatchedQuantity.toFixed(2),
-                  lineItem.pendingQuantity.toFixed(2),
-                  invoice.invoiceId,
-                  invoice.invoiceNumber,
-                  invoice.invoiceDate,
-                  invoice.quantity.toFixed(2),
-                ].join(',')
-              );
-            });
-          }
-        });
-      }
-    });
-
-    const csv = csvRows.join('\n');
-
-    return new NextResponse(csv, {
+    return new NextResponse(streamLines(csvLines(register.data)), {
       headers: {
         'Content-Type': 'text/csv',
-        'Content-Disposition': `attachment; filename="dispatch-register-${new Date().toISOString().split('T')[0]}.csv"`,
+        'Content-Disposition': `attachment; filename="dispatch-register-${fileDate}.csv"`,
       },
     });
   } catch (error) {
@@ -244,4 +227,3 @@ export async function GET(req: Request) {
     );
   }
 }
-
@@ -1,10 +1,11 @@
 import { NextResponse } from 'next/server';
 import { getAuthContext } from '@/lib/auth';
+import { CACHE_TAGS, invalidateTags } from '@/lib/cache';
 
 /**
  * POST /api/dispatch-register/invalidate-cache
- * Invalidate dispatch register cache (called when Sales Orders or Invoices change)
- * This ensures cache is cleared when underlying data changes
+ * Invalidate the dispatch register cache on every instance
+ * Mutation routes publish these tags themselves; this is for manual refreshes
  */
 export async function POST(req: Request) {
   try {
@@ -13,13 +14,12 @@ export async function POST(req: Request) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
     }
 
-    // In a production environment, you would invalidate Redis cache here
-    // For now, the in-memory cache in route.ts will expire naturally (5 min TTL)
-    // This endpoint can be called by Sales Order/Invoice mutation endpoints to trigger cache clear
+    // Bumps the shared tag versions, so every instance drops its cached register
+    await invalidateTags([CACHE_TAGS.SALES_ORDERS, CACHE_TAGS.INVOICES]);
 
     return NextResponse.json({
       success: true,
-      message: 'Cache invalidation requested. Cache will refresh on next request or expire naturally.',
+      message: 'Dispatch register cache invalidated.',
     });
   } catch (error) {
     console.error('Failed to invalidate cache:', error);
@@ -1,5 +1,6 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
+import { CACHE_TAGS, invalidateTags } from '@/lib/cache';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
 import { requireAuth } from '@/lib/auth-utils';
 import { logActivity } from '@/lib/activity-logger';
@@ -298,6 +299,13 @@ export async function POST(req: Request, { params }: Params) {
       );
     }
 
+    // Invalidate cached reports built from the new document's type
+    if (body.targetType === 'SALES_ORDER') {
+      await invalidateTags([CACHE_TAGS.SALES_ORDERS]);
+    } else if (body.targetType === 'INVOICE') {
+      await invalidateTags([CACHE_TAGS.INVOICES]);
+    }
+
     console.log('Conversion successful:', {
       sourceDocumentId: params.id,
       sourceType,
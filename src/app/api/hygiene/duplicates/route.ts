@@ -1,12 +1,91 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { requireAuth } from '@/lib/auth-utils';
+import { getAuthContext, isRoleAllowed } from '@/lib/auth';
 import { checkDuplicates } from '@/lib/data-hygiene';
 
+/**
+ * GET /api/hygiene/duplicates?cursor=...&limit=50&minScore=0.9
+ * Page through the duplicate clusters from the latest completed clustering run
+ * (scripts/cluster-duplicate-companies.ts), largest clusters first (admin only:
+ * clusters span every lead and customer, regardless of owner)
+ */
+export async function GET(req: Request) {
+  const auth = await getAuthContext(req);
+  if (!auth.userId || !isRoleAllowed(auth.role, ['admin'])) {
+    return NextResponse.json({ error: 'Forbidden' }, { status: 403 });
+  }
+
+  try {
+    const prisma = await getPrismaClient();
+    const { searchParams } = new URL(req.url);
+
+    const cursor = searchParams.get('cursor');
+    const take = Math.min(Math.max(parseInt(searchParams.get('limit') || '50', 10) || 50, 1), 200);
+    const minScore = parseFloat(searchParams.get('minScore') || '');
+
+    const p: any = prisma;
+
+    const run = await p.duplicateClusterRun.findFirst({
+      where: { status: 'completed' },
+      orderBy: { completedAt: 'desc' },
+    });
+
+    if (!run) {
+      return NextResponse.json({ run: null, clusters: [], nextCursor: null });
+    }
+
+    const clusters = await p.duplicateCluster.findMany({
+      where: {
+        runId: run.id,
+        ...(Number.isFinite(minScore) && { score: { gte: minScore } }),
+      },
+      orderBy: [{ size: 'desc' }, { id: 'asc' }],
+      take: take + 1, // Fetch one extra to know whether there is a next page
+      ...(cursor
+        ? {
+            skip: 1,
+            cursor: { id: cursor },
+          }
+        : {}),
+      include: {
+        members: {
+          select: { entityType: true, entityId: true, srplId: true, companyName: true },
+          orderBy: { companyName: 'asc' },
+        },
+      },
+    });
+
+    let nextCursor: string | null = null;
+    if (clusters.length > take) {
+      clusters.pop();
+      nextCursor = clusters[clusters.length - 1].id;
+    }
+
+    return NextResponse.json({
+      run: {
+        id: run.id,
+        threshold: run.threshold,
+        recordCount: run.recordCount,
+        clusterCount: run.clusterCount,
+        completedAt: run.completedAt,
+      },
+      clusters,
+      nextCursor,
+    });
+  } catch (error) {
+    console.error('Failed to fetch duplicate clusters:', error);
+    return NextResponse.json(
+      { error: 'Failed to fetch duplicate clusters', details: error instanceof Error ? error.message : 'Unknown error' },
+      { status: 500 },
+    );
+  }
+}
+
 /**
  * POST /api/hygiene/duplicates
  * Check for duplicate leads/customers
- * Body: { companyName?, email?, phone?, gstNo?, vatNumber?, excludeId? }
+ * Body: { companyName?, email?, phone?, gstNo?, vatNumber?, country?, excludeId? }
  */
 export async function POST(req: Request) {
   const authError = await requireAuth();
@@ -14,7 +93,7 @@ export async function POST(req: Request) {
 
   try {
     const body = await req.json();
-    const { companyName, email, phone, gstNo, vatNumber, excludeId } = body;
+    const { companyName, email, phone, gstNo, vatNumber, country, excludeId } = body;
 
     if (!companyName && !email && !phone && !gstNo && !vatNumber) {
       return NextResponse.json({ error: 'At least one field is required' }, { status: 400 });
@@ -27,6 +106,7 @@ export async function POST(req: Request) {
       phone,
       gstNo,
       vatNumber,
+      country,
     }, excludeId);
 
     return NextResponse.json({
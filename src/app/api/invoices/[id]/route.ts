@@ -1,5 +1,6 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
+import { CACHE_TAGS, invalidateTags } from '@/lib/cache';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
 import { invoiceUpdateSchema, validateInput } from '@/lib/validation';
 import { logActivity } from '@/lib/activity-logger';
@@ -239,14 +240,8 @@ export async function PATCH(req: Request, { params }: Params) {
       }
     }
 
-    // Invalidate dispatch register cache if items changed
-    try {
-      const { invalidateDispatchCache } = await import('@/app/api/dispatch-register/route');
-      invalidateDispatchCache();
-    } catch (error) {
-      // Best-effort cache invalidation
-      console.warn('Failed to invalidate dispatch cache:', error);
-    }
+    // Invalidate cached reports built from invoices (dispatch register)
+    await invalidateTags([CACHE_TAGS.INVOICES]);
 
     return NextResponse.json(updated);
   } catch (error) {
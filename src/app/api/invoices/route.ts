@@ -1,9 +1,11 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
+import { CACHE_TAGS, invalidateTags } from '@/lib/cache';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
 import { requireAuth } from '@/lib/auth-utils';
 import { logActivity } from '@/lib/activity-logger';
 import { capturePriceHistory } from '@/lib/price-history';
+import { resolveDocumentNumber } from '@/lib/document-number-generator';
 
 // GET /api/invoices - list invoices with customer and items
 export async function GET() {
@@ -32,7 +34,7 @@ export async function POST(req: Request) {
 
   const invoice = await prisma.invoice.create({
     data: {
-      invoiceNumber: body.invoiceNumber,
+      invoiceNumber: await resolveDocumentNumber('INVOICE', body.invoiceNumber),
       status: body.status ?? 'Draft',
       issueDate: body.issueDate ? new Date(body.issueDate) : new Date(),
       notes: body.notes,
@@ -92,14 +94,8 @@ export async function POST(req: Request) {
     currency: invoice.customer.currency || 'INR',
   });
 
-  // Invalidate dispatch register cache
-  try {
-    const { invalidateDispatchCache } = await import('@/app/api/dispatch-register/route');
-    invalidateDispatchCache();
-  } catch (error) {
-    // Best-effort cache invalidation
-    console.warn('Failed to invalidate dispatch cache:', error);
-  }
+  // Invalidate cached reports built from invoices (dispatch register)
+  await invalidateTags([CACHE_TAGS.INVOICES]);
 
   return NextResponse.json(invoice, { status: 201 });
 }
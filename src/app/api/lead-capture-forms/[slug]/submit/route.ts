@@ -99,6 +99,7 @@ export async function POST(req: Request, { params }: Params) {
       email: validatedData.email,
       phone: validatedData.phone,
       gstNo: validatedData.gstNo,
+      country: validatedData.country,
     });
 
     // Generate SRPL ID
@@ -2,17 +2,23 @@ import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { requireAuth } from '@/lib/auth-utils';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
-import { logActivity } from '@/lib/activity-logger';
-import { trackStageChange } from '@/lib/lead-aging';
-import { updateLeadScore } from '@/lib/lead-scoring';
+import { logActivities } from '@/lib/activity-logger';
+import { trackStageChanges } from '@/lib/lead-aging';
+import { updateLeadScores } from '@/lib/lead-scoring';
 import { alertBulkOperation } from '@/lib/security-alerts';
 import { logAudit } from '@/lib/audit-logger';
 import { getAlertThresholds } from '@/lib/alert-config';
 
+// Leads loaded and written per batch of statements
+const BULK_CHUNK_SIZE = 500;
+
 /**
  * POST /api/leads/bulk-actions
  * Perform bulk actions on multiple leads
- * Body: { action: 'update_stage' | 'assign' | 'schedule_followup', leadIds: string[], ...actionData }
+ * Body: { action: 'update_stage' | 'assign' | 'schedule_followup' | 'delete', leadIds: string[], ...actionData }
+ * Leads are processed in chunks: one query loads a chunk, updateMany applies the change,
+ * and scores, stage aging and activity entries are written in batches.
+ * Returns a result per lead id.
  */
 export async function POST(req: Request) {
   const authError = await requireAuth();
@@ -79,6 +85,30 @@ export async function POST(req: Request) {
     }).catch(err => console.warn('Failed to log bulk operation audit:', err));
 
     const results: Array<{ id: string; success: boolean; error?: string }> = [];
+    const fail = (ids: string[], error: string) => {
+      ids.forEach((id) => results.push({ id, success: false, error }));
+    };
+    const succeed = (ids: string[]) => {
+      ids.forEach((id) => results.push({ id, success: true }));
+    };
+
+    // Each chunk is loaded with one query and written with a few batched statements
+    const chunks: string[][] = [];
+    const uniqueIds: string[] = Array.from(new Set(leadIds));
+    for (let i = 0; i < uniqueIds.length; i += BULK_CHUNK_SIZE) {
+      chunks.push(uniqueIds.slice(i, i + BULK_CHUNK_SIZE));
+    }
+
+    // Load a chunk's leads, reporting ids that don't exist
+    const loadLeads = async <T extends { id: string }>(ids: string[], select: Record<string, true>) => {
+      const leads = (await prisma.lead.findMany({
+        where: { id: { in: ids } },
+        select: { id: true, ...select },
+      })) as unknown as T[];
+      const found = new Set(leads.map((lead) => lead.id));
+      fail(ids.filter((id) => !found.has(id)), 'Lead not found');
+      return leads;
+    };
 
     switch (action) {
       case 'update_stage': {
@@ -99,14 +129,15 @@ export async function POST(req: Request) {
           );
         }
 
-        for (const leadId of leadIds) {
-          try {
-            const existing = await prisma.lead.findUnique({ where: { id: leadId } });
-            if (!existing) {
-              results.push({ id: leadId, success: false, error: 'Lead not found' });
-              continue;
-            }
+        for (const chunk of chunks) {
+          const existing = await loadLeads<{ id: string; srplId: string | null; status: string }>(chunk, {
+            srplId: true,
+            status: true,
+          });
+          const ids = existing.map((lead) => lead.id);
+          if (ids.length === 0) continue;
 
+          try {
             const updateData: any = {
               status,
               lastActivityDate: new Date(),
@@ -118,40 +149,38 @@ export async function POST(req: Request) {
               updateData.wonLostAt = new Date();
             }
 
-            const updated = await prisma.lead.update({
-              where: { id: leadId },
+            await prisma.lead.updateMany({
+              where: { id: { in: ids } },
               data: updateData,
             });
+          } catch (error: any) {
+            fail(ids, error.message || 'Update failed');
+            continue;
+          }
 
-            // Track stage change
-            await trackStageChange(prisma, leadId, statusId || null, status);
-
-            // Update score
-            await updateLeadScore(prisma, leadId);
+          // Track stage change before scoring, which reads the current stage
+          await trackStageChanges(prisma, ids, statusId || null, status);
 
-            // Log activity
-            await logActivity({
+          await Promise.all([
+            updateLeadScores(prisma, ids),
+            logActivities(
               prisma,
-              module: 'LEAD',
-              entityType: 'lead',
-              entityId: leadId,
-              srplId: updated.srplId || undefined,
-              action: 'stage_change',
-              field: 'status',
-              oldValue: existing.status,
-              newValue: status,
-              description: `Bulk status update: "${existing.status}" to "${status}"`,
-              performedById: auth.userId,
-            });
-
-            results.push({ id: leadId, success: true });
-          } catch (error: any) {
-            results.push({
-              id: leadId,
-              success: false,
-              error: error.message || 'Update failed',
-            });
-          }
+              existing.map((lead) => ({
+                module: 'LEAD' as const,
+                entityType: 'lead',
+                entityId: lead.id,
+                srplId: lead.srplId || undefined,
+                action: 'stage_change',
+                field: 'status',
+                oldValue: lead.status,
+                newValue: status,
+                description: `Bulk status update: "${lead.status}" to "${status}"`,
+                performedById: auth.userId,
+              }))
+            ),
+          ]);
+
+          succeed(ids);
         }
         break;
       }
@@ -162,48 +191,48 @@ export async function POST(req: Request) {
           return NextResponse.json({ error: 'ownerId is required' }, { status: 400 });
         }
 
-        for (const leadId of leadIds) {
-          try {
-            const existing = await prisma.lead.findUnique({ where: { id: leadId } });
-            if (!existing) {
-              results.push({ id: leadId, success: false, error: 'Lead not found' });
-              continue;
-            }
+        for (const chunk of chunks) {
+          const existing = await loadLeads<{ id: string; srplId: string | null; ownerId: string | null }>(chunk, {
+            srplId: true,
+            ownerId: true,
+          });
+          const ids = existing.map((lead) => lead.id);
+          if (ids.length === 0) continue;
 
-            const updated = await prisma.lead.update({
-              where: { id: leadId },
+          try {
+            await prisma.lead.updateMany({
+              where: { id: { in: ids } },
               data: {
                 ownerId: ownerId || null,
                 lastActivityDate: new Date(),
               },
             });
+          } catch (error: any) {
+            fail(ids, error.message || 'Assignment failed');
+            continue;
+          }
 
+          await Promise.all([
             // Update score (assignment affects score)
-            await updateLeadScore(prisma, leadId);
-
-            // Log activity
-            await logActivity({
+            updateLeadScores(prisma, ids),
+            logActivities(
               prisma,
-              module: 'LEAD',
-              entityType: 'lead',
-              entityId: leadId,
-              srplId: updated.srplId || undefined,
-              action: 'update',
-              field: 'ownerId',
-              oldValue: existing.ownerId,
-              newValue: ownerId,
-              description: `Bulk assignment: Lead assigned to user ${ownerId}`,
-              performedById: auth.userId,
-            });
-
-            results.push({ id: leadId, success: true });
-          } catch (error: any) {
-            results.push({
-              id: leadId,
-              success: false,
-              error: error.message || 'Assignment failed',
-            });
-          }
+              existing.map((lead) => ({
+                module: 'LEAD' as const,
+                entityType: 'lead',
+                entityId: lead.id,
+                srplId: lead.srplId || undefined,
+                action: 'update',
+                field: 'ownerId',
+                oldValue: lead.ownerId,
+                newValue: ownerId,
+                description: `Bulk assignment: Lead assigned to user ${ownerId}`,
+                performedById: auth.userId,
+              }))
+            ),
+          ]);
+
+          succeed(ids);
         }
         break;
       }
@@ -214,38 +243,40 @@ export async function POST(req: Request) {
           return NextResponse.json({ error: 'followUpDate is required' }, { status: 400 });
         }
 
-        for (const leadId of leadIds) {
+        for (const chunk of chunks) {
+          const existing = await loadLeads<{ id: string; srplId: string | null }>(chunk, { srplId: true });
+          const ids = existing.map((lead) => lead.id);
+          if (ids.length === 0) continue;
+
           try {
-            const updated = await prisma.lead.update({
-              where: { id: leadId },
+            await prisma.lead.updateMany({
+              where: { id: { in: ids } },
               data: {
                 followUpDate: new Date(followUpDate),
                 lastActivityDate: new Date(),
               },
             });
+          } catch (error: any) {
+            fail(ids, error.message || 'Scheduling failed');
+            continue;
+          }
 
-            // Log activity
-            await logActivity({
-              prisma,
-              module: 'LEAD',
+          await logActivities(
+            prisma,
+            existing.map((lead) => ({
+              module: 'LEAD' as const,
               entityType: 'lead',
-              entityId: leadId,
-              srplId: updated.srplId || undefined,
+              entityId: lead.id,
+              srplId: lead.srplId || undefined,
               action: 'update',
               field: 'followUpDate',
               newValue: followUpDate,
               description: `Bulk follow-up scheduled: ${followUpDate}`,
               performedById: auth.userId,
-            });
+            }))
+          );
 
-            results.push({ id: leadId, success: true });
-          } catch (error: any) {
-            results.push({
-              id: leadId,
-              success: false,
-              error: error.message || 'Scheduling failed',
-            });
-          }
+          succeed(ids);
         }
         break;
       }
@@ -256,43 +287,46 @@ export async function POST(req: Request) {
           return NextResponse.json({ error: 'Only admins can delete leads' }, { status: 403 });
         }
 
-        for (const leadId of leadIds) {
+        for (const chunk of chunks) {
+          const existing = await loadLeads<{ id: string; srplId: string | null; companyName: string }>(chunk, {
+            srplId: true,
+            companyName: true,
+          });
+          if (existing.length === 0) continue;
+
+          let deleted = existing;
           try {
-            const existing = await prisma.lead.findUnique({
-              where: { id: leadId },
-              select: { id: true, srplId: true, companyName: true },
+            await prisma.lead.deleteMany({
+              where: { id: { in: existing.map((lead) => lead.id) } },
             });
-
-            if (!existing) {
-              results.push({ id: leadId, success: false, error: 'Lead not found' });
-              continue;
+          } catch {
+            // A lead still referenced elsewhere fails the whole batch; retry one by one
+            // so the others are deleted and the failures reported per id
+            deleted = [];
+            for (const lead of existing) {
+              try {
+                await prisma.lead.delete({ where: { id: lead.id } });
+                deleted.push(lead);
+              } catch (error: any) {
+                fail([lead.id], error.message || 'Delete failed');
+              }
             }
+          }
 
-            // Log activity before deletion
-            await logActivity({
-              prisma,
-              module: 'LEAD',
+          await logActivities(
+            prisma,
+            deleted.map((lead) => ({
+              module: 'LEAD' as const,
               entityType: 'lead',
-              entityId: leadId,
-              srplId: existing.srplId || undefined,
+              entityId: lead.id,
+              srplId: lead.srplId || undefined,
               action: 'delete',
-              description: `Bulk delete: Lead "${existing.companyName}" (${existing.srplId || leadId}) deleted`,
+              description: `Bulk delete: Lead "${lead.companyName}" (${lead.srplId || lead.id}) deleted`,
               performedById: auth.userId,
-            });
-
-            // Delete the lead
-            await prisma.lead.delete({
-              where: { id: leadId },
-            });
+            }))
+          );
 
-            results.push({ id: leadId, success: true });
-          } catch (error: any) {
-            results.push({
-              id: leadId,
-              success: false,
-              error: error.message || 'Delete failed',
-            });
-          }
+          succeed(deleted.map((lead) => lead.id));
         }
         break;
       }
@@ -301,6 +335,10 @@ export async function POST(req: Request) {
         return NextResponse.json({ error: `Unknown action: ${action}` }, { status: 400 });
     }
 
+    // Report results in request order
+    const order = new Map(uniqueIds.map((id, index) => [id, index]));
+    results.sort((a, b) => (order.get(a.id) ?? 0) - (order.get(b.id) ?? 0));
+
     const successCount = results.filter((r) => r.success).length;
     const failureCount = results.length - successCount;
 
@@ -0,0 +1,104 @@
+import { NextResponse } from 'next/server';
+import { getPrismaClient } from '@/lib/prisma';
+import { getAuthContext, isRoleAllowed, type AuthContext } from '@/lib/auth';
+import { runLeadImport } from '@/lib/lead-import';
+
+type Params = {
+  params: { id: string };
+};
+
+/**
+ * Load a lead import job visible to the caller (its creator, or any admin)
+ */
+async function findJob(prisma: any, id: string, auth: AuthContext) {
+  const job = await prisma.importJob.findUnique({ where: { id } });
+  if (!job || job.entityType !== 'lead') return null;
+  if (auth.role !== 'admin' && job.createdById !== auth.userId) return null;
+  return job;
+}
+
+function serializeJob(job: any) {
+  return {
+    id: job.id,
+    status: job.status,
+    format: job.format,
+    chunkSize: job.chunkSize,
+    processedRows: job.processedRows,
+    createdRows: job.createdRows,
+    failedRows: job.failedRows,
+    duplicateRows: job.duplicateRows,
+    bytesProcessed: job.bytesProcessed,
+    totalBytes: job.totalBytes,
+    // Share of the upload consumed; null when the client did not report a size
+    progress: job.totalBytes
+      ? Math.min(100, Math.round((job.bytesProcessed / job.totalBytes) * 100))
+      : null,
+    errors: job.errors ? JSON.parse(job.errors) : [],
+    duplicates: job.duplicates ? JSON.parse(job.duplicates) : [],
+    message: job.message,
+    startedAt: job.startedAt,
+    completedAt: job.completedAt,
+  };
+}
+
+/**
+ * GET /api/leads/import/jobs/[id]
+ * Poll import progress, per-row errors, and per-row duplicate matches
+ */
+export async function GET(req: Request, { params }: Params) {
+  const auth = await getAuthContext(req);
+  if (!auth.userId || !isRoleAllowed(auth.role, ['admin', 'sales'])) {
+    return NextResponse.json({ error: 'Forbidden' }, { status: 403 });
+  }
+
+  const prisma = await getPrismaClient();
+  const job = await findJob(prisma, params.id, auth);
+  if (!job) {
+    return NextResponse.json({ error: 'Not found' }, { status: 404 });
+  }
+
+  return NextResponse.json(serializeJob(job));
+}
+
+/**
+ * PUT /api/leads/import/jobs/[id]
+ * Upload the CSV or NDJSON file as the raw request body. The body is parsed as it
+ * arrives and inserted in chunks; the response is sent once the import finishes.
+ */
+export async function PUT(req: Request, { params }: Params) {
+  const auth = await getAuthContext(req);
+  if (!auth.userId || !isRoleAllowed(auth.role, ['admin', 'sales'])) {
+    return NextResponse.json({ error: 'Forbidden' }, { status: 403 });
+  }
+
+  const prisma = await getPrismaClient();
+  const job = await findJob(prisma, params.id, auth);
+  if (!job) {
+    return NextResponse.json({ error: 'Not found' }, { status: 404 });
+  }
+  if (job.status !== 'pending') {
+    return NextResponse.json({ error: `Import job is already ${job.status}` }, { status: 409 });
+  }
+  if (!req.body) {
+    return NextResponse.json({ error: 'Request body is empty' }, { status: 400 });
+  }
+
+  // Claim the job so a retried upload cannot run it twice
+  const claimed = await (prisma as any).importJob.updateMany({
+    where: { id: job.id, status: 'pending' },
+    data: { status: 'running' },
+  });
+  if (claimed.count === 0) {
+    return NextResponse.json({ error: 'Import job is already running' }, { status: 409 });
+  }
+
+  await runLeadImport(prisma, job.id, req.body, {
+    format: job.format,
+    chunkSize: job.chunkSize,
+    ownerId: auth.userId,
+    salesScope: auth.salesScope,
+  });
+
+  const finished = await (prisma as any).importJob.findUnique({ where: { id: job.id } });
+  return NextResponse.json(serializeJob(finished));
+}
@@ -0,0 +1,42 @@
+import { NextResponse } from 'next/server';
+import { getPrismaClient } from '@/lib/prisma';
+import { getAuthContext, isRoleAllowed } from '@/lib/auth';
+import { DEFAULT_IMPORT_CHUNK_SIZE, MAX_IMPORT_CHUNK_SIZE } from '@/lib/lead-import';
+
+/**
+ * POST /api/leads/import/jobs
+ * Create a streamed lead import job. Upload the file to PUT /api/leads/import/jobs/[id]
+ * and poll GET /api/leads/import/jobs/[id] for progress.
+ * Body: { format: 'csv' | 'ndjson', chunkSize?, totalBytes? }
+ */
+export async function POST(req: Request) {
+  const auth = await getAuthContext(req);
+  if (!auth.userId || !isRoleAllowed(auth.role, ['admin', 'sales'])) {
+    return NextResponse.json({ error: 'Forbidden' }, { status: 403 });
+  }
+
+  const body = await req.json().catch(() => ({}));
+  const format = body.format === 'ndjson' ? 'ndjson' : body.format === 'csv' || !body.format ? 'csv' : null;
+  if (!format) {
+    return NextResponse.json({ error: 'format must be csv or ndjson' }, { status: 400 });
+  }
+
+  const requestedChunkSize = parseInt(body.chunkSize, 10);
+  const chunkSize = Number.isFinite(requestedChunkSize)
+    ? Math.min(Math.max(requestedChunkSize, 1), MAX_IMPORT_CHUNK_SIZE)
+    : DEFAULT_IMPORT_CHUNK_SIZE;
+  const totalBytes = Number.isInteger(body.totalBytes) && body.totalBytes > 0 ? body.totalBytes : null;
+
+  const prisma = await getPrismaClient();
+  const job = await (prisma as any).importJob.create({
+    data: {
+      entityType: 'lead',
+      format,
+      chunkSize,
+      totalBytes,
+      createdById: auth.userId,
+    },
+  });
+
+  return NextResponse.json({ jobId: job.id }, { status: 201 });
+}
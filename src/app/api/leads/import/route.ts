@@ -1,7 +1,16 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
+import { reserveSRPLIdRange } from '@/lib/srpl-id-generator';
+import { checkDuplicatesBatch } from '@/lib/data-hygiene';
 
+/**
+ * POST /api/leads/import
+ * Import a small JSON array of leads in one transaction.
+ * Large files should use the streamed, chunked import at /api/leads/import/jobs.
+ * Response: { created, duplicates: [{ index, matches }] } for rows matching existing
+ * leads or customers (reported, not skipped)
+ */
 export async function POST(req: Request) {
   const auth = await getAuthContext(req);
   if (!auth.userId || !isRoleAllowed(auth.role, ['admin', 'sales'])) {
@@ -24,10 +33,28 @@ export async function POST(req: Request) {
   }
 
   const prisma = await getPrismaClient();
+
+  // Checked before the insert so rows don't match themselves
+  const matches = await checkDuplicatesBatch(
+    prisma,
+    leads.map((l) => ({ companyName: l.companyName, email: l.email, phone: l.phone, country: l.country })),
+  );
+  const duplicates = matches
+    .map((rowMatches, index) => ({ index, matches: rowMatches }))
+    .filter((row) => row.matches.length > 0);
+
+  // Assign all SRPL IDs up front in one round trip instead of once per row
+  const { ids: srplIds } = await reserveSRPLIdRange({
+    moduleCode: 'LEAD',
+    prisma,
+    count: leads.length,
+  });
+
   const created = await prisma.$transaction(
-    leads.map(l =>
+    leads.map((l, index) =>
       prisma.lead.create({
         data: {
+          srplId: srplIds[index],
           companyName: l.companyName,
           contactName: l.contactName,
           email: l.email,
@@ -40,7 +67,7 @@ export async function POST(req: Request) {
     ),
   );
 
-  return NextResponse.json(created, { status: 201 });
+  return NextResponse.json({ created, duplicates }, { status: 201 });
 }
 
 
@@ -8,7 +8,55 @@ import { logActivity } from '@/lib/activity-logger';
 import { runAutomationRules } from '@/lib/automation-engine';
 import { updateLeadScore } from '@/lib/lead-scoring';
 import { trackStageChange } from '@/lib/lead-aging';
-import { getVisibilityFilter, hasPermission, getFieldPermissions, applyFieldPermissions } from '@/lib/rbac';
+import { getVisibilityFilter, hasPermission, getFieldPermissions, getFieldSelect, applyFieldPermissions } from '@/lib/rbac';
+
+// Columns returned by the list endpoint; narrowed per user by getFieldSelect
+const LEAD_LIST_SELECT = {
+  id: true,
+  srplId: true,
+  companyName: true,
+  contactName: true,
+  email: true,
+  phone: true,
+  status: true,
+  source: true,
+  country: true,
+  state: true,
+  city: true,
+  productInterest: true,
+  application: true,
+  monthlyRequirement: true,
+  followUpDate: true,
+  createdAt: true,
+  ownerId: true,
+  // Phase 2: Lead Scoring & Aging
+  score: true,
+  temperature: true,
+  lastActivityDate: true,
+  winLossReasonId: true,
+  wonLostAt: true,
+} as const;
+
+// Reduced projection for the fallback query (without Phase 2 columns)
+const LEAD_FALLBACK_SELECT = {
+  id: true,
+  srplId: true,
+  companyName: true,
+  contactName: true,
+  email: true,
+  phone: true,
+  status: true,
+  source: true,
+  country: true,
+  state: true,
+  city: true,
+  productInterest: true,
+  application: true,
+  monthlyRequirement: true,
+  followUpDate: true,
+  createdAt: true,
+  ownerId: true,
+} as const;
 
 // GET /api/leads - list leads
 export async function GET(req: Request) {
@@ -109,7 +157,11 @@ export async function GET(req: Request) {
     // Determine where clause
     const whereClause = Object.keys(cleanFilter).length > 0 ? cleanFilter : undefined;
 
-    const fieldPerms = await getFieldPermissions(prisma, auth, 'lead');
+    // Hidden fields are left out of the query rather than stripped afterwards
+    const [leadSelect, fallbackSelect] = await Promise.all([
+      getFieldSelect(prisma, auth, 'lead', LEAD_LIST_SELECT),
+      getFieldSelect(prisma, auth, 'lead', LEAD_FALLBACK_SELECT),
+    ]);
 
     let rawLeads;
     try {
@@ -120,31 +172,7 @@ export async function GET(req: Request) {
       // Main query
       rawLeads = await prisma.lead.findMany({
         where: whereClause,
-        select: {
-          id: true,
-          srplId: true,
-          companyName: true,
-          contactName: true,
-          email: true,
-          phone: true,
-          status: true,
-          source: true,
-          country: true,
-          state: true,
-          city: true,
-          productInterest: true,
-          application: true,
-          monthlyRequirement: true,
-          followUpDate: true,
-          createdAt: true,
-          ownerId: true,
-          // Phase 2: Lead Scoring & Aging
-          score: true,
-          temperature: true,
-          lastActivityDate: true,
-          winLossReasonId: true,
-          wonLostAt: true,
-        },
+        select: leadSelect,
         orderBy: { createdAt: 'desc' },
       });
     } catch (dbError: any) {
@@ -162,25 +190,7 @@ export async function GET(req: Request) {
       try {
         console.log('Leads GET - attempting fallback query without filter...');
         rawLeads = await prisma.lead.findMany({
-          select: {
-            id: true,
-            srplId: true,
-            companyName: true,
-            contactName: true,
-            email: true,
-            phone: true,
-            status: true,
-            source: true,
-            country: true,
-            state: true,
-            city: true,
-            productInterest: true,
-            application: true,
-            monthlyRequirement: true,
-            followUpDate: true,
-            createdAt: true,
-            ownerId: true,
-          },
+          select: fallbackSelect,
           orderBy: { createdAt: 'desc' },
           take: 200,
         });
@@ -206,17 +216,13 @@ export async function GET(req: Request) {
       }
     }
 
-    // Apply field-level permissions and map fields
-    const leads = (rawLeads || []).map((lead: (typeof rawLeads)[number]) => {
-      const mapped = {
-        ...lead,
-        // Map Prisma "source" to frontend "leadSource"
-        leadSource: (lead as any).source ?? '',
-        assignedSalesperson: lead.ownerId || '',
-      };
-      // Strip protected fields
-      return applyFieldPermissions(mapped, fieldPerms, 'view');
-    });
+    // Map fields; aliases are only added for columns the user may view
+    const leads = (rawLeads || []).map((lead: (typeof rawLeads)[number]) => ({
+      ...lead,
+      // Map Prisma "source" to frontend "leadSource"
+      ...('source' in lead && { leadSource: (lead as any).source ?? '' }),
+      ...('ownerId' in lead && { assignedSalesperson: lead.ownerId || '' }),
+    }));
 
     console.log(`Leads GET - returning ${leads.length} leads`);
     return NextResponse.json(leads);
@@ -259,6 +265,7 @@ export async function POST(req: Request) {
     phone: body.phone,
     gstNo: body.gstNo,
     vatNumber: body.vatNumber,
+    country: body.country,
   });
 
   // If duplicates found, return them but allow creation (user can choose to proceed)
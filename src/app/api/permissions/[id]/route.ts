@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
+import { invalidatePermissionMatrix } from '@/lib/permission-matrix';
 import { requireAuth } from '@/lib/auth-utils';
 
 type Params = {
@@ -43,7 +44,7 @@ export async function GET(req: Request, { params }: Params) {
  * DELETE /api/permissions/[id]
  * Delete a permission (admin only)
  */
-export async function DELETE(_req: Request, { params }: Params) {
+export async function DELETE(req: Request, { params }: Params) {
   const auth = await getAuthContext(req);
   if (!auth.userId || !isRoleAllowed(auth.role, ['admin'])) {
     return NextResponse.json({ error: 'Forbidden' }, { status: 403 });
@@ -56,6 +57,7 @@ export async function DELETE(_req: Request, { params }: Params) {
     await p.permission.delete({
       where: { id: params.id },
     });
+    await invalidatePermissionMatrix();
 
     return NextResponse.json({ success: true });
   } catch (error) {
@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
+import { invalidatePermissionMatrix } from '@/lib/permission-matrix';
 
 type Params = {
   params: { id: string };
@@ -10,7 +11,7 @@ type Params = {
  * DELETE /api/permissions/roles/[id]
  * Remove a permission from a role (admin only)
  */
-export async function DELETE(_req: Request, { params }: Params) {
+export async function DELETE(req: Request, { params }: Params) {
   const auth = await getAuthContext(req);
   if (!auth.userId || !isRoleAllowed(auth.role, ['admin'])) {
     return NextResponse.json({ error: 'Forbidden' }, { status: 403 });
@@ -23,6 +24,7 @@ export async function DELETE(_req: Request, { params }: Params) {
     await p.rolePermission.delete({
       where: { id: params.id },
     });
+    await invalidatePermissionMatrix();
 
     return NextResponse.json({ success: true });
   } catch (error) {
@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
+import { invalidatePermissionMatrix } from '@/lib/permission-matrix';
 import { requireAuth } from '@/lib/auth-utils';
 
 /**
@@ -74,6 +75,7 @@ export async function POST(req: Request) {
         permission: true,
       },
     });
+    await invalidatePermissionMatrix();
 
     return NextResponse.json(rolePermission, { status: 201 });
   } catch (error: any) {
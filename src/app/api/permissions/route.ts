@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
+import { invalidatePermissionMatrix } from '@/lib/permission-matrix';
 import { requireAuth } from '@/lib/auth-utils';
 
 /**
@@ -61,6 +62,7 @@ export async function POST(req: Request) {
         description: description || null,
       },
     });
+    await invalidatePermissionMatrix();
 
     return NextResponse.json(permission, { status: 201 });
   } catch (error: any) {
@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { requireAuth } from '@/lib/auth-utils';
+import { getDispatchLedgerRows } from '@/lib/dispatch-ledger';
 
 /**
  * GET /api/planning-signal
@@ -34,34 +35,12 @@ export async function GET(req: Request) {
     startDate.setHours(0, 0, 0, 0);
     endDate.setHours(23, 59, 59, 999);
 
-    // Fetch confirmed sales orders
-    const salesOrders = await prisma.salesOrder.findMany({
-      where: {
-        status: 'Confirmed', // Only confirmed orders
-        orderDate: {
-          gte: startDate,
-          lte: endDate,
-        },
-      },
-      include: {
-        items: {
-          include: {
-            product: {
-              select: {
-                id: true,
-                name: true,
-                sku: true,
-                srplId: true,
-              },
-            },
-          },
-        },
-        invoices: {
-          include: {
-            items: true,
-          },
-        },
-      },
+    // Confirmed order lines from the dispatch ledger projection
+    const ledgerRows = await getDispatchLedgerRows(prisma, {
+      orderStatus: 'Confirmed', // Only confirmed orders
+      orderDateFrom: startDate,
+      orderDateTo: endDate,
+      productId: productId || undefined,
     });
 
     // Aggregate by product and month
@@ -90,61 +69,45 @@ export async function GET(req: Request) {
       }
     >();
 
-    salesOrders.forEach((order) => {
-      const orderMonth = `${order.orderDate.getFullYear()}-${String(
-        order.orderDate.getMonth() + 1
+    ledgerRows.forEach((row) => {
+      const orderMonth = `${row.orderDate.getFullYear()}-${String(
+        row.orderDate.getMonth() + 1
       ).padStart(2, '0')}`;
 
-      order.items.forEach((item) => {
-        // Apply product filter if provided
-        if (productId && item.productId !== productId) return;
-
-        const productKey = item.productId;
-        if (!planningMap.has(productKey)) {
-          planningMap.set(productKey, {
-            productId: item.product.id,
-            productName: item.product.name,
-            productSku: item.product.sku,
-            productSrplId: item.product.srplId,
-            monthlyData: new Map(),
-          });
-        }
-
-        const productData = planningMap.get(productKey)!;
-        if (!productData.monthlyData.has(orderMonth)) {
-          productData.monthlyData.set(orderMonth, {
-            month: orderMonth,
-            ordered: 0,
-            dispatched: 0,
-            pending: 0,
-            salesOrders: [],
-          });
-        }
-
-        const monthData = productData.monthlyData.get(orderMonth)!;
-        const orderedQty = Number(item.quantity);
-        monthData.ordered += orderedQty;
-
-        // Calculate dispatched quantity from invoices
-        let dispatchedQty = 0;
-        order.invoices.forEach((invoice) => {
-          invoice.items.forEach((invoiceItem) => {
-            if (invoiceItem.productId === item.productId) {
-              dispatchedQty += Number(invoiceItem.quantity);
-            }
-          });
+      const productKey = row.productId;
+      if (!planningMap.has(productKey)) {
+        planningMap.set(productKey, {
+          productId: row.productId,
+          productName: row.productName,
+          productSku: row.productSku,
+          productSrplId: row.productSrplId,
+          monthlyData: new Map(),
         });
+      }
 
-        monthData.dispatched += dispatchedQty;
-        monthData.pending = monthData.ordered - monthData.dispatched;
-
-        // Add sales order reference
-        monthData.salesOrders.push({
-          id: order.id,
-          orderNumber: order.orderNumber,
-          orderDate: order.orderDate.toISOString(),
-          quantity: orderedQty,
+      const productData = planningMap.get(productKey)!;
+      if (!productData.monthlyData.has(orderMonth)) {
+        productData.monthlyData.set(orderMonth, {
+          month: orderMonth,
+          ordered: 0,
+          dispatched: 0,
+          pending: 0,
+          salesOrders: [],
         });
+      }
+
+      const monthData = productData.monthlyData.get(orderMonth)!;
+      const orderedQty = Number(row.orderedQty);
+      monthData.ordered += orderedQty;
+      monthData.dispatched += Number(row.dispatchedQty);
+      monthData.pending = monthData.ordered - monthData.dispatched;
+
+      // Add sales order reference
+      monthData.salesOrders.push({
+        id: row.salesOrderId,
+        orderNumber: row.orderNumber,
+        orderDate: row.orderDate.toISOString(),
+        quantity: orderedQty,
       });
     });
 
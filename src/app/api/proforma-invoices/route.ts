@@ -3,6 +3,7 @@ import { getPrismaClient } from '@/lib/prisma';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
 import { logActivity } from '@/lib/activity-logger';
 import { capturePriceHistory } from '@/lib/price-history';
+import { resolveDocumentNumber } from '@/lib/document-number-generator';
 
 // GET /api/proforma-invoices - list proforma invoices with customer and items
 export async function GET() {
@@ -27,7 +28,7 @@ export async function POST(req: Request) {
 
   const proforma = await prisma.proformaInvoice.create({
     data: {
-      proformaNumber: body.proformaNumber,
+      proformaNumber: await resolveDocumentNumber('PROFORMA', body.proformaNumber),
       status: body.status ?? 'Draft',
       issueDate: body.issueDate ? new Date(body.issueDate) : new Date(),
       notes: body.notes,
@@ -4,16 +4,47 @@ import { getAuthContext, isRoleAllowed } from '@/lib/auth';
 import { requireAuth } from '@/lib/auth-utils';
 import { logActivity } from '@/lib/activity-logger';
 import { capturePriceHistory } from '@/lib/price-history';
+import { resolveDocumentNumber } from '@/lib/document-number-generator';
+import { getFieldSelect } from '@/lib/rbac';
+
+// Quote columns plus customer and items; narrowed per user by getFieldSelect
+const QUOTE_LIST_SELECT = {
+  id: true,
+  srplId: true,
+  quoteNumber: true,
+  status: true,
+  issueDate: true,
+  validUntil: true,
+  notes: true,
+  customerId: true,
+  leadId: true,
+  salesRepId: true,
+  incoTerms: true,
+  paymentTerms: true,
+  poNumber: true,
+  poDate: true,
+  subtotal: true,
+  taxTotal: true,
+  grandTotal: true,
+  createdAt: true,
+  updatedAt: true,
+  customer: true,
+  items: { include: { product: true } },
+} as const;
 
 // GET /api/quotes - list quotes with customer and items
-export async function GET() {
+export async function GET(req: Request) {
   // SECURITY: Require authentication
   const authError = await requireAuth();
   if (authError) return authError;
 
+  const auth = await getAuthContext(req);
   const prisma = await getPrismaClient();
+
+  // Hidden fields are left out of the query rather than stripped afterwards
+  const quoteSelect = await getFieldSelect(prisma, auth, 'quote', QUOTE_LIST_SELECT);
   const quotes = await prisma.quote.findMany({
-    include: { customer: true, items: { include: { product: true } } },
+    select: quoteSelect,
     orderBy: { createdAt: 'desc' },
   });
 
@@ -30,10 +61,7 @@ export async function POST(req: Request) {
   const prisma = await getPrismaClient();
   const body = await req.json();
 
-  const quoteNumber =
-    body.quoteNumber && body.quoteNumber.length > 0
-      ? body.quoteNumber
-      : `Q-${Date.now()}`;
+  const quoteNumber = await resolveDocumentNumber('QUOTE', body.quoteNumber);
 
   const quote = await prisma.quote.create({
     data: {
@@ -77,26 +77,18 @@ export async function GET(req: Request) {
     });
 
     // Calculate total payment amount
-    const payments = await prisma.payment.findMany({
+    const paymentTotals = await prisma.payment.aggregate({
       where: paymentDateFilter,
-      select: { amount: true },
+      _sum: { amount: true },
     });
-    const totalPayments = payments.reduce((sum, p) => sum + Number(p.amount), 0);
+    const totalPayments = Number(paymentTotals._sum.amount ?? 0);
 
-    // Calculate total invoice amount
-    const invoices = await prisma.invoice.findMany({
+    // Calculate total invoice amount from stored subtotals
+    const invoiceTotals = await prisma.invoice.aggregate({
       where: invoiceDateFilter,
-      include: { items: true },
+      _sum: { subtotal: true },
     });
-    const totalInvoiced = invoices.reduce((sum, inv) => {
-      const invTotal = inv.items.reduce((itemSum, item) => {
-        const price = Number(item.unitPrice) || 0;
-        const qty = item.quantity || 0;
-        const discount = (item.discountPct || 0) / 100;
-        return itemSum + (price * qty * (1 - discount));
-      }, 0);
-      return sum + invTotal;
-    }, 0);
+    const totalInvoiced = Number(invoiceTotals._sum.subtotal ?? 0);
 
     const result = {
       leads: {
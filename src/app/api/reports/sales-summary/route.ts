@@ -1,4 +1,5 @@
 import { NextResponse } from 'next/server';
+import { Prisma } from '@prisma/client';
 import { getPrismaClient } from '@/lib/prisma';
 
 /**
@@ -31,56 +32,28 @@ export async function GET(req: Request) {
 
   try {
     const prisma = await getPrismaClient();
-    // Get quotes
-    const quotes = await prisma.quote.findMany({
-      where: {
-        issueDate: { gte: startDate, lte: endDate },
-      },
-      include: {
-        items: true,
-      },
-    });
 
-    // Get proforma invoices
-    const proformas = await prisma.proformaInvoice.findMany({
-      where: {
-        issueDate: { gte: startDate, lte: endDate },
-      },
-      include: {
-        items: true,
-      },
-    });
-
-    // Get sales orders
-    const salesOrders = await prisma.salesOrder.findMany({
-      where: {
-        orderDate: { gte: startDate, lte: endDate },
-      },
-      include: {
-        items: true,
-      },
-    });
-
-    // Get invoices
-    const invoices = await prisma.invoice.findMany({
-      where: {
-        issueDate: { gte: startDate, lte: endDate },
-      },
-      include: {
-        items: true,
-      },
-    });
-
-    // Helper to calculate total from items
-    const calculateTotal = (items: Array<{ quantity: number; unitPrice: any; discountPct?: number }>) => {
-      return items.reduce((sum, item) => {
-        const price = Number(item.unitPrice) || 0;
-        const qty = item.quantity || 0;
-        const discount = (item.discountPct || 0) / 100;
-        return sum + (price * qty * (1 - discount));
-      }, 0);
+    // Count and sum stored subtotals per month for one document table
+    const summarize = (table: string, dateColumn: string): Promise<Array<{ month: string; count: number; total: number }>> => {
+      const date = Prisma.raw(`"${dateColumn}"`);
+      return prisma.$queryRaw`
+        SELECT
+          to_char(${date}, 'YYYY-MM') AS "month",
+          COUNT(*)::int AS "count",
+          COALESCE(SUM("subtotal"), 0)::float8 AS "total"
+        FROM ${Prisma.raw(`"${table}"`)}
+        WHERE ${date} >= ${startDate} AND ${date} <= ${endDate}
+        GROUP BY 1
+      `;
     };
 
+    const [quotes, proformas, salesOrders, invoices] = await Promise.all([
+      summarize('Quote', 'issueDate'),
+      summarize('ProformaInvoice', 'issueDate'),
+      summarize('SalesOrder', 'orderDate'),
+      summarize('Invoice', 'issueDate'),
+    ]);
+
     // Group by month
     const monthlyData: Record<string, {
       month: string;
@@ -90,73 +63,21 @@ export async function GET(req: Request) {
       invoices: { count: number; total: number };
     }> = {};
 
-    const formatMonth = (date: Date) => {
-      return `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
-    };
-
-    // Process quotes
-    quotes.forEach(quote => {
-      const month = formatMonth(quote.issueDate);
-      if (!monthlyData[month]) {
-        monthlyData[month] = {
-          month,
-          quotes: { count: 0, total: 0 },
-          proformas: { count: 0, total: 0 },
-          salesOrders: { count: 0, total: 0 },
-          invoices: { count: 0, total: 0 },
-        };
-      }
-      monthlyData[month].quotes.count++;
-      monthlyData[month].quotes.total += calculateTotal(quote.items);
-    });
-
-    // Process proformas
-    proformas.forEach(proforma => {
-      const month = formatMonth(proforma.issueDate);
-      if (!monthlyData[month]) {
-        monthlyData[month] = {
-          month,
-          quotes: { count: 0, total: 0 },
-          proformas: { count: 0, total: 0 },
-          salesOrders: { count: 0, total: 0 },
-          invoices: { count: 0, total: 0 },
-        };
-      }
-      monthlyData[month].proformas.count++;
-      monthlyData[month].proformas.total += calculateTotal(proforma.items);
-    });
-
-    // Process sales orders
-    salesOrders.forEach(order => {
-      const month = formatMonth(order.orderDate);
-      if (!monthlyData[month]) {
-        monthlyData[month] = {
-          month,
-          quotes: { count: 0, total: 0 },
-          proformas: { count: 0, total: 0 },
-          salesOrders: { count: 0, total: 0 },
-          invoices: { count: 0, total: 0 },
-        };
-      }
-      monthlyData[month].salesOrders.count++;
-      monthlyData[month].salesOrders.total += calculateTotal(order.items);
-    });
-
-    // Process invoices
-    invoices.forEach(invoice => {
-      const month = formatMonth(invoice.issueDate);
-      if (!monthlyData[month]) {
-        monthlyData[month] = {
-          month,
-          quotes: { count: 0, total: 0 },
-          proformas: { count: 0, total: 0 },
-          salesOrders: { count: 0, total: 0 },
-          invoices: { count: 0, total: 0 },
-        };
+    const sources = { quotes, proformas, salesOrders, invoices };
+    for (const [key, rows] of Object.entries(sources) as Array<[keyof typeof sources, typeof quotes]>) {
+      for (const { month, count, total } of rows) {
+        if (!monthlyData[month]) {
+          monthlyData[month] = {
+            month,
+            quotes: { count: 0, total: 0 },
+            proformas: { count: 0, total: 0 },
+            salesOrders: { count: 0, total: 0 },
+            invoices: { count: 0, total: 0 },
+          };
+        }
+        monthlyData[month][key] = { count, total };
       }
-      monthlyData[month].invoices.count++;
-      monthlyData[month].invoices.total += calculateTotal(invoice.items);
-    });
+    }
 
     // Convert to array and sort by month
     const result = Object.values(monthlyData).sort((a, b) => a.month.localeCompare(b.month));
@@ -1,71 +1,94 @@
 import { NextResponse } from 'next/server';
+import { Prisma } from '@prisma/client';
 import { getPrismaClient } from '@/lib/prisma';
 
+const MAX_LIMIT = 500;
+
+interface TopCustomerCursor {
+  totalAmount: string; // Exact decimal, compared as numeric
+  customerId: string;
+}
+
+function encodeCursor(cursor: TopCustomerCursor): string {
+  return Buffer.from(JSON.stringify(cursor)).toString('base64url');
+}
+
+function decodeCursor(value: string): TopCustomerCursor | null {
+  try {
+    const cursor = JSON.parse(Buffer.from(value, 'base64url').toString('utf8'));
+    if (typeof cursor?.customerId !== 'string' || !/^-?\d+(\.\d+)?$/.test(String(cursor?.totalAmount))) {
+      return null;
+    }
+    return { totalAmount: String(cursor.totalAmount), customerId: cursor.customerId };
+  } catch {
+    return null;
+  }
+}
+
 /**
  * GET /api/reports/top-customers
  * Returns top N customers by total invoice amount
- * Query params: limit (default: 10), startDate, endDate (optional date range filter)
+ * Query params: limit (default: 10, max: 500), startDate, endDate (optional date range filter),
+ *   cursor (optional, from the X-Next-Cursor header of the previous page)
+ * Response headers: X-Next-Cursor when more customers follow
  */
 export async function GET(req: Request) {
   const searchParams = new URL(req.url).searchParams;
-  const limit = parseInt(searchParams.get('limit') || '10', 10);
+  const limit = Math.min(Math.max(parseInt(searchParams.get('limit') || '10', 10) || 10, 1), MAX_LIMIT);
+
+  const cursorParam = searchParams.get('cursor');
+  const cursor = cursorParam ? decodeCursor(cursorParam) : null;
+  if (cursorParam && !cursor) {
+    return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 });
+  }
 
   try {
     // Build date filter if provided
-    const invoiceDateFilter: any = {};
+    const conditions: Prisma.Sql[] = [];
     if (searchParams.get('startDate') && searchParams.get('endDate')) {
       const startDate = new Date(searchParams.get('startDate')!);
       const endDate = new Date(searchParams.get('endDate')!);
       startDate.setHours(0, 0, 0, 0);
       endDate.setHours(23, 59, 59, 999);
-      invoiceDateFilter.issueDate = { gte: startDate, lte: endDate };
+      conditions.push(Prisma.sql`inv."issueDate" >= ${startDate}`, Prisma.sql`inv."issueDate" <= ${endDate}`);
     }
 
-    // Get all invoices with customer and items
-    const prisma = await getPrismaClient();
-    const invoices = await prisma.invoice.findMany({
-      where: invoiceDateFilter,
-      include: {
-        customer: true,
-        items: true,
-      },
-    });
-
-    // Calculate total per customer
-    const customerTotals: Record<string, {
-      customerId: string;
-      customerName: string;
-      invoiceCount: number;
-      totalAmount: number;
-    }> = {};
+    // Keyset: rows strictly after the cursor in (totalAmount DESC, customerId DESC) order
+    const keyset = cursor
+      ? Prisma.sql`HAVING (SUM(inv."subtotal"), inv."customerId") < (${cursor.totalAmount}::numeric, ${cursor.customerId})`
+      : Prisma.empty;
 
-    invoices.forEach(invoice => {
-      const customerId = invoice.customerId;
-      if (!customerTotals[customerId]) {
-        customerTotals[customerId] = {
-          customerId,
-          customerName: invoice.customer.companyName,
-          invoiceCount: 0,
-          totalAmount: 0,
-        };
-      }
+    // One grouped query over stored invoice subtotals; only the requested page leaves the database
+    const prisma = await getPrismaClient();
+    const rows: Array<{ customerId: string; customerName: string; invoiceCount: number; totalAmount: string }> =
+      await prisma.$queryRaw`
+        SELECT
+          inv."customerId" AS "customerId",
+          c."companyName" AS "customerName",
+          COUNT(*)::int AS "invoiceCount",
+          SUM(inv."subtotal")::text AS "totalAmount"
+        FROM "Invoice" inv
+        JOIN "Customer" c ON c."id" = inv."customerId"
+        ${conditions.length > 0 ? Prisma.sql`WHERE ${Prisma.join(conditions, ' AND ')}` : Prisma.empty}
+        GROUP BY inv."customerId", c."companyName"
+        ${keyset}
+        ORDER BY SUM(inv."subtotal") DESC, inv."customerId" DESC
+        LIMIT ${limit + 1}
+      `;
 
-      customerTotals[customerId].invoiceCount++;
-      const invoiceTotal = invoice.items.reduce((sum, item) => {
-        const price = Number(item.unitPrice) || 0;
-        const qty = item.quantity || 0;
-        const discount = (item.discountPct || 0) / 100;
-        return sum + (price * qty * (1 - discount));
-      }, 0);
-      customerTotals[customerId].totalAmount += invoiceTotal;
-    });
+    const page = rows.slice(0, limit);
+    const last = page[page.length - 1];
+    const headers: Record<string, string> = {};
+    if (rows.length > limit && last) {
+      headers['X-Next-Cursor'] = encodeCursor({ totalAmount: last.totalAmount, customerId: last.customerId });
+    }
 
-    // Convert to array, sort by total amount, and limit
-    const result = Object.values(customerTotals)
-      .sort((a, b) => b.totalAmount - a.totalAmount)
-      .slice(0, limit);
+    const result = page.map((row) => ({
+      ...row,
+      totalAmount: Number(row.totalAmount),
+    }));
 
-    return NextResponse.json(result);
+    return NextResponse.json(result, { headers });
   } catch (error) {
     console.error('Failed to generate top customers report:', error);
     return NextResponse.json({ error: 'Failed to generate top customers report' }, { status: 500 });
@@ -1,5 +1,6 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
+import { CACHE_TAGS, invalidateTags } from '@/lib/cache';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
 import { logActivity } from '@/lib/activity-logger';
 import { checkPricingApproval, isPendingApproval } from '@/lib/approval-integration';
@@ -221,14 +222,8 @@ export async function PATCH(req: Request, { params }: Params) {
       }
     }
 
-    // Invalidate dispatch register cache if items or status changed
-    try {
-      const { invalidateDispatchCache } = await import('@/app/api/dispatch-register/route');
-      invalidateDispatchCache();
-    } catch (error) {
-      // Best-effort cache invalidation
-      console.warn('Failed to invalidate dispatch cache:', error);
-    }
+    // Invalidate cached reports built from sales orders (dispatch register)
+    await invalidateTags([CACHE_TAGS.SALES_ORDERS]);
 
     return NextResponse.json(updated);
   } catch (error) {
@@ -1,9 +1,11 @@
 import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
+import { CACHE_TAGS, invalidateTags } from '@/lib/cache';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
 import { requireAuth } from '@/lib/auth-utils';
 import { logActivity } from '@/lib/activity-logger';
 import { capturePriceHistory } from '@/lib/price-history';
+import { resolveDocumentNumber } from '@/lib/document-number-generator';
 
 // GET /api/sales-orders - list sales orders with customer and items
 export async function GET() {
@@ -30,10 +32,7 @@ export async function POST(req: Request) {
   const prisma = await getPrismaClient();
   const body = await req.json();
 
-  const orderNumber =
-    body.orderNumber && body.orderNumber.length > 0
-      ? body.orderNumber
-      : `SO-${Date.now()}`;
+  const orderNumber = await resolveDocumentNumber('SALES_ORDER', body.orderNumber);
 
   const order = await prisma.salesOrder.create({
     data: {
@@ -98,14 +97,8 @@ export async function POST(req: Request) {
     currency: order.customer.currency || 'INR',
   });
 
-  // Invalidate dispatch register cache
-  try {
-    const { invalidateDispatchCache } = await import('@/app/api/dispatch-register/route');
-    invalidateDispatchCache();
-  } catch (error) {
-    // Best-effort cache invalidation
-    console.warn('Failed to invalidate dispatch cache:', error);
-  }
+  // Invalidate cached reports built from sales orders (dispatch register)
+  await invalidateTags([CACHE_TAGS.SALES_ORDERS]);
 
   return NextResponse.json(order, { status: 201 });
 }
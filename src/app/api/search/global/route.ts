@@ -2,12 +2,15 @@ import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { getAuthContext } from '@/lib/auth';
 import { requireAuth } from '@/lib/auth-utils';
-import { globalSearch, getQuickActions } from '@/lib/global-search';
+import { getQuickActions } from '@/lib/global-search';
+import { cachedGlobalSearch } from '@/lib/search-cache';
 
 /**
  * GET /api/search/global
  * Global search across all entities
- * Query params: q (search query), limit?, entityTypes? (comma-separated)
+ * Query params: q (search query), limit?, entityTypes? (comma-separated),
+ *   mode? ('index' | 'fanout'), timeoutMs? (per-entity deadline for fan-out)
+ * Response headers: Server-Timing with per-entity latency, X-Search-Incomplete, X-Search-Cache
  */
 export async function GET(req: Request) {
   const authError = await requireAuth();
@@ -19,6 +22,11 @@ export async function GET(req: Request) {
     const limit = parseInt(searchParams.get('limit') || '20', 10);
     const entityTypesParam = searchParams.get('entityTypes');
     const entityTypes = entityTypesParam ? entityTypesParam.split(',') : undefined;
+    const mode = searchParams.get('mode') === 'fanout' ? 'fanout' : 'index';
+    const timeoutParam = parseInt(searchParams.get('timeoutMs') || '', 10);
+    const entityTimeoutMs = Number.isFinite(timeoutParam)
+      ? Math.min(Math.max(timeoutParam, 50), 5000)
+      : undefined;
 
     if (!query || query.length < 2) {
       return NextResponse.json({
@@ -30,18 +38,36 @@ export async function GET(req: Request) {
     const prisma = await getPrismaClient();
     const auth = await getAuthContext(req);
 
-    const results = await globalSearch(prisma, query, {
+    const { results, incomplete, timedOut, failed, timings, cacheStatus } = await cachedGlobalSearch(prisma, query, {
       limit,
       entityTypes,
       userId: auth.userId || undefined,
+      mode,
+      entityTimeoutMs,
     });
 
     const quickActions = getQuickActions(query);
 
-    return NextResponse.json({
-      results,
-      quickActions,
-    });
+    const serverTiming = Object.entries(timings)
+      .map(([entity, ms]) => `${entity};dur=${ms.toFixed(1)}`)
+      .join(', ');
+
+    return NextResponse.json(
+      {
+        results,
+        quickActions,
+        incomplete,
+        timedOutEntities: timedOut,
+        failedEntities: failed,
+      },
+      {
+        headers: {
+          ...(serverTiming && { 'Server-Timing': serverTiming }),
+          'X-Search-Incomplete': String(incomplete),
+          'X-Search-Cache': cacheStatus,
+        },
+      },
+    );
   } catch (error) {
     console.error('Failed to perform global search:', error);
     return NextResponse.json(
@@ -0,0 +1,18 @@
+import { NextResponse } from 'next/server';
+import { getAuthContext, isRoleAllowed } from '@/lib/auth';
+import { getSearchCacheStats } from '@/lib/search-cache';
+
+/**
+ * GET /api/search/global/stats
+ * Returns hit-rate counters for this instance's global search cache.
+ */
+export async function GET(req: Request) {
+  const auth = await getAuthContext(req);
+
+  // Only admins can view cache stats
+  if (!auth.userId || !isRoleAllowed(auth.role, ['admin'])) {
+    return NextResponse.json({ error: 'Forbidden' }, { status: 403 });
+  }
+
+  return NextResponse.json(getSearchCacheStats());
+}
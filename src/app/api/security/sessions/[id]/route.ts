@@ -2,6 +2,7 @@ import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { getAuthContext } from '@/lib/auth';
 import { requireAuth } from '@/lib/auth-utils';
+import { invalidateSessionById } from '@/lib/session-cache';
 
 type Params = {
   params: { id: string };
@@ -46,6 +47,7 @@ export async function DELETE(req: Request, { params }: Params) {
     await prisma.session.delete({
       where: { id: params.id },
     });
+    invalidateSessionById(params.id);
 
     // If this was the current session, return a special flag
     return NextResponse.json({
@@ -2,6 +2,7 @@ import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
 import { requireAuth } from '@/lib/auth-utils';
+import { getDefaultSequenceConfig, invalidateSequenceConfigCache } from '@/lib/srpl-id-generator';
 
 // GET /api/srpl/config - get all sequence configurations
 export async function GET(_req: Request) {
@@ -30,12 +31,32 @@ export async function PATCH(req: Request) {
 
   try {
     const body = await req.json();
-    const { moduleCode, useYearPrefix, useFinancialYear, financialYearStart, padding } = body;
+    const {
+      moduleCode,
+      useYearPrefix,
+      useFinancialYear,
+      financialYearStart,
+      padding,
+      allowGaps,
+      allocationBlockSize,
+    } = body;
 
     if (!moduleCode) {
       return NextResponse.json({ error: 'moduleCode is required' }, { status: 400 });
     }
 
+    if (
+      allocationBlockSize !== undefined &&
+      (!Number.isInteger(allocationBlockSize) || allocationBlockSize < 1 || allocationBlockSize > 10000)
+    ) {
+      return NextResponse.json(
+        { error: 'allocationBlockSize must be an integer between 1 and 10000' },
+        { status: 400 }
+      );
+    }
+
+    const defaults = getDefaultSequenceConfig(moduleCode);
+
     const prisma = await getPrismaClient();
     
     const config = await prisma.sequenceConfig.upsert({
@@ -46,15 +67,21 @@ export async function PATCH(req: Request) {
         useFinancialYear: useFinancialYear || false,
         financialYearStart: financialYearStart || 4,
         padding: padding || 6,
+        allowGaps: allowGaps ?? defaults.allowGaps,
+        allocationBlockSize: allocationBlockSize ?? defaults.allocationBlockSize,
       },
       update: {
         ...(useYearPrefix !== undefined && { useYearPrefix }),
         ...(useFinancialYear !== undefined && { useFinancialYear }),
         ...(financialYearStart !== undefined && { financialYearStart }),
         ...(padding !== undefined && { padding }),
+        ...(allowGaps !== undefined && { allowGaps }),
+        ...(allocationBlockSize !== undefined && { allocationBlockSize }),
       },
     });
 
+    invalidateSequenceConfigCache(moduleCode);
+
     return NextResponse.json(config);
   } catch (error: any) {
     console.error('Failed to update sequence config:', error);
@@ -2,6 +2,7 @@ import { NextResponse } from 'next/server';
 import { getPrismaClient } from '@/lib/prisma';
 import { getAuthContext, isRoleAllowed } from '@/lib/auth';
 import bcrypt from 'bcryptjs';
+import { invalidateUserSessions } from '@/lib/session-cache';
 
 type Params = {
   params: { id: string };
@@ -80,6 +81,7 @@ export async function PATCH(req: Request, { params }: Params) {
       where: { id: params.id },
       data: updateData,
     });
+    invalidateUserSessions(params.id);
 
     return NextResponse.json({
       id: user.id,
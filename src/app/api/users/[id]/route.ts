@@ -4,6 +4,8 @@ import { getAuthContext, isRoleAllowed } from '@/lib/auth';
 import { userAdminUpdateSchema, validateInput } from '@/lib/validation';
 import { checkAndRequestApproval, isPendingApproval } from '@/lib/approval-integration';
 import { logAudit } from '@/lib/audit-logger';
+import { invalidateUserSessions } from '@/lib/session-cache';
+import { invalidateTeamHierarchy } from '@/lib/team-hierarchy';
 
 type Params = {
   params: { id: string };
@@ -173,6 +175,9 @@ export async function PATCH(req: Request, { params }: Params) {
       data: updateData,
     });
 
+    // Cached sessions carry role, sales scope and email
+    invalidateUserSessions(params.id);
+
     // Phase 4: Log audit entry for user changes
     const ipAddress = req.headers.get('x-forwarded-for') || 
                       req.headers.get('x-real-ip') || 
@@ -245,6 +250,9 @@ export async function DELETE(req: Request, { params }: Params) {
     }
 
     await prisma.user.delete({ where: { id: params.id } });
+    invalidateUserSessions(params.id);
+    // Reports of the deleted user lose their manager
+    await invalidateTeamHierarchy();
 
     // Phase 4: Log audit entry for user deletion
     const ipAddress = req.headers.get('x-forwarded-for') || 
@@ -260,12 +260,14 @@ export default function CustomersPage() {
         throw new Error('Failed to import customers');
       }
 
-      const created = await res.json();
+      const { created, duplicates } = await res.json();
       setAllCustomers(prev => [...created, ...prev]);
 
       toast({
         title: 'Import complete',
-        description: `${created.length} customers were imported successfully.`,
+        description: duplicates.length > 0
+          ? `${created.length} customers were imported. ${duplicates.length} may duplicate existing companies or leads.`
+          : `${created.length} customers were imported successfully.`,
       });
     } catch (error) {
       console.error(error);
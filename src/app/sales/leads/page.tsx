@@ -5,38 +5,19 @@ import { PlusCircle, Upload } from "lucide-react";
 import Link from "next/link";
 import { LeadsTable } from "@/components/leads/leads-table";
 import { useState } from "react";
-import { ImportLeadsDialog } from "@/components/leads/import-leads-dialog";
-import type { Lead } from "@/types";
+import { ImportLeadsDialog, type LeadImportJob } from "@/components/leads/import-leads-dialog";
 import { useToast } from "@/hooks/use-toast";
 
 export default function LeadsPage() {
   const [isImportDialogOpen, setImportDialogOpen] = useState(false);
   const { toast } = useToast();
 
-  const handleImportLeads = async (importedLeads: Omit<Lead, 'id' | 'createdAt'>[]) => {
-    try {
-      const res = await fetch('/api/leads/import', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ leads: importedLeads }),
-      });
-
-      if (!res.ok) {
-        throw new Error('Failed to import leads');
-      }
-
-      toast({
-        title: 'Import complete',
-        description: `${importedLeads.length} leads were imported successfully.`,
-      });
-    } catch (error) {
-      console.error(error);
-      toast({
-        variant: 'destructive',
-        title: 'Import failed',
-        description: 'There was a problem importing leads. Please try again.',
-      });
-    }
+  const handleImportComplete = (job: LeadImportJob) => {
+    if (job.status !== 'completed') return;
+    toast({
+      title: 'Import complete',
+      description: `${job.createdRows} leads were imported${job.failedRows > 0 ? `, ${job.failedRows} rows failed` : ''}.`,
+    });
   };
 
   return (
@@ -71,7 +52,7 @@ export default function LeadsPage() {
       <ImportLeadsDialog
         open={isImportDialogOpen}
         onOpenChange={setImportDialogOpen}
-        onLeadsImported={handleImportLeads}
+        onImportComplete={handleImportComplete}
       />
     </div>
   );
@@ -39,27 +39,14 @@ export function ProductTimeSeriesWidget({ filters }: ProductTimeSeriesWidgetProp
         const params = new URLSearchParams();
         if (filters.startDate) params.append('startDate', filters.startDate);
         if (filters.endDate) params.append('endDate', filters.endDate);
+        if (filters.customerType) params.append('customerType', filters.customerType);
         params.append('groupBy', groupBy);
+        // Totals per period are summed server-side from the monthly rollup
+        params.append('aggregate', 'total');
 
         const res = await fetch(`/api/analytics/products/timeseries?${params.toString()}`);
         if (res.ok) {
-          const result = await res.json();
-          // Group by period and aggregate
-          const periodMap: Record<string, any> = {};
-          for (const item of result) {
-            if (!periodMap[item.period]) {
-              periodMap[item.period] = {
-                period: item.period,
-                quantity: 0,
-                revenue: 0,
-                invoiceCount: 0,
-              };
-            }
-            periodMap[item.period].quantity += item.quantity;
-            periodMap[item.period].revenue += item.revenue;
-            periodMap[item.period].invoiceCount += item.invoiceCount;
-          }
-          setData(Object.values(periodMap).sort((a, b) => a.period.localeCompare(b.period)));
+          setData(await res.json());
         }
       } catch (error) {
         console.error('Failed to load product time-series:', error);
@@ -78,10 +78,15 @@ export function CommandBar({ open, onOpenChange }: CommandBarProps) {
       return;
     }
 
+    // Abort superseded requests so a slow response never overwrites a newer query's results
+    const controller = new AbortController();
+
     const searchTimeout = setTimeout(async () => {
       setIsLoading(true);
       try {
-        const res = await fetch(`/api/search/global?q=${encodeURIComponent(query)}`);
+        const res = await fetch(`/api/search/global?q=${encodeURIComponent(query)}`, {
+          signal: controller.signal,
+        });
         if (res.ok) {
           const data = await res.json();
           setResults(data.results || []);
@@ -89,13 +94,19 @@ export function CommandBar({ open, onOpenChange }: CommandBarProps) {
           setSelectedIndex(0);
         }
       } catch (error) {
+        if ((error as Error).name === 'AbortError') return;
         console.error('Search failed:', error);
       } finally {
-        setIsLoading(false);
+        if (!controller.signal.aborted) {
+          setIsLoading(false);
+        }
       }
     }, 300); // Debounce
 
-    return () => clearTimeout(searchTimeout);
+    return () => {
+      clearTimeout(searchTimeout);
+      controller.abort();
+    };
   }, [query]);
 
   const handleSelect = (result: SearchResult | QuickAction, isAction: boolean = false) => {
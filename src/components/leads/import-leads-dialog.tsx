@@ -1,6 +1,6 @@
 'use client';
 
-import React, { useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import {
   Dialog,
   DialogContent,
@@ -13,128 +13,200 @@ import {
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
+import { Progress } from '@/components/ui/progress';
 import { UploadCloud } from 'lucide-react';
 import { useToast } from '@/hooks/use-toast';
-import type { Lead } from '@/types';
+
+const POLL_INTERVAL_MS = 1000;
+
+export type LeadImportJob = {
+  id: string;
+  status: 'pending' | 'running' | 'completed' | 'failed';
+  processedRows: number;
+  createdRows: number;
+  failedRows: number;
+  duplicateRows: number;
+  progress: number | null;
+  errors: Array<{ row: number; message: string }>;
+  duplicates: Array<{
+    row: number;
+    matches: Array<{ type: string; value: string; matches: Array<{ companyName: string; entityType: string }> }>;
+  }>;
+  message: string | null;
+};
 
 type ImportLeadsDialogProps = {
   open: boolean;
   onOpenChange: (open: boolean) => void;
-  onLeadsImported: (leads: Omit<Lead, 'id' | 'createdAt'>[]) => void;
+  onImportComplete: (job: LeadImportJob) => void;
 };
 
-export function ImportLeadsDialog({ open, onOpenChange, onLeadsImported }: ImportLeadsDialogProps) {
+export function ImportLeadsDialog({ open, onOpenChange, onImportComplete }: ImportLeadsDialogProps) {
   const [file, setFile] = useState<File | null>(null);
+  const [job, setJob] = useState<LeadImportJob | null>(null);
+  const [isImporting, setIsImporting] = useState(false);
+  const pollRef = useRef<ReturnType<typeof setInterval> | null>(null);
   const { toast } = useToast();
 
+  const stopPolling = () => {
+    if (pollRef.current) {
+      clearInterval(pollRef.current);
+      pollRef.current = null;
+    }
+  };
+
+  useEffect(() => stopPolling, []);
+
+  useEffect(() => {
+    if (!open && !isImporting) {
+      setFile(null);
+      setJob(null);
+    }
+  }, [open, isImporting]);
+
   const handleFileChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     if (e.target.files) {
       setFile(e.target.files[0]);
+      setJob(null);
     }
   };
-  
-  const handleSubmit = (e: React.FormEvent) => {
+
+  const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!file) {
       toast({
         variant: 'destructive',
         title: 'No file selected',
-        description: 'Please select a CSV file to import.',
+        description: 'Please select a CSV or NDJSON file to import.',
       });
       return;
     }
 
-    const reader = new FileReader();
-    reader.onload = (event) => {
-      try {
-        const csvContent = event.target?.result as string;
-        const lines = csvContent.split(/\r\n|\n/).filter(line => line.trim() !== '');
-        if (lines.length < 2) {
-            toast({ variant: 'destructive', title: 'Invalid CSV', description: 'File is empty or contains only a header.' });
-            return;
-        }
+    const format = /\.(ndjson|jsonl)$/i.test(file.name) ? 'ndjson' : 'csv';
+    setIsImporting(true);
 
-        const headers = lines[0].split(',').map(h => h.trim());
-        const requiredHeaders = ['companyName', 'contactName', 'email', 'phone', 'status', 'leadSource', 'country'];
-        const missingHeaders = requiredHeaders.filter(h => !headers.includes(h));
-        
-        if (missingHeaders.length > 0) {
-            toast({
-                variant: 'destructive',
-                title: 'Invalid CSV Format',
-                description: `File must contain the following columns: ${missingHeaders.join(', ')}.`,
-            });
-            return;
-        }
+    try {
+      const createRes = await fetch('/api/leads/import/jobs', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ format, totalBytes: file.size }),
+      });
+      if (!createRes.ok) {
+        throw new Error('Failed to start import');
+      }
+      const { jobId } = await createRes.json();
 
-        const importedLeads: Omit<Lead, 'id' | 'createdAt'>[] = [];
-        for (let i = 1; i < lines.length; i++) {
-          const data = lines[i].split(',');
-          if (data.length >= requiredHeaders.length) {
-            const leadObject = headers.reduce((obj, header, index) => {
-                obj[header] = data[index] ? data[index].trim() : '';
-                return obj;
-            }, {} as any);
-            
-            if (requiredHeaders.every(h => leadObject[h])) {
-               const newLead: Omit<Lead, 'id' | 'createdAt'> = {
-                 ...leadObject,
-                 assignedSalesperson: '', // Set default empty value
-               };
-               importedLeads.push(newLead);
-            }
-          }
+      // Poll while the upload is processed; the upload response carries the final state
+      pollRef.current = setInterval(async () => {
+        try {
+          const res = await fetch(`/api/leads/import/jobs/${jobId}`);
+          // Ignore late responses once the upload has finished
+          if (res.ok && pollRef.current) setJob(await res.json());
+        } catch {
+          // Keep polling; the upload response is authoritative
         }
+      }, POLL_INTERVAL_MS);
 
-        if (importedLeads.length === 0) {
-            toast({
-                variant: 'destructive',
-                title: 'No Leads Found',
-                description: 'The CSV file does not contain valid lead data matching the required headers.',
-            });
-            return;
-        }
+      const uploadRes = await fetch(`/api/leads/import/jobs/${jobId}`, {
+        method: 'PUT',
+        headers: { 'Content-Type': format === 'ndjson' ? 'application/x-ndjson' : 'text/csv' },
+        body: file,
+      });
+      stopPolling();
+      if (!uploadRes.ok) {
+        throw new Error('Failed to upload import file');
+      }
 
-        onLeadsImported(importedLeads);
-        onOpenChange(false);
-        setFile(null);
-      } catch (error) {
-         toast({
-            variant: 'destructive',
-            title: 'Import Failed',
-            description: 'There was an error processing the CSV file.',
+      const finished: LeadImportJob = await uploadRes.json();
+      setJob(finished);
+      if (finished.status === 'failed') {
+        toast({
+          variant: 'destructive',
+          title: 'Import Failed',
+          description: finished.message || 'There was an error processing the file.',
         });
       }
-    };
-    
-    reader.readAsText(file);
+      onImportComplete(finished);
+    } catch (error) {
+      stopPolling();
+      console.error(error);
+      toast({
+        variant: 'destructive',
+        title: 'Import Failed',
+        description: 'There was a problem importing leads. Please try again.',
+      });
+    } finally {
+      setIsImporting(false);
+    }
   };
 
   return (
-    <Dialog open={open} onOpenChange={onOpenChange}>
+    <Dialog open={open} onOpenChange={(next) => !isImporting && onOpenChange(next)}>
       <DialogContent className="sm:max-w-[425px]">
         <form onSubmit={handleSubmit}>
           <DialogHeader>
             <DialogTitle>Import Bulk Leads</DialogTitle>
             <DialogDescription>
-              Upload a CSV file with your leads. The file must contain headers for `companyName`, `contactName`, `email`, `phone`, `status`, `leadSource`, and `country`.
+              Upload a CSV file with a header row, or an NDJSON file with one lead per line. `companyName` is required; `contactName`, `email`, `phone`, `status`, `leadSource`, and `country` are also read.
             </DialogDescription>
           </DialogHeader>
           <div className="grid gap-4 py-4">
             <div className="grid w-full max-w-sm items-center gap-1.5">
-              <Label htmlFor="csvFile">Upload CSV</Label>
-              <Input id="csvFile" type="file" accept=".csv" onChange={handleFileChange} required />
+              <Label htmlFor="csvFile">Upload File</Label>
+              <Input
+                id="csvFile"
+                type="file"
+                accept=".csv,.ndjson,.jsonl"
+                onChange={handleFileChange}
+                disabled={isImporting}
+                required
+              />
             </div>
+            {job && (
+              <div className="grid gap-2">
+                {job.progress !== null && <Progress value={job.status === 'completed' ? 100 : job.progress} />}
+                <p className="text-sm text-muted-foreground">
+                  {job.processedRows} rows processed, {job.createdRows} imported, {job.failedRows} failed
+                  {job.duplicateRows > 0 && `, ${job.duplicateRows} possible duplicates`}
+                </p>
+                {job.errors.length > 0 && (
+                  <div className="max-h-40 overflow-y-auto rounded-md border p-2 text-xs">
+                    {job.errors.map((error) => (
+                      <p key={error.row}>
+                        Row {error.row}: {error.message}
+                      </p>
+                    ))}
+                    {job.failedRows > job.errors.length && (
+                      <p className="text-muted-foreground">
+                        …and {job.failedRows - job.errors.length} more
+                      </p>
+                    )}
+                  </div>
+                )}
+                {job.duplicates.length > 0 && (
+                  <div className="max-h-40 overflow-y-auto rounded-md border p-2 text-xs">
+                    {job.duplicates.map((duplicate) => (
+                      <p key={duplicate.row}>
+                        Row {duplicate.row}:{' '}
+                        {duplicate.matches
+                          .map((m) => `${m.type} matches ${m.matches[0]?.companyName} (${m.matches[0]?.entityType})`)
+                          .join('; ')}
+                      </p>
+                    ))}
+                  </div>
+                )}
+              </div>
+            )}
           </div>
           <DialogFooter>
             <DialogClose asChild>
-              <Button type="button" variant="secondary">
-                Cancel
+              <Button type="button" variant="secondary" disabled={isImporting}>
+                {job?.status === 'completed' ? 'Close' : 'Cancel'}
               </Button>
             </DialogClose>
-            <Button type="submit">
+            <Button type="submit" disabled={isImporting}>
               <UploadCloud className="mr-2" />
-              Import
+              {isImporting ? 'Importing…' : 'Import'}
             </Button>
           </DialogFooter>
         </form>
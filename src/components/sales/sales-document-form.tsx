@@ -487,9 +487,7 @@ export function SalesDocumentForm({ documentType, existingDocument, existingCust
     // Add document-specific fields
     if (documentType === 'Quote') {
       payload.issueDate = new Date().toISOString();
-      if (!isEditMode) {
-        payload.quoteNumber = `Q-${Date.now()}`;
-      }
+      // Document number is assigned server-side from the per-year sequence
       // If this quote originated from a lead, optionally attach leadId
       if (existingCustomer && (existingCustomer as any).leadId) {
         payload.leadId = (existingCustomer as any).leadId;
@@ -500,9 +498,7 @@ export function SalesDocumentForm({ documentType, existingDocument, existingCust
       }
     } else if (documentType === 'Proforma Invoice') {
       payload.issueDate = new Date().toISOString();
-      if (!isEditMode) {
-        payload.proformaNumber = `PI-${Date.now()}`;
-      }
+      // Document number is assigned server-side from the per-year sequence
       // If creating from quote, add quoteId
       if ((existingDocument as any)?.quoteId) {
         payload.quoteId = (existingDocument as any).quoteId;
@@ -512,9 +508,7 @@ export function SalesDocumentForm({ documentType, existingDocument, existingCust
       }
     } else if (documentType === 'Sales Order') {
       payload.orderDate = new Date().toISOString();
-      if (!isEditMode) {
-        payload.orderNumber = `SO-${Date.now()}`;
-      }
+      // Document number is assigned server-side from the per-year sequence
       // If creating from quote/proforma, add source ID
       if ((existingDocument as any)?.id) {
         if ((existingDocument as any).quoteNumber) {
@@ -527,9 +521,7 @@ export function SalesDocumentForm({ documentType, existingDocument, existingCust
       }
     } else if (documentType === 'Invoice') {
       payload.issueDate = new Date().toISOString();
-      if (!isEditMode) {
-        payload.invoiceNumber = `INV-${Date.now()}`;
-      }
+      // Document number is assigned server-side from the per-year sequence
       // If creating from proforma/sales order, add source ID
       if ((existingDocument as any)?.id) {
         if ((existingDocument as any).proformaNumber) {
@@ -66,6 +66,45 @@ export async function logActivity({
   }
 }
 
+/**
+ * Writes many activity entries with a single insert (bulk actions).
+ * Best-effort like logActivity.
+ */
+export async function logActivities(
+  prisma: PrismaClient,
+  entries: Array<Omit<LogActivityOptions, 'prisma'>>,
+): Promise<void> {
+  if (entries.length === 0) return;
+
+  try {
+    const p: any = prisma;
+
+    await p.activity.createMany({
+      data: entries.map((entry) => ({
+        module: entry.module,
+        entityType: entry.entityType,
+        entityId: entry.entityId,
+        srplId: entry.srplId || null,
+        action: entry.action,
+        field: entry.field || null,
+        oldValue: serializeValue(entry.oldValue),
+        newValue: serializeValue(entry.newValue),
+        description: entry.description || null,
+        metadata: entry.metadata ? JSON.stringify(entry.metadata) : null,
+        performedById: entry.performedById || null,
+      })),
+    });
+  } catch (error) {
+    // Do NOT throw – timeline is best-effort, never breaks primary workflow
+    console.error('Failed to log activities', {
+      error,
+      count: entries.length,
+      module: entries[0].module,
+      action: entries[0].action,
+    });
+  }
+}
+
 function serializeValue(value: unknown): string | null {
   if (value === undefined || value === null) return null;
   if (typeof value === 'string') return value;
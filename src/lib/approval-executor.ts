@@ -1,5 +1,6 @@
 import type { PrismaClient } from '@prisma/client';
 import { getPrismaClient } from './prisma';
+import { CACHE_TAGS, invalidateTags } from './cache';
 
 export interface ExecutionResult {
   success: boolean;
@@ -179,6 +180,12 @@ async function executeDocumentUpdate(
         break;
     }
 
+    if (resource === 'invoice') {
+      await invalidateTags([CACHE_TAGS.INVOICES]);
+    } else if (resource === 'sales_order') {
+      await invalidateTags([CACHE_TAGS.SALES_ORDERS]);
+    }
+
     return { success: true, data: { message: `${resource} updated successfully` } };
   } catch (error) {
     console.error(`Failed to execute ${resource} update:`, error);
@@ -1,5 +1,18 @@
 import { getPrismaClient } from '@/lib/prisma';
 import { cookies } from 'next/headers';
+import {
+  cacheSession,
+  getCachedSession,
+  invalidateSessionToken,
+  type CachedSession,
+} from '@/lib/session-cache';
+import {
+  ACTIVITY_UPDATE_INTERVAL_MS,
+  SESSION_ACTIVITY_MAX_LAG_MS,
+  SESSION_TIMEOUT_MS,
+  getPendingSessionActivity,
+  recordSessionActivity,
+} from '@/lib/session-activity';
 
 export type AppRole = 'admin' | 'sales' | 'finance' | 'user';
 
@@ -11,108 +24,136 @@ export interface AuthContext {
   salesScope?: string | null; // 'export_sales' or 'domestic_sales'
 }
 
-/**
- * Secure auth helper for API routes.
- * 
- * SECURITY: Uses cookie-based authentication only. No fallback to admin.
- * All requests must have a valid session cookie.
- * 
- * - Reads app_session and user_email cookies
- * - Validates session is active
- * - Looks up user in Postgres User table
- * - Returns null userId if authentication fails (no admin fallback)
- */
-export async function getAuthContext(req: Request): Promise<AuthContext> {
-  try {
-    const cookieStore = await cookies();
-    const sessionCookie = cookieStore.get('app_session');
-
-    // STRICT: No authentication = no access (no admin fallback)
-    if (!sessionCookie?.value) {
-      return {
-        userId: null,
-        firebaseUid: null,
-        email: null,
-        role: 'user', // Default to least privilege
-      };
-    }
+export type SessionResolution =
+  | { context: AuthContext; error: null }
+  | { context: null; error: 'missing' | 'invalid' | 'inactive' };
 
-    const prisma = await getPrismaClient();
-    
-    // Validate session token from database
-    const session = await prisma.session.findUnique({
-      where: { token: sessionCookie.value },
-      include: { user: true },
-    });
-
-    // Check if session exists and is not expired
-    if (!session || session.expiresAt < new Date()) {
-      // Clean up expired session
-      if (session) {
-        await prisma.session.delete({ where: { id: session.id } }).catch(() => {});
-      }
-      return {
-        userId: null,
-        firebaseUid: null,
-        email: null,
-        role: 'user',
-      };
-    }
+// Request-scoped memo: Next.js hands out one cookie store per request, so
+// requireAuth() followed by getAuthContext() resolves the session once
+const requestMemo = new WeakMap<object, Promise<SessionResolution>>();
 
-    // Check if session has timed out due to inactivity (optimized - check in-memory first)
-    const now = new Date();
-    const timeSinceLastActivity = Date.now() - session.lastActivityAt.getTime();
-    const SESSION_TIMEOUT_MS = 30 * 60 * 1000; // 30 minutes
-    
-    if (session.expiresAt < now || timeSinceLastActivity > SESSION_TIMEOUT_MS) {
-      // Session expired or timed out - delete in background
-      prisma.session.delete({ where: { id: session.id } }).catch(() => {});
-      return {
-        userId: null,
-        firebaseUid: null,
-        email: null,
-        role: 'user',
-      };
-    }
+function anonymousContext(): AuthContext {
+  return {
+    userId: null,
+    firebaseUid: null,
+    email: null,
+    role: 'user', // Default to least privilege
+  };
+}
 
-    // Update session activity (non-blocking if not critical)
-    // Only update if last activity was more than 1 minute ago to reduce DB writes
-    if (timeSinceLastActivity > 60 * 1000) {
-      prisma.session.updateMany({
-        where: { token: sessionCookie.value },
-        data: { lastActivityAt: now },
-      }).catch(() => {}); // Non-blocking
-    }
+/**
+ * Load a session and its user from the database and cache it
+ */
+async function loadSession(token: string): Promise<CachedSession | null> {
+  const prisma = await getPrismaClient();
+  const session = await prisma.session.findUnique({
+    where: { token },
+    include: { user: true },
+  });
+
+  if (!session) return null;
 
-    const user = session.user;
-    if (!user) {
-      return {
-        userId: null,
-        firebaseUid: null,
-        email: null,
-        role: 'user',
-      };
+  const user = session.user;
+  if (!user) {
+    if (session.expiresAt < new Date()) {
+      await prisma.session.delete({ where: { id: session.id } }).catch(() => {});
     }
+    return null;
+  }
 
-    // Normalize role to lowercase to match AppRole type
-    const userRole = (user.role || 'user').toLowerCase() as AppRole;
-    
-    return {
+  const cached: CachedSession = {
+    sessionId: session.id,
+    userId: user.id,
+    expiresAt: session.expiresAt.getTime(),
+    // This process may hold activity that hasn't been flushed yet
+    lastActivityAt: Math.max(session.lastActivityAt.getTime(), getPendingSessionActivity(session.id) ?? 0),
+    context: {
       userId: user.id,
       firebaseUid: user.firebaseUid,
       email: user.email,
-      role: userRole,
+      // Normalize role to lowercase to match AppRole type
+      role: (user.role || 'user').toLowerCase() as AppRole,
       salesScope: (user as any).salesScope || null,
-    };
+    },
+  };
+  cacheSession(token, cached);
+  return cached;
+}
+
+async function lookupSession(token: string | undefined): Promise<SessionResolution> {
+  // STRICT: No authentication = no access (no admin fallback)
+  if (!token) {
+    return { context: null, error: 'missing' };
+  }
+
+  let session = getCachedSession(token);
+  const now = Date.now();
+
+  // Other instances may have recorded newer activity since this entry was cached
+  if (session && now - session.lastActivityAt > SESSION_TIMEOUT_MS) {
+    session = null;
+  }
+  session = session ?? (await loadSession(token));
+  if (!session) {
+    return { context: null, error: 'invalid' };
+  }
+
+  const timeSinceLastActivity = now - session.lastActivityAt;
+  const expired = session.expiresAt < now;
+
+  // The stored timestamp can trail activity on other instances by up to
+  // SESSION_ACTIVITY_MAX_LAG_MS, so only time out once that lag is ruled out
+  if (expired || timeSinceLastActivity > SESSION_TIMEOUT_MS + SESSION_ACTIVITY_MAX_LAG_MS) {
+    // Session expired or timed out - delete in background
+    invalidateSessionToken(token);
+    const prisma = await getPrismaClient();
+    prisma.session.delete({ where: { id: session.sessionId } }).catch(() => {});
+    return { context: null, error: expired ? 'invalid' : 'inactive' };
+  }
+
+  if (timeSinceLastActivity > ACTIVITY_UPDATE_INTERVAL_MS) {
+    // Buffered and written in batches (see session-activity.ts)
+    session.lastActivityAt = now;
+    recordSessionActivity(session.sessionId, now);
+  }
+
+  return { context: { ...session.context }, error: null };
+}
+
+/**
+ * Resolve the current request's session from the app_session cookie.
+ * Sessions are served from a short-lived in-process cache (see session-cache.ts)
+ * and memoized per request. Throws on unexpected errors.
+ */
+export async function resolveSession(): Promise<SessionResolution> {
+  const cookieStore = await cookies();
+  let pending = requestMemo.get(cookieStore);
+  if (!pending) {
+    pending = lookupSession(cookieStore.get('app_session')?.value);
+    requestMemo.set(cookieStore, pending);
+  }
+  return pending;
+}
+
+/**
+ * Secure auth helper for API routes.
+ * 
+ * SECURITY: Uses cookie-based authentication only. No fallback to admin.
+ * All requests must have a valid session cookie.
+ * 
+ * - Reads the app_session cookie
+ * - Validates session is active (not expired, not idle for 30 minutes)
+ * - Looks up user in Postgres User table (cached briefly per session)
+ * - Returns null userId if authentication fails (no admin fallback)
+ */
+export async function getAuthContext(req: Request): Promise<AuthContext> {
+  try {
+    const { context } = await resolveSession();
+    return context ?? anonymousContext();
   } catch (error) {
     console.error('Auth context error:', error);
     // Fail securely - return no access
-    return {
-      userId: null,
-      firebaseUid: null,
-      email: null,
-      role: 'user',
-    };
+    return anonymousContext();
   }
 }
 
@@ -0,0 +1,202 @@
+import { getRedisClient } from './rate-limit-redis';
+
+// Tags published by mutations; cached values list the tags they depend on
+export const CACHE_TAGS = {
+  SALES_ORDERS: 'sales-orders',
+  INVOICES: 'invoices',
+  PERMISSIONS: 'permissions',
+  REPORTING_LINES: 'reporting-lines',
+} as const;
+
+export type CacheTag = (typeof CACHE_TAGS)[keyof typeof CACHE_TAGS];
+
+const MAX_MEMORY_ENTRIES = 1000;
+const REDIS_TIMEOUT_MS = 500;
+const REDIS_PREFIX = 'cache:';
+
+interface CacheEntry {
+  value: unknown;
+  // Tag versions observed before the value was computed
+  tagVersions: Record<string, number>;
+}
+
+export interface CacheBackend {
+  readonly name: 'memory' | 'redis';
+  get(key: string): Promise<CacheEntry | null>;
+  set(key: string, entry: CacheEntry, ttlMs: number): Promise<void>;
+  getTagVersions(tags: string[]): Promise<Record<string, number>>;
+  invalidateTags(tags: string[]): Promise<void>;
+}
+
+/**
+ * Per-process backend, used when REDIS_URL is not set
+ */
+export class MemoryCacheBackend implements CacheBackend {
+  readonly name = 'memory' as const;
+  private entries = new Map<string, { entry: CacheEntry; expiresAt: number }>();
+  private tagVersions = new Map<string, number>();
+
+  async get(key: string): Promise<CacheEntry | null> {
+    const record = this.entries.get(key);
+    if (!record) return null;
+    if (record.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return null;
+    }
+    return record.entry;
+  }
+
+  async set(key: string, entry: CacheEntry, ttlMs: number): Promise<void> {
+    this.entries.delete(key);
+    this.entries.set(key, { entry, expiresAt: Date.now() + ttlMs });
+
+    // Map insertion order is oldest-first
+    while (this.entries.size > MAX_MEMORY_ENTRIES) {
+      const oldestKey = this.entries.keys().next().value;
+      if (oldestKey === undefined) break;
+      this.entries.delete(oldestKey);
+    }
+  }
+
+  async getTagVersions(tags: string[]): Promise<Record<string, number>> {
+    return Object.fromEntries(tags.map((tag) => [tag, this.tagVersions.get(tag) ?? 0]));
+  }
+
+  async invalidateTags(tags: string[]): Promise<void> {
+    for (const tag of tags) {
+      this.tagVersions.set(tag, (this.tagVersions.get(tag) ?? 0) + 1);
+    }
+  }
+}
+
+function withTimeout<T>(promise: Promise<T>): Promise<T> {
+  return Promise.race([
+    promise,
+    new Promise<never>((_, reject) =>
+      setTimeout(() => reject(new Error('Redis timeout')), REDIS_TIMEOUT_MS)
+    ),
+  ]);
+}
+
+/**
+ * Shared backend: entries and tag version counters live in Redis, so an
+ * invalidation on one instance is seen by every instance on its next read
+ */
+export class RedisCacheBackend implements CacheBackend {
+  readonly name = 'redis' as const;
+
+  async get(key: string): Promise<CacheEntry | null> {
+    const raw = await withTimeout(getRedisClient().get(`${REDIS_PREFIX}${key}`));
+    return raw ? (JSON.parse(raw) as CacheEntry) : null;
+  }
+
+  async set(key: string, entry: CacheEntry, ttlMs: number): Promise<void> {
+    await withTimeout(getRedisClient().set(`${REDIS_PREFIX}${key}`, JSON.stringify(entry), 'PX', ttlMs));
+  }
+
+  async getTagVersions(tags: string[]): Promise<Record<string, number>> {
+    if (tags.length === 0) return {};
+    const values = await withTimeout(
+      getRedisClient().mget(tags.map((tag) => `${REDIS_PREFIX}tag:${tag}`))
+    );
+    return Object.fromEntries(tags.map((tag, i) => [tag, Number(values[i]) || 0]));
+  }
+
+  async invalidateTags(tags: string[]): Promise<void> {
+    if (tags.length === 0) return;
+    const pipeline = getRedisClient().pipeline();
+    tags.forEach((tag) => pipeline.incr(`${REDIS_PREFIX}tag:${tag}`));
+    await withTimeout(pipeline.exec());
+  }
+}
+
+let backend: CacheBackend | null = null;
+
+export function getCacheBackend(): CacheBackend {
+  if (!backend) {
+    backend = process.env.REDIS_URL ? new RedisCacheBackend() : new MemoryCacheBackend();
+  }
+  return backend;
+}
+
+// key -> pending computation, so concurrent misses in this process share one compute
+const inFlight = new Map<string, Promise<unknown>>();
+
+function isCurrent(entry: CacheEntry, versions: Record<string, number>): boolean {
+  return Object.entries(versions).every(([tag, version]) => entry.tagVersions[tag] === version);
+}
+
+async function computeAndStore<T>(
+  key: string,
+  options: { ttlMs: number; tags: string[] },
+  compute: () => Promise<T>,
+): Promise<T> {
+  const cache = getCacheBackend();
+
+  // Snapshot versions first: if a tag is invalidated mid-compute, the stored entry is already stale
+  let tagVersions: Record<string, number> | null = null;
+  try {
+    tagVersions = await cache.getTagVersions(options.tags);
+  } catch (error) {
+    console.error(`Cache (${cache.name}) tag lookup failed:`, error);
+  }
+
+  const value = await compute();
+
+  if (tagVersions) {
+    try {
+      await cache.set(key, { value, tagVersions }, options.ttlMs);
+    } catch (error) {
+      console.error(`Cache (${cache.name}) write failed:`, error);
+    }
+  }
+
+  return value;
+}
+
+/**
+ * Return the cached value for `key`, computing and storing it on a miss.
+ * Entries expire after `ttlMs` or when any of `tags` is invalidated.
+ * Values must be JSON-serializable (the Redis backend stores them as JSON).
+ * Backend errors fail open: the value is computed and served uncached.
+ */
+export async function getOrSet<T>(
+  key: string,
+  options: { ttlMs: number; tags?: string[] },
+  compute: () => Promise<T>,
+): Promise<{ value: T; hit: boolean }> {
+  const cache = getCacheBackend();
+  const tags = options.tags ?? [];
+
+  try {
+    const [entry, versions] = await Promise.all([cache.get(key), cache.getTagVersions(tags)]);
+    if (entry && isCurrent(entry, versions)) {
+      return { value: entry.value as T, hit: true };
+    }
+  } catch (error) {
+    console.error(`Cache (${cache.name}) read failed:`, error);
+  }
+
+  let pending = inFlight.get(key) as Promise<T> | undefined;
+  if (!pending) {
+    pending = computeAndStore(key, { ttlMs: options.ttlMs, tags }, compute).finally(() => {
+      inFlight.delete(key);
+    });
+    inFlight.set(key, pending);
+  }
+
+  return { value: await pending, hit: false };
+}
+
+/**
+ * Invalidate every cached value that depends on any of `tags`.
+ * Best-effort: errors are logged and entries then expire by TTL.
+ */
+export async function invalidateTags(tags: string[]): Promise<void> {
+  const cache = getCacheBackend();
+  try {
+    await cache.invalidateTags(tags);
+  } catch (error) {
+    console.error(`Cache (${cache.name}) invalidation failed:`, error);
+  }
+}
@@ -1,4 +1,4 @@
-import type { PrismaClient } from '@prisma/client';
+import { Prisma, type PrismaClient } from '@prisma/client';
 
 export interface DuplicateMatch {
   type: 'company' | 'email' | 'phone' | 'gst' | 'vat';
@@ -26,6 +26,38 @@ export interface LeadHealthScore {
   };
 }
 
+/**
+ * Digits-only phone, as stored in Lead.phoneDigits / Customer.contactPhoneDigits
+ */
+export function normalizePhoneDigits(phone?: string | null): string | undefined {
+  const digits = phone?.replace(/\D/g, '');
+  return digits || undefined;
+}
+
+/**
+ * E.164 phone, as stored in Lead.phoneE164 / Customer.contactPhoneE164.
+ * Must stay in sync with phone_e164() in the add_normalized_phone migration:
+ * explicit +/00 prefixes are kept, Indian national numbers get +91, and anything
+ * else (unknown country code, implausible length) is left unnormalized.
+ */
+export function toE164(phone?: string | null, country?: string | null): string | undefined {
+  let digits = normalizePhoneDigits(phone);
+  if (!digits) return undefined;
+
+  let e164: string | undefined;
+  if (phone!.trim().startsWith('+')) {
+    e164 = digits;
+  } else if (digits.startsWith('00')) {
+    e164 = digits.slice(2);
+  } else if (country === 'India') {
+    if (digits.length === 11 && digits.startsWith('0')) digits = digits.slice(1);
+    if (digits.length === 10) e164 = `91${digits}`;
+    else if (digits.length === 12 && digits.startsWith('91')) e164 = digits;
+  }
+
+  return e164 && e164.length >= 8 && e164.length <= 15 ? `+${e164}` : undefined;
+}
+
 /**
  * Check for duplicate leads/customers based on various criteria
  */
@@ -37,6 +69,7 @@ export async function checkDuplicates(
     phone?: string;
     gstNo?: string;
     vatNumber?: string;
+    country?: string | null; // Used to normalize national phone numbers to E.164
   },
   excludeId?: string, // Exclude this ID from checks (for updates)
 ): Promise<DuplicateMatch[]> {
@@ -45,7 +78,8 @@ export async function checkDuplicates(
   // Normalize inputs
   const normalizedCompany = data.companyName?.toLowerCase().trim();
   const normalizedEmail = data.email?.toLowerCase().trim();
-  const normalizedPhone = data.phone?.replace(/\D/g, ''); // Remove non-digits
+  const normalizedPhone = normalizePhoneDigits(data.phone);
+  const normalizedE164 = toE164(data.phone, data.country);
   const normalizedGst = data.gstNo?.toUpperCase().trim();
   const normalizedVat = data.vatNumber?.toUpperCase().trim();
 
@@ -168,50 +202,55 @@ export async function checkDuplicates(
     }
   }
 
-  // 3. Check phone (normalized)
+  // 3. Check phone (indexed digits-only and E.164 columns, maintained by triggers)
   if (normalizedPhone && normalizedPhone.length >= 10) {
-    // Find leads/customers with similar phone numbers
-    const allLeads = await prisma.lead.findMany({
-      where: excludeWhere,
+    const leadPhoneMatches = await prisma.lead.findMany({
+      where: {
+        ...excludeWhere,
+        OR: [
+          { phoneDigits: normalizedPhone },
+          ...(normalizedE164 ? [{ phoneE164: normalizedE164 }] : []),
+        ],
+      },
       select: {
         id: true,
         srplId: true,
         companyName: true,
-        phone: true,
         createdAt: true,
       },
     });
 
-    const allCustomers = await prisma.customer.findMany({
-      where: excludeWhere,
+    const customerPhoneMatches = await prisma.customer.findMany({
+      where: {
+        ...excludeWhere,
+        OR: [
+          { contactPhoneDigits: normalizedPhone },
+          ...(normalizedE164 ? [{ contactPhoneE164: normalizedE164 }] : []),
+        ],
+      },
       select: {
         id: true,
         srplId: true,
         companyName: true,
-        contactPhone: true,
         createdAt: true,
       },
     });
 
     const phoneMatches = [
-      ...allLeads
-        .filter((l) => l.phone && l.phone.replace(/\D/g, '') === normalizedPhone)
-        .map((m) => ({
-          id: m.id,
-          srplId: m.srplId,
-          companyName: m.companyName,
-          entityType: 'lead' as const,
-          createdAt: m.createdAt,
-        })),
-      ...allCustomers
-        .filter((c) => c.contactPhone && c.contactPhone.replace(/\D/g, '') === normalizedPhone)
-        .map((m) => ({
-          id: m.id,
-          srplId: m.srplId,
-          companyName: m.companyName,
-          entityType: 'customer' as const,
-          createdAt: m.createdAt,
-        })),
+      ...leadPhoneMatches.map((m) => ({
+        id: m.id,
+        srplId: m.srplId,
+        companyName: m.companyName,
+        entityType: 'lead' as const,
+        createdAt: m.createdAt,
+      })),
+      ...customerPhoneMatches.map((m) => ({
+        id: m.id,
+        srplId: m.srplId,
+        companyName: m.companyName,
+        entityType: 'customer' as const,
+        createdAt: m.createdAt,
+      })),
     ];
 
     if (phoneMatches.length > 0) {
@@ -306,6 +345,154 @@ export async function checkDuplicates(
   return matches;
 }
 
+// Same cap as checkDuplicates' take: 10 per criterion and entity type
+const BATCH_MATCH_LIMIT = 10;
+
+type DuplicateCandidate = DuplicateMatch['matches'][number] & { value: string };
+
+export type DuplicateCheckInput = Parameters<typeof checkDuplicates>[1];
+
+/**
+ * Group candidate rows by normalized value, keeping at most `limit` per entity type
+ */
+function groupCandidates(
+  candidates: DuplicateCandidate[],
+  limit = Infinity,
+): Map<string, DuplicateMatch['matches']> {
+  const grouped = new Map<string, DuplicateMatch['matches']>();
+  for (const { value, ...match } of candidates) {
+    const matches = grouped.get(value) ?? [];
+    if (matches.filter((m) => m.entityType === match.entityType).length < limit) {
+      matches.push(match);
+    }
+    grouped.set(value, matches);
+  }
+  return grouped;
+}
+
+/**
+ * Batch version of checkDuplicates for imports: normalizes every row up front and
+ * resolves each criterion for the whole batch with one query against leads and
+ * customers, instead of 8+ queries per row. Returns matches per input row, in order,
+ * using the same rules as checkDuplicates (company "contains", exact email,
+ * digits-only or E.164 phone for 10+ digits, case-insensitive GST).
+ */
+export async function checkDuplicatesBatch(
+  prisma: PrismaClient,
+  rows: DuplicateCheckInput[],
+): Promise<DuplicateMatch[][]> {
+  const normalized = rows.map((row) => {
+    const phone = normalizePhoneDigits(row.phone);
+    const hasPhone = !!phone && phone.length >= 10;
+    return {
+      company: row.companyName?.toLowerCase().trim() || undefined,
+      email: row.email?.toLowerCase().trim() || undefined,
+      phone: hasPhone ? phone : undefined,
+      e164: hasPhone ? toE164(row.phone, row.country) : undefined,
+      gst: row.gstNo?.toUpperCase().trim() || undefined,
+    };
+  });
+
+  const distinct = (key: keyof (typeof normalized)[number]) =>
+    Array.from(new Set(normalized.map((n) => n[key]).filter((v): v is string => !!v)));
+  const companies = distinct('company');
+  const emails = distinct('email');
+  const phones = distinct('phone');
+  const e164s = distinct('e164');
+  const gsts = distinct('gst');
+
+  const select = (table: string, entityType: string) =>
+    Prisma.sql`${entityType}::text AS "entityType", t.id, t."srplId", t."companyName", t."createdAt" FROM ${Prisma.raw(`"${table}"`)} t`;
+
+  // Substring match per distinct name; served by the companyName trigram indexes
+  const companyQuery = async (): Promise<DuplicateCandidate[]> => {
+    if (companies.length === 0) return [];
+    const patterns = companies.map((c) => `%${c.replace(/[\\%_]/g, '\\$&')}%`);
+    return (prisma as any).$queryRaw`
+      SELECT q.value, m.*
+      FROM unnest(${companies}::text[], ${patterns}::text[]) AS q(value, pattern)
+      CROSS JOIN LATERAL (
+        (SELECT ${select('Lead', 'lead')} WHERE t."companyName" ILIKE q.pattern LIMIT ${BATCH_MATCH_LIMIT})
+        UNION ALL
+        (SELECT ${select('Customer', 'customer')} WHERE t."companyName" ILIKE q.pattern LIMIT ${BATCH_MATCH_LIMIT})
+      ) m
+    `;
+  };
+
+  const exactQuery = async (
+    values: string[],
+    leadValue: Prisma.Sql,
+    customerValue: Prisma.Sql,
+  ): Promise<DuplicateCandidate[]> => {
+    if (values.length === 0) return [];
+    return (prisma as any).$queryRaw`
+      SELECT ${leadValue} AS value, ${select('Lead', 'lead')} WHERE ${leadValue} = ANY(${values})
+      UNION ALL
+      SELECT ${customerValue} AS value, ${select('Customer', 'customer')} WHERE ${customerValue} = ANY(${values})
+    `;
+  };
+
+  // Digits-only or E.164 match on the indexed normalized phone columns
+  const phoneQuery = async (): Promise<Array<DuplicateCandidate & { e164: string | null }>> => {
+    if (phones.length === 0) return [];
+    const orE164 = (column: string) =>
+      e164s.length > 0 ? Prisma.sql`OR ${Prisma.raw(`t."${column}"`)} = ANY(${e164s})` : Prisma.empty;
+    return (prisma as any).$queryRaw`
+      SELECT t."phoneDigits" AS value, t."phoneE164" AS e164, ${select('Lead', 'lead')}
+      WHERE t."phoneDigits" = ANY(${phones}) ${orE164('phoneE164')}
+      UNION ALL
+      SELECT t."contactPhoneDigits" AS value, t."contactPhoneE164" AS e164, ${select('Customer', 'customer')}
+      WHERE t."contactPhoneDigits" = ANY(${phones}) ${orE164('contactPhoneE164')}
+    `;
+  };
+
+  const [companyRows, emailRows, phoneRows, gstRows] = await Promise.all([
+    companyQuery(),
+    exactQuery(emails, Prisma.sql`t.email`, Prisma.sql`t."contactEmail"`),
+    phoneQuery(),
+    exactQuery(gsts, Prisma.sql`upper(t."gstNo")`, Prisma.sql`upper(t."gstNo")`),
+  ]);
+
+  const byCompany = groupCandidates(companyRows);
+  const byEmail = groupCandidates(emailRows, BATCH_MATCH_LIMIT);
+  // checkDuplicates does not cap phone matches
+  const byPhone = groupCandidates(phoneRows.map(({ e164, ...candidate }) => candidate));
+  const byE164 = groupCandidates(
+    phoneRows
+      .filter((candidate) => candidate.e164)
+      .map(({ e164, ...candidate }) => ({ ...candidate, value: e164! })),
+  );
+  const byGst = groupCandidates(gstRows, BATCH_MATCH_LIMIT);
+
+  return rows.map((row, index) => {
+    const n = normalized[index];
+    const found: DuplicateMatch[] = [];
+    const add = (
+      type: DuplicateMatch['type'],
+      value: string | undefined,
+      key: string | undefined,
+      grouped: Map<string, DuplicateMatch['matches']>,
+      extra: DuplicateMatch['matches'] = [],
+    ) => {
+      const matches = [...((key && grouped.get(key)) || [])];
+      for (const match of extra) {
+        if (!matches.some((m) => m.entityType === match.entityType && m.id === match.id)) {
+          matches.push(match);
+        }
+      }
+      if (value && matches.length > 0) {
+        found.push({ type, value, matches, confidence: 'high' });
+      }
+    };
+
+    add('company', row.companyName, n.company, byCompany);
+    add('email', row.email, n.email, byEmail);
+    add('phone', row.phone, n.phone, byPhone, n.e164 ? byE164.get(n.e164) : undefined);
+    add('gst', row.gstNo, n.gst, byGst);
+    return found;
+  });
+}
+
 /**
  * Calculate lead health score based on various factors
  */
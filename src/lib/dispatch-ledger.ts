@@ -0,0 +1,143 @@
+import { Prisma, type PrismaClient } from '@prisma/client';
+
+/**
+ * One sales order line from the DispatchLedger projection, with display names joined in
+ */
+export interface DispatchLedgerRow {
+  salesOrderItemId: string;
+  salesOrderId: string;
+  orderNumber: string;
+  orderDate: Date;
+  expectedShip: Date | null;
+  orderStatus: string;
+  customerId: string;
+  customerName: string;
+  customerSrplId: string | null;
+  productId: string;
+  productName: string;
+  productSku: string | null;
+  productSrplId: string | null;
+  salesRepName: string | null;
+  salesRepEmail: string | null;
+  orderedQty: number;
+  dispatchedQty: number;
+  pendingQty: number;
+}
+
+/**
+ * Invoice line dispatched against a sales order
+ */
+export interface DispatchInvoiceLine {
+  salesOrderId: string;
+  productId: string;
+  invoiceId: string;
+  invoiceNumber: string;
+  invoiceDate: Date;
+  quantity: number;
+}
+
+export interface DispatchLedgerFilters {
+  customerId?: string;
+  productId?: string;
+  orderStatus?: string;
+  orderDateFrom?: Date;
+  orderDateTo?: Date;
+  // Only customer/product combinations whose total pending quantity is positive
+  pendingOnly?: boolean;
+}
+
+/**
+ * Read ledger rows (one per sales order line) from the indexed projection
+ */
+export async function getDispatchLedgerRows(
+  prisma: PrismaClient,
+  filters: DispatchLedgerFilters = {},
+): Promise<DispatchLedgerRow[]> {
+  const { customerId, productId, orderStatus, orderDateFrom, orderDateTo, pendingOnly } = filters;
+
+  const conditions: Prisma.Sql[] = [];
+  if (customerId) conditions.push(Prisma.sql`l."customerId" = ${customerId}`);
+  if (productId) conditions.push(Prisma.sql`l."productId" = ${productId}`);
+  if (orderStatus) conditions.push(Prisma.sql`l."orderStatus" = ${orderStatus}`);
+  if (orderDateFrom) conditions.push(Prisma.sql`l."orderDate" >= ${orderDateFrom}`);
+  if (orderDateTo) conditions.push(Prisma.sql`l."orderDate" <= ${orderDateTo}`);
+  if (pendingOnly) {
+    conditions.push(Prisma.sql`(l."customerId", l."productId") IN (
+      SELECT "customerId", "productId"
+      FROM "DispatchLedger"
+      ${customerId ? Prisma.sql`WHERE "customerId" = ${customerId}` : Prisma.empty}
+      GROUP BY "customerId", "productId"
+      HAVING SUM("pendingQty") > 0
+    )`);
+  }
+
+  return prisma.$queryRaw`
+    SELECT
+      l."salesOrderItemId",
+      l."salesOrderId",
+      l."orderNumber",
+      l."orderDate",
+      l."expectedShip",
+      l."orderStatus",
+      l."customerId",
+      c."companyName" AS "customerName",
+      c."srplId" AS "customerSrplId",
+      l."productId",
+      p."name" AS "productName",
+      p."sku" AS "productSku",
+      p."srplId" AS "productSrplId",
+      u."name" AS "salesRepName",
+      u."email" AS "salesRepEmail",
+      l."orderedQty",
+      l."dispatchedQty",
+      l."pendingQty"
+    FROM "DispatchLedger" l
+    JOIN "Customer" c ON c."id" = l."customerId"
+    JOIN "Product" p ON p."id" = l."productId"
+    LEFT JOIN "User" u ON u."id" = l."salesRepId"
+    ${conditions.length > 0 ? Prisma.sql`WHERE ${Prisma.join(conditions, ' AND ')}` : Prisma.empty}
+    ORDER BY l."orderDate" DESC
+  `;
+}
+
+/**
+ * Invoice lines against the given sales orders, optionally only those issued by asOfDate
+ */
+export async function getDispatchInvoiceLines(
+  prisma: PrismaClient,
+  salesOrderIds: string[],
+  asOfDate?: Date,
+): Promise<DispatchInvoiceLine[]> {
+  if (salesOrderIds.length === 0) return [];
+
+  return prisma.$queryRaw`
+    SELECT
+      inv."salesOrderId",
+      ii."productId",
+      inv."id" AS "invoiceId",
+      inv."invoiceNumber",
+      inv."issueDate" AS "invoiceDate",
+      ii."quantity"
+    FROM "Invoice" inv
+    JOIN "InvoiceItem" ii ON ii."invoiceId" = inv."id"
+    WHERE inv."salesOrderId" = ANY(${salesOrderIds})
+      ${asOfDate ? Prisma.sql`AND inv."issueDate" <= ${asOfDate}` : Prisma.empty}
+  `;
+}
+
+/**
+ * Group invoice lines by sales order and product for line-level lookups
+ */
+export function groupInvoiceLines(lines: DispatchInvoiceLine[]): Map<string, DispatchInvoiceLine[]> {
+  const grouped = new Map<string, DispatchInvoiceLine[]>();
+  for (const line of lines) {
+    const key = `${line.salesOrderId}-${line.productId}`;
+    const existing = grouped.get(key);
+    if (existing) {
+      existing.push(line);
+    } else {
+      grouped.set(key, [line]);
+    }
+  }
+  return grouped;
+}
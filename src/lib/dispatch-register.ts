@@ -0,0 +1,361 @@
+import type { PrismaClient } from '@prisma/client';
+import { getDispatchInvoiceLines, getDispatchLedgerRows, groupInvoiceLines } from './dispatch-ledger';
+import { CACHE_TAGS, getOrSet } from './cache';
+
+const CACHE_KEY = 'dispatch-register';
+const CACHE_TTL = 5 * 60 * 1000; // 5 minutes
+// Sales order and invoice mutations publish these tags
+const CACHE_DEPENDENCIES = [CACHE_TAGS.SALES_ORDERS, CACHE_TAGS.INVOICES];
+
+export interface DispatchRegisterEntry {
+  customerId: string;
+  customerName: string;
+  productId: string;
+  productName: string;
+  productSKU?: string;
+  primaryPONumber: string;
+  primaryPODate: string | null;
+  allPOs: Array<{
+    poNumber: string;
+    poDate: string;
+    orderId: string;
+    quantity: number;
+  }>;
+  totalOrderReceived: number;
+  totalDispatched: number;
+  totalPending: number;
+  dispatchStatus: 'Pending' | 'Partially Dispatched' | 'Fully Dispatched' | 'Over-Dispatched';
+  hasAnomaly: boolean;
+  anomalyMessage?: string;
+  exceptionTypes?: Array<'over_dispatch' | 'delayed_dispatch' | 'excessive_partial'>;
+  salesPerson: string;
+  salesPersonEmail: string;
+  // Future-ready fields
+  dispatchLocation?: string | null;
+  plantId?: string | null;
+  // Line items for drill-down
+  lineItems: Array<{
+    salesOrderId: string;
+    salesOrderNumber: string;
+    salesOrderDate: string;
+    salesOrderItemId: string;
+    orderedQuantity: number;
+    dispatchedQuantity: number;
+    pendingQuantity: number;
+    expectedShipDate?: string | null;
+    invoices: Array<{
+      invoiceId: string;
+      invoiceNumber: string;
+      invoiceDate: string;
+      quantity: number;
+    }>;
+    hasException?: boolean;
+    exceptionType?: 'over_dispatch' | 'delayed_dispatch' | 'excessive_partial';
+    exceptionMessage?: string;
+  }>;
+}
+
+/**
+ * Configuration for exception detection thresholds (in days)
+ */
+const EXCEPTION_THRESHOLDS = {
+  DELAYED_DISPATCH_DAYS: 30, // Days after order date before flagging as delayed
+  EXCESSIVE_PARTIAL_DAYS: 30, // Days partial dispatch can remain before flagging
+  PARTIAL_DISPATCH_PERCENTAGE: 10, // Minimum percentage of order pending to flag as excessive partial
+};
+
+/**
+ * Calculate dispatch status and exceptions based on ordered vs dispatched quantities
+ */
+function calculateDispatchStatus(
+  ordered: number,
+  dispatched: number,
+  orderDate: Date,
+  expectedShipDate: Date | null,
+  asOfDate: Date
+): {
+  status: DispatchRegisterEntry['dispatchStatus'];
+  hasAnomaly: boolean;
+  message?: string;
+  exceptionTypes?: Array<'over_dispatch' | 'delayed_dispatch' | 'excessive_partial'>;
+} {
+  const exceptions: Array<'over_dispatch' | 'delayed_dispatch' | 'excessive_partial'> = [];
+  const messages: string[] = [];
+
+  // Over-dispatch check
+  if (dispatched > ordered) {
+    exceptions.push('over_dispatch');
+    messages.push(
+      `Dispatched quantity (${dispatched.toFixed(2)}) exceeds ordered quantity (${ordered.toFixed(2)}) by ${(dispatched - ordered).toFixed(2)} MTS`
+    );
+  }
+
+  // Delayed dispatch check
+  const daysSinceOrder = Math.floor((asOfDate.getTime() - orderDate.getTime()) / (1000 * 60 * 60 * 24));
+  const expectedDate = expectedShipDate || new Date(orderDate.getTime() + EXCEPTION_THRESHOLDS.DELAYED_DISPATCH_DAYS * 24 * 60 * 60 * 1000);
+  
+  if (asOfDate > expectedDate && dispatched < ordered) {
+    const daysPastDue = Math.floor((asOfDate.getTime() - expectedDate.getTime()) / (1000 * 60 * 60 * 24));
+    exceptions.push('delayed_dispatch');
+    messages.push(
+      `Dispatch delayed by ${daysPastDue} day(s). Expected ship: ${expectedDate.toLocaleDateString()}, Pending: ${(ordered - dispatched).toFixed(2)} MTS`
+    );
+  } else if (!expectedShipDate && daysSinceOrder > EXCEPTION_THRESHOLDS.DELAYED_DISPATCH_DAYS && dispatched === 0) {
+    exceptions.push('delayed_dispatch');
+    messages.push(`Order placed ${daysSinceOrder} days ago, no dispatch yet`);
+  }
+
+  // Excessive partial dispatch check
+  if (dispatched > 0 && dispatched < ordered) {
+    const pendingQty = ordered - dispatched;
+    const pendingPercentage = (pendingQty / ordered) * 100;
+    
+    // Check if partial dispatch has been pending for too long
+    if (daysSinceOrder > EXCEPTION_THRESHOLDS.EXCESSIVE_PARTIAL_DAYS && pendingPercentage > EXCEPTION_THRESHOLDS.PARTIAL_DISPATCH_PERCENTAGE) {
+      exceptions.push('excessive_partial');
+      messages.push(
+        `Partial dispatch pending for ${daysSinceOrder} days. ${pendingQty.toFixed(2)} MTS (${pendingPercentage.toFixed(1)}%) remaining`
+      );
+    }
+  }
+
+  // Determine status
+  let status: DispatchRegisterEntry['dispatchStatus'];
+  if (dispatched === 0) {
+    status = 'Pending';
+  } else if (dispatched < ordered) {
+    status = 'Partially Dispatched';
+  } else if (dispatched === ordered) {
+    status = 'Fully Dispatched';
+  } else {
+    status = 'Over-Dispatched';
+  }
+
+  return {
+    status,
+    hasAnomaly: exceptions.length > 0,
+    message: messages.length > 0 ? messages.join('; ') : undefined,
+    exceptionTypes: exceptions.length > 0 ? exceptions : undefined,
+  };
+}
+
+export interface DispatchRegisterOptions {
+  // Register is computed as of this instant (callers pass end of day)
+  asOfDate: Date;
+  includeAnomalies?: boolean;
+  exceptionType?: string | null;
+}
+
+export interface DispatchRegister {
+  data: DispatchRegisterEntry[];
+  asOfDate: string;
+  totalEntries: number;
+  anomaliesCount: number;
+  generatedAt: string;
+}
+
+/**
+ * Build the dispatch register as of the end of `asOfDate`
+ */
+export async function buildDispatchRegister(
+  prisma: PrismaClient,
+  { asOfDate, includeAnomalies = true, exceptionType = null }: DispatchRegisterOptions
+): Promise<DispatchRegister> {
+
+  // Sales order lines up to asOfDate from the dispatch ledger projection
+  const ledgerRows = await getDispatchLedgerRows(prisma, { orderDateTo: asOfDate });
+
+  // Invoice detail is only needed for orders that have dispatched anything
+  const dispatchedOrderIds = Array.from(
+    new Set(ledgerRows.filter((row) => row.dispatchedQty > 0).map((row) => row.salesOrderId))
+  );
+  const invoiceLines = groupInvoiceLines(
+    await getDispatchInvoiceLines(prisma, dispatchedOrderIds, asOfDate)
+  );
+
+  // Aggregate at line-item level (SalesOrderItem level)
+  const dispatchMap = new Map<string, DispatchRegisterEntry>();
+
+  ledgerRows.forEach((row) => {
+    const salesPersonName = row.salesRepName || row.salesRepEmail || 'N/A';
+    const salesPersonEmail = row.salesRepEmail || '';
+
+    // Key: customer-product combination
+    const key = `${row.customerId}-${row.productId}`;
+
+    // Dispatched quantity for this line item as of the requested date
+    const lineItemInvoices = (invoiceLines.get(`${row.salesOrderId}-${row.productId}`) || []).map((line) => ({
+      invoiceId: line.invoiceId,
+      invoiceNumber: line.invoiceNumber,
+      invoiceDate: line.invoiceDate.toISOString(),
+      quantity: Number(line.quantity),
+    }));
+    const lineItemDispatched = lineItemInvoices.reduce((sum, inv) => sum + inv.quantity, 0);
+
+    const orderedQty = Number(row.orderedQty);
+    const pendingQty = orderedQty - lineItemDispatched;
+
+    // Get or create dispatch entry
+    if (!dispatchMap.has(key)) {
+      dispatchMap.set(key, {
+        customerId: row.customerId,
+        customerName: row.customerName,
+        productId: row.productId,
+        productName: row.productName,
+        productSKU: row.productSku || row.productSrplId || undefined,
+        primaryPONumber: row.orderNumber,
+        primaryPODate: row.orderDate.toISOString(),
+        allPOs: [],
+        totalOrderReceived: 0,
+        totalDispatched: 0,
+        totalPending: 0,
+        dispatchStatus: 'Pending',
+        hasAnomaly: false,
+        salesPerson: salesPersonName,
+        salesPersonEmail,
+        lineItems: [],
+      });
+    }
+
+    const dispatch = dispatchMap.get(key)!;
+
+    // Add PO information
+    let poEntry = dispatch.allPOs.find((po) => po.orderId === row.salesOrderId);
+    if (!poEntry) {
+      poEntry = {
+        poNumber: row.orderNumber,
+        poDate: row.orderDate.toISOString(),
+        orderId: row.salesOrderId,
+        quantity: 0,
+      };
+      dispatch.allPOs.push(poEntry);
+    }
+    poEntry.quantity += orderedQty;
+
+    // Update primary PO (most recent)
+    if (row.orderDate > new Date(dispatch.primaryPODate || 0)) {
+      dispatch.primaryPONumber = row.orderNumber;
+      dispatch.primaryPODate = row.orderDate.toISOString();
+    }
+
+    // Calculate line item exceptions
+    const lineItemExceptionCalc = calculateDispatchStatus(
+      orderedQty,
+      lineItemDispatched,
+      row.orderDate,
+      row.expectedShip,
+      asOfDate
+    );
+
+    // Add line item detail
+    dispatch.lineItems.push({
+      salesOrderId: row.salesOrderId,
+      salesOrderNumber: row.orderNumber,
+      salesOrderDate: row.orderDate.toISOString(),
+      salesOrderItemId: row.salesOrderItemId,
+      orderedQuantity: orderedQty,
+      dispatchedQuantity: lineItemDispatched,
+      pendingQuantity: pendingQty,
+      expectedShipDate: row.expectedShip?.toISOString() || null,
+      invoices: lineItemInvoices,
+      hasException: lineItemExceptionCalc.hasAnomaly,
+      exceptionType: lineItemExceptionCalc.exceptionTypes?.[0],
+      exceptionMessage: lineItemExceptionCalc.message,
+    });
+
+    // Update totals
+    dispatch.totalOrderReceived += orderedQty;
+    dispatch.totalDispatched += lineItemDispatched;
+    dispatch.totalPending = dispatch.totalOrderReceived - dispatch.totalDispatched;
+  });
+
+  // Calculate status and check for anomalies
+  const dispatchData = Array.from(dispatchMap.values()).map((item) => {
+    // Use the earliest order date and expected ship date for aggregate calculations
+    const earliestOrderDate = new Date(
+      Math.min(...item.lineItems.map((li) => new Date(li.salesOrderDate).getTime()))
+    );
+    const earliestExpectedShip = item.lineItems
+      .map((li) => (li.expectedShipDate ? new Date(li.expectedShipDate).getTime() : null))
+      .filter((d): d is number => d !== null);
+    const earliestExpectedShipDate =
+      earliestExpectedShip.length > 0 ? new Date(Math.min(...earliestExpectedShip)) : null;
+
+    const statusCalc = calculateDispatchStatus(
+      item.totalOrderReceived,
+      item.totalDispatched,
+      earliestOrderDate,
+      earliestExpectedShipDate,
+      asOfDate
+    );
+
+    // Collect all exception types from line items
+    const allExceptionTypes = new Set<string>();
+    item.lineItems.forEach((li) => {
+      if (li.hasException && li.exceptionType) {
+        allExceptionTypes.add(li.exceptionType);
+      }
+    });
+
+    return {
+      ...item,
+      dispatchStatus: statusCalc.status,
+      hasAnomaly: statusCalc.hasAnomaly || item.lineItems.some((li) => li.hasException),
+      anomalyMessage: statusCalc.message,
+      exceptionTypes: Array.from(allExceptionTypes) as Array<
+        'over_dispatch' | 'delayed_dispatch' | 'excessive_partial'
+      >,
+      // Sort POs by date (most recent first)
+      allPOs: item.allPOs.sort(
+        (a, b) => new Date(b.poDate).getTime() - new Date(a.poDate).getTime()
+      ),
+      // Sort line items by date
+      lineItems: item.lineItems.sort(
+        (a, b) => new Date(b.salesOrderDate).getTime() - new Date(a.salesOrderDate).getTime()
+      ),
+    };
+  });
+
+  // Filter anomalies if requested
+  let filteredData = includeAnomalies
+    ? dispatchData
+    : dispatchData.filter((item) => !item.hasAnomaly);
+
+  // Filter by exception type if specified
+  if (exceptionType) {
+    filteredData = filteredData.filter((item) =>
+      item.exceptionTypes?.includes(exceptionType as any)
+    );
+  }
+
+  // Sort by customer name, then product name
+  filteredData.sort((a, b) => {
+    if (a.customerName !== b.customerName) {
+      return a.customerName.localeCompare(b.customerName);
+    }
+    return a.productName.localeCompare(b.productName);
+  });
+
+  return {
+    data: filteredData,
+    asOfDate: asOfDate.toISOString(),
+    totalEntries: filteredData.length,
+    anomaliesCount: filteredData.filter((item) => item.hasAnomaly).length,
+    generatedAt: new Date().toISOString(),
+  };
+}
+
+/**
+ * Dispatch register through the shared cache (see @/lib/cache).
+ * Concurrent misses for the same options compute the register once per instance.
+ */
+export function getDispatchRegister(
+  prisma: PrismaClient,
+  options: DispatchRegisterOptions
+): Promise<{ value: DispatchRegister; hit: boolean }> {
+  const { asOfDate, includeAnomalies = true, exceptionType = null } = options;
+  const cacheKey = `${CACHE_KEY}:${asOfDate.toISOString()}:${includeAnomalies}:${exceptionType || 'all'}`;
+  return getOrSet(cacheKey, { ttlMs: CACHE_TTL, tags: CACHE_DEPENDENCIES }, () =>
+    buildDispatchRegister(prisma, options)
+  );
+}
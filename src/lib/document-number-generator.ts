@@ -1,104 +1,100 @@
 import { getPrismaClient } from './prisma';
+import { advanceCounterTo, reserveCounterValues } from './srpl-id-generator';
+
+export type DocumentNumberType = 'QUOTE' | 'PROFORMA' | 'SALES_ORDER' | 'INVOICE';
+
+// Where each document type's number lives and which SequenceCounter row backs it
+const DOCUMENT_SEQUENCES: Record<
+  DocumentNumberType,
+  { prefix: string; counterCode: string; table: string; column: string }
+> = {
+  QUOTE: { prefix: 'Q', counterCode: 'DOC-Q', table: 'Quote', column: 'quoteNumber' },
+  PROFORMA: { prefix: 'PI', counterCode: 'DOC-PI', table: 'ProformaInvoice', column: 'proformaNumber' },
+  SALES_ORDER: { prefix: 'SO', counterCode: 'DOC-SO', table: 'SalesOrder', column: 'orderNumber' },
+  INVOICE: { prefix: 'INV', counterCode: 'DOC-INV', table: 'Invoice', column: 'invoiceNumber' },
+};
+
+/**
+ * Finds the highest sequence already used for a document type in a year.
+ * Only needed when a year's counter is first created (the migration backfills existing years).
+ */
+async function getHighestDocumentNumber(
+  tx: any,
+  type: DocumentNumberType,
+  year: number
+): Promise<number> {
+  const { prefix, table, column } = DOCUMENT_SEQUENCES[type];
+  const yearPrefix = `${prefix}-${year}-`;
+
+  const rows: Array<{ maxNumber: number | null }> = await tx.$queryRawUnsafe(
+    `SELECT MAX(CAST(substring("${column}" FROM $1) AS INTEGER)) AS "maxNumber"
+     FROM "${table}"
+     WHERE "${column}" ~ $1`,
+    `^${yearPrefix}(\\d+)$`
+  );
+
+  return Number(rows[0]?.maxNumber ?? 0);
+}
 
 /**
  * Generate the next sequential document number for a given type
  * Format: PREFIX-YYYY-NNNN (e.g., PI-2024-0001, SO-2024-0001, INV-2024-0001)
+ *
+ * Numbers come from a per-type, per-year SequenceCounter row advanced atomically,
+ * so generation is a single UPDATE regardless of how many documents exist.
  */
 export async function generateNextDocumentNumber(
-  type: 'QUOTE' | 'PROFORMA' | 'SALES_ORDER' | 'INVOICE'
+  type: DocumentNumberType
 ): Promise<string> {
   const prisma = await getPrismaClient();
   const currentYear = new Date().getFullYear();
   
-  const prefixes: Record<string, string> = {
-    QUOTE: 'Q',
-    PROFORMA: 'PI',
-    SALES_ORDER: 'SO',
-    INVOICE: 'INV',
-  };
-  
-  const prefix = prefixes[type];
+  const { prefix, counterCode } = DOCUMENT_SEQUENCES[type];
   const yearPrefix = `${prefix}-${currentYear}-`;
   
   try {
-    let maxNumber = 0;
-    
-    if (type === 'QUOTE') {
-      const quotes = await prisma.quote.findMany({
-        where: {
-          quoteNumber: {
-            startsWith: yearPrefix,
-          },
-        },
-        select: { quoteNumber: true },
-      });
-      
-      quotes.forEach((quote) => {
-        const match = quote.quoteNumber.match(new RegExp(`^${yearPrefix}(\\d+)$`));
-        if (match) {
-          const num = parseInt(match[1], 10);
-          if (num > maxNumber) maxNumber = num;
-        }
-      });
-    } else if (type === 'PROFORMA') {
-      const proformas = await prisma.proformaInvoice.findMany({
-        where: {
-          proformaNumber: {
-            startsWith: yearPrefix,
-          },
-        },
-        select: { proformaNumber: true },
-      });
-      
-      proformas.forEach((proforma) => {
-        const match = proforma.proformaNumber.match(new RegExp(`^${yearPrefix}(\\d+)$`));
-        if (match) {
-          const num = parseInt(match[1], 10);
-          if (num > maxNumber) maxNumber = num;
-        }
-      });
-    } else if (type === 'SALES_ORDER') {
-      const orders = await prisma.salesOrder.findMany({
-        where: {
-          orderNumber: {
-            startsWith: yearPrefix,
-          },
-        },
-        select: { orderNumber: true },
-      });
-      
-      orders.forEach((order) => {
-        const match = order.orderNumber.match(new RegExp(`^${yearPrefix}(\\d+)$`));
-        if (match) {
-          const num = parseInt(match[1], 10);
-          if (num > maxNumber) maxNumber = num;
-        }
-      });
-    } else if (type === 'INVOICE') {
-      const invoices = await prisma.invoice.findMany({
-        where: {
-          invoiceNumber: {
-            startsWith: yearPrefix,
-          },
-        },
-        select: { invoiceNumber: true },
-      });
-      
-      invoices.forEach((invoice) => {
-        const match = invoice.invoiceNumber.match(new RegExp(`^${yearPrefix}(\\d+)$`));
-        if (match) {
-          const num = parseInt(match[1], 10);
-          if (num > maxNumber) maxNumber = num;
-        }
-      });
-    }
-    
-    const nextNumber = maxNumber + 1;
+    const nextNumber = await reserveCounterValues(
+      prisma,
+      { moduleCode: counterCode, year: currentYear, financialYear: null },
+      1,
+      (tx) => getHighestDocumentNumber(tx, type, currentYear)
+    );
     return `${yearPrefix}${String(nextNumber).padStart(4, '0')}`;
   } catch (error) {
     console.error(`Error generating ${type} document number:`, error);
-    // Fallback to timestamp-based number if sequence generation fails
-    return `${prefix}-${Date.now()}`;
+    throw error;
   }
 }
 
+/**
+ * Document number for a new document: the caller-supplied number if there is one,
+ * otherwise the next generated number.
+ *
+ * A supplied number in the generated format (PREFIX-YYYY-NNNN) advances that year's
+ * counter past it, so later generated numbers don't collide with it.
+ */
+export async function resolveDocumentNumber(
+  type: DocumentNumberType,
+  requested?: string | null
+): Promise<string> {
+  if (!requested) {
+    return generateNextDocumentNumber(type);
+  }
+
+  const { prefix, counterCode } = DOCUMENT_SEQUENCES[type];
+  const match = new RegExp(`^${prefix}-(\\d{4})-(\\d+)$`).exec(requested);
+  const sequence = match ? Number(match[2]) : NaN;
+  // Counters are INTEGER columns; larger numbers can't collide with generated ones
+  if (match && sequence <= 2147483647) {
+    const year = Number(match[1]);
+    const prisma = await getPrismaClient();
+    await advanceCounterTo(
+      prisma,
+      { moduleCode: counterCode, year, financialYear: null },
+      sequence,
+      (tx) => getHighestDocumentNumber(tx, type, year)
+    );
+  }
+
+  return requested;
+}
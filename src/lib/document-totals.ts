@@ -0,0 +1,29 @@
+import type { PrismaClient } from '@prisma/client';
+
+export type TotalledDocumentType = 'quote' | 'proforma' | 'salesOrder' | 'invoice';
+
+// Document table, line item table and the item's foreign key to the document
+const DOCUMENT_TOTAL_TABLES: Record<TotalledDocumentType, [string, string, string]> = {
+  quote: ['Quote', 'QuoteItem', 'quoteId'],
+  proforma: ['ProformaInvoice', 'ProformaItem', 'proformaId'],
+  salesOrder: ['SalesOrder', 'SalesOrderItem', 'salesOrderId'],
+  invoice: ['Invoice', 'InvoiceItem', 'invoiceId'],
+};
+
+/**
+ * Recompute stored subtotal/taxTotal/grandTotal from line items.
+ * Database triggers keep these columns current on every item write (and on customer
+ * address changes, for drafts only); this is the backfill/repair path (e.g. after
+ * restoring data or changing tax rules). It recomputes every document, issued ones included.
+ */
+export async function recalculateDocumentTotals(
+  prisma: PrismaClient,
+  documentTypes: TotalledDocumentType[] = Object.keys(DOCUMENT_TOTAL_TABLES) as TotalledDocumentType[],
+): Promise<void> {
+  for (const documentType of documentTypes) {
+    const [documentTable, itemTable, foreignKey] = DOCUMENT_TOTAL_TABLES[documentType];
+    await prisma.$executeRaw`
+      SELECT document_totals_refresh(${documentTable}, ${itemTable}, ${foreignKey}, NULL, NULL)
+    `;
+  }
+}
@@ -0,0 +1,363 @@
+import { randomUUID } from 'crypto';
+import type { PrismaClient } from '@prisma/client';
+
+const DEFAULT_THRESHOLD = 0.8;
+// Blocks larger than this come from very common tokens ("traders", "india"); the
+// other blocking passes still pair their members, so they are skipped
+const DEFAULT_MAX_BLOCK_SIZE = 200;
+const PAGE_SIZE = 20000;
+const WRITE_CHUNK_SIZE = 5000;
+
+// MinHash over name trigrams, banded into LSH buckets: names sharing most
+// trigrams land in at least one common bucket even when no token matches exactly
+const MINHASH_BANDS = 4;
+const MINHASH_ROWS = 2;
+
+// Legal forms and filler words that don't distinguish companies
+const STOP_WORDS = new Set([
+  'the', 'and', 'of', 'ms', 'pvt', 'private', 'ltd', 'limited', 'llp', 'llc', 'inc',
+  'incorporated', 'co', 'company', 'corp', 'corporation', 'plc', 'gmbh', 'ag', 'sa',
+  'srl', 'bv', 'pte',
+]);
+
+export interface ClusteringOptions {
+  // Minimum trigram Dice similarity (0-1) for two names to be linked
+  threshold?: number;
+  maxBlockSize?: number;
+  onProgress?: (message: string) => void;
+}
+
+export interface ClusteringResult {
+  runId: string;
+  recordCount: number;
+  clusterCount: number;
+  comparisons: number;
+  skippedBlocks: number;
+}
+
+interface CompanyRecord {
+  entityType: 'lead' | 'customer';
+  entityId: string;
+  srplId: string | null;
+  companyName: string;
+  normalized: string;
+  tokens: string[];
+  trigrams: Uint32Array;
+}
+
+/**
+ * Lower-case, strip punctuation and legal forms ("Acme Pvt. Ltd." -> "acme")
+ */
+export function normalizeCompanyName(name: string): string {
+  return name
+    .toLowerCase()
+    .replace(/&/g, ' and ')
+    .replace(/[^a-z0-9]+/g, ' ')
+    .split(' ')
+    .filter((token) => token && !STOP_WORDS.has(token))
+    .join(' ');
+}
+
+/**
+ * American Soundex code of a token ("smith" -> "S530")
+ */
+export function soundex(token: string): string {
+  const codes: Record<string, string> = {
+    b: '1', f: '1', p: '1', v: '1',
+    c: '2', g: '2', j: '2', k: '2', q: '2', s: '2', x: '2', z: '2',
+    d: '3', t: '3', l: '4', m: '5', n: '5', r: '6',
+  };
+  const letters = token.toLowerCase().replace(/[^a-z]/g, '');
+  if (!letters) return '';
+
+  let result = letters[0].toUpperCase();
+  let previous = codes[letters[0]] || '';
+  for (let i = 1; i < letters.length && result.length < 4; i++) {
+    const ch = letters[i];
+    const code = codes[ch] || '';
+    if (code && code !== previous) result += code;
+    // h and w don't separate letters with the same code; vowels do
+    if (ch !== 'h' && ch !== 'w') previous = code;
+  }
+  return result.padEnd(4, '0');
+}
+
+/**
+ * 32-bit FNV-1a hash
+ */
+function hash(text: string, seed = 0x811c9dc5): number {
+  let h = seed;
+  for (let i = 0; i < text.length; i++) {
+    h ^= text.charCodeAt(i);
+    h = Math.imul(h, 0x01000193);
+  }
+  return h >>> 0;
+}
+
+/**
+ * Sorted, de-duplicated trigram hashes of a normalized name
+ */
+function trigramHashes(normalized: string): Uint32Array {
+  const padded = `  ${normalized} `;
+  const hashes = new Set<number>();
+  for (let i = 0; i + 3 <= padded.length; i++) {
+    hashes.add(hash(padded.slice(i, i + 3)));
+  }
+  return Uint32Array.from(hashes).sort();
+}
+
+/**
+ * Dice coefficient of two sorted trigram sets
+ */
+function diceSimilarity(a: Uint32Array, b: Uint32Array): number {
+  if (a.length === 0 || b.length === 0) return 0;
+  let i = 0;
+  let j = 0;
+  let shared = 0;
+  while (i < a.length && j < b.length) {
+    if (a[i] === b[j]) {
+      shared++;
+      i++;
+      j++;
+    } else if (a[i] < b[j]) {
+      i++;
+    } else {
+      j++;
+    }
+  }
+  return (2 * shared) / (a.length + b.length);
+}
+
+function minHashBuckets(trigrams: Uint32Array): string[] {
+  const buckets: string[] = [];
+  for (let band = 0; band < MINHASH_BANDS; band++) {
+    const signature: number[] = [];
+    for (let row = 0; row < MINHASH_ROWS; row++) {
+      const seed = Math.imul(band * MINHASH_ROWS + row + 1, 0x9e3779b1);
+      let min = 0xffffffff;
+      for (const trigram of trigrams) {
+        let h = Math.imul(trigram ^ seed, 0x85ebca6b);
+        h ^= h >>> 13;
+        h = Math.imul(h, 0xc2b2ae35) >>> 0;
+        if (h < min) min = h;
+      }
+      signature.push(min);
+    }
+    buckets.push(`m${band}:${signature.join(':')}`);
+  }
+  return buckets;
+}
+
+/**
+ * Blocking passes; each maps a record to the keys of the blocks it belongs to.
+ * Passes run one at a time so only one pass's block index is in memory.
+ */
+const BLOCKING_PASSES: Array<{ name: string; keys: (record: CompanyRecord) => string[] }> = [
+  { name: 'token', keys: (r) => r.tokens.filter((t) => t.length >= 3).map((t) => `t:${t}`) },
+  {
+    name: 'phonetic',
+    keys: (r) => (r.tokens.length > 0 ? [`s:${r.tokens.slice(0, 2).map(soundex).join('')}`] : []),
+  },
+  { name: 'trigram', keys: (r) => minHashBuckets(r.trigrams) },
+];
+
+class UnionFind {
+  private parent: Int32Array;
+  // Lowest similarity that linked each component, tracked at the root
+  readonly minScore: Float32Array;
+
+  constructor(size: number) {
+    this.parent = new Int32Array(size).map((_, i) => i);
+    this.minScore = new Float32Array(size).fill(1);
+  }
+
+  find(i: number): number {
+    while (this.parent[i] !== i) {
+      this.parent[i] = this.parent[this.parent[i]];
+      i = this.parent[i];
+    }
+    return i;
+  }
+
+  union(a: number, b: number, score: number) {
+    const rootA = this.find(a);
+    const rootB = this.find(b);
+    if (rootA === rootB) return;
+    this.parent[rootB] = rootA;
+    this.minScore[rootA] = Math.min(this.minScore[rootA], this.minScore[rootB], score);
+  }
+}
+
+async function loadRecords(prisma: PrismaClient, onProgress: (message: string) => void) {
+  const records: CompanyRecord[] = [];
+  const sources = [
+    { entityType: 'lead' as const, model: (prisma as any).lead },
+    { entityType: 'customer' as const, model: (prisma as any).customer },
+  ];
+
+  for (const { entityType, model } of sources) {
+    let cursor: string | undefined;
+    while (true) {
+      const page: Array<{ id: string; srplId: string | null; companyName: string }> = await model.findMany({
+        select: { id: true, srplId: true, companyName: true },
+        orderBy: { id: 'asc' },
+        take: PAGE_SIZE,
+        ...(cursor && { cursor: { id: cursor }, skip: 1 }),
+      });
+
+      for (const row of page) {
+        const normalized = normalizeCompanyName(row.companyName);
+        if (!normalized) continue;
+        records.push({
+          entityType,
+          entityId: row.id,
+          srplId: row.srplId,
+          companyName: row.companyName,
+          normalized,
+          tokens: normalized.split(' '),
+          trigrams: trigramHashes(normalized),
+        });
+      }
+
+      if (page.length < PAGE_SIZE) break;
+      cursor = page[page.length - 1].id;
+    }
+    onProgress(`Loaded ${records.length} records (through ${entityType}s)`);
+  }
+
+  return records;
+}
+
+/**
+ * Cluster near-duplicate company names across all leads and customers and persist
+ * the clusters as a new DuplicateClusterRun, replacing the previous run's clusters.
+ *
+ * Only names sharing a blocking key (significant token, Soundex of the leading
+ * tokens, or a MinHash trigram bucket) are compared, so the work grows with block
+ * sizes rather than n². Identical normalized names are linked without scoring.
+ */
+export async function buildDuplicateClusters(
+  prisma: PrismaClient,
+  options: ClusteringOptions = {},
+): Promise<ClusteringResult> {
+  const threshold = options.threshold ?? DEFAULT_THRESHOLD;
+  const maxBlockSize = options.maxBlockSize ?? DEFAULT_MAX_BLOCK_SIZE;
+  const onProgress = options.onProgress ?? (() => {});
+  const p = prisma as any;
+
+  const run = await p.duplicateClusterRun.create({
+    data: { status: 'running', threshold },
+  });
+
+  try {
+    const records = await loadRecords(prisma, onProgress);
+    const clusters = new UnionFind(records.length);
+    let comparisons = 0;
+    let skippedBlocks = 0;
+
+    // Exact normalized matches: link directly, whatever the block size
+    const exact = new Map<string, number>();
+    records.forEach((record, i) => {
+      const first = exact.get(record.normalized);
+      if (first === undefined) exact.set(record.normalized, i);
+      else clusters.union(first, i, 1);
+    });
+    exact.clear();
+
+    for (const pass of BLOCKING_PASSES) {
+      const blocks = new Map<string, number[]>();
+      records.forEach((record, i) => {
+        for (const key of pass.keys(record)) {
+          const block = blocks.get(key);
+          if (block) block.push(i);
+          else blocks.set(key, [i]);
+        }
+      });
+
+      for (const block of blocks.values()) {
+        if (block.length < 2) continue;
+        if (block.length > maxBlockSize) {
+          skippedBlocks++;
+          continue;
+        }
+        for (let x = 0; x < block.length; x++) {
+          for (let y = x + 1; y < block.length; y++) {
+            const a = block[x];
+            const b = block[y];
+            if (clusters.find(a) === clusters.find(b)) continue;
+            comparisons++;
+            const score = diceSimilarity(records[a].trigrams, records[b].trigrams);
+            if (score >= threshold) clusters.union(a, b, score);
+          }
+        }
+      }
+      onProgress(`Pass ${pass.name}: ${blocks.size} blocks, ${comparisons} comparisons so far`);
+    }
+
+    // Group members by component root
+    const components = new Map<number, number[]>();
+    records.forEach((_, i) => {
+      const root = clusters.find(i);
+      const members = components.get(root);
+      if (members) members.push(i);
+      else components.set(root, [i]);
+    });
+
+    const clusterRows: any[] = [];
+    const memberRows: any[] = [];
+    for (const [root, members] of components) {
+      if (members.length < 2) continue;
+      const clusterId = randomUUID();
+      clusterRows.push({
+        id: clusterId,
+        runId: run.id,
+        size: members.length,
+        score: clusters.minScore[root],
+        label: records[members[0]].companyName,
+      });
+      for (const i of members) {
+        memberRows.push({
+          clusterId,
+          entityType: records[i].entityType,
+          entityId: records[i].entityId,
+          srplId: records[i].srplId,
+          companyName: records[i].companyName,
+        });
+      }
+    }
+
+    for (let i = 0; i < clusterRows.length; i += WRITE_CHUNK_SIZE) {
+      await p.duplicateCluster.createMany({ data: clusterRows.slice(i, i + WRITE_CHUNK_SIZE) });
+    }
+    for (let i = 0; i < memberRows.length; i += WRITE_CHUNK_SIZE) {
+      await p.duplicateClusterMember.createMany({ data: memberRows.slice(i, i + WRITE_CHUNK_SIZE) });
+    }
+
+    // Publish the new run, then drop older clusters (members cascade)
+    await p.duplicateClusterRun.update({
+      where: { id: run.id },
+      data: {
+        status: 'completed',
+        recordCount: records.length,
+        clusterCount: clusterRows.length,
+        completedAt: new Date(),
+      },
+    });
+    await p.duplicateCluster.deleteMany({ where: { runId: { not: run.id } } });
+
+    return {
+      runId: run.id,
+      recordCount: records.length,
+      clusterCount: clusterRows.length,
+      comparisons,
+      skippedBlocks,
+    };
+  } catch (error) {
+    await p.duplicateCluster.deleteMany({ where: { runId: run.id } }).catch(() => {});
+    await p.duplicateClusterRun.update({
+      where: { id: run.id },
+      data: { status: 'failed', completedAt: new Date() },
+    });
+    throw error;
+  }
+}
@@ -15,6 +15,56 @@ export interface SearchOptions {
   limit?: number;
   entityTypes?: string[];
   userId?: string; // For RBAC filtering
+  mode?: 'index' | 'fanout'; // 'fanout' skips the index and queries each entity table in parallel
+  entityTimeoutMs?: number; // Per-entity deadline in fan-out mode
+}
+
+export interface GlobalSearchOutcome {
+  results: SearchResult[];
+  incomplete: boolean; // True when any entity search timed out or failed
+  timedOut: string[];
+  failed: string[];
+  timings: Record<string, number>; // Milliseconds per entity type (or 'index')
+  matchText: Record<string, string>; // Lower-cased searchable text per result, keyed by getSearchResultKey
+}
+
+// A result plus the lower-cased text it was matched against
+type SearchHit = SearchResult & { matchText: string };
+
+// Default per-entity deadline for fan-out searches
+const DEFAULT_ENTITY_TIMEOUT_MS = 500;
+
+// Entity types covered by the SearchDocument index
+const INDEXED_ENTITY_TYPES: SearchResult['type'][] = ['lead', 'customer', 'product', 'deal', 'quote', 'invoice'];
+
+interface SearchDocumentRow {
+  entityType: SearchResult['type'];
+  entityId: string;
+  srplId: string | null;
+  title: string;
+  subtitle: string | null;
+  description: string | null;
+  searchText: string;
+  relevanceScore: number;
+}
+
+/**
+ * Stable key for a search result across entity types
+ */
+export function getSearchResultKey(result: Pick<SearchResult, 'type' | 'id'>): string {
+  return `${result.type}:${result.id}`;
+}
+
+/**
+ * Split hits into client-facing results and their match text
+ */
+function splitHits(hits: SearchHit[]): { results: SearchResult[]; matchText: Record<string, string> } {
+  const matchText: Record<string, string> = {};
+  const results = hits.map(({ matchText: text, ...result }) => {
+    matchText[getSearchResultKey(result)] = text;
+    return result;
+  });
+  return { results, matchText };
 }
 
 /**
@@ -25,270 +75,405 @@ export async function globalSearch(
   query: string,
   options: SearchOptions = {},
 ): Promise<SearchResult[]> {
-  const { limit = 20, entityTypes, userId } = options;
+  const { results } = await globalSearchWithStats(prisma, query, options);
+  return results;
+}
+
+/**
+ * Global search returning per-entity timings and completeness.
+ * Answers from the trigram-indexed SearchDocument table in a single ranked query,
+ * falling back to the parallel per-entity fan-out if the index is unavailable
+ * (or when `mode: 'fanout'` is requested).
+ */
+export async function globalSearchWithStats(
+  prisma: PrismaClient,
+  query: string,
+  options: SearchOptions = {},
+): Promise<GlobalSearchOutcome> {
   const searchTerm = query.toLowerCase().trim();
 
   if (!searchTerm || searchTerm.length < 2) {
-    return [];
+    return { results: [], incomplete: false, timedOut: [], failed: [], timings: {}, matchText: {} };
   }
 
-  const results: SearchResult[] = [];
-
-  // Search Leads
-  if (!entityTypes || entityTypes.includes('lead')) {
+  if (options.mode !== 'fanout') {
+    const startedAt = performance.now();
     try {
-      const leads = await prisma.lead.findMany({
-      where: {
-        OR: [
-          { companyName: { contains: searchTerm, mode: 'insensitive' } },
-          { contactName: { contains: searchTerm, mode: 'insensitive' } },
-          { email: { contains: searchTerm, mode: 'insensitive' } },
-          { phone: { contains: searchTerm, mode: 'insensitive' } },
-          { srplId: { contains: searchTerm, mode: 'insensitive' } },
-        ],
-        ...(userId ? { ownerId: userId } : {}), // RBAC: only own leads if not admin
-      },
-      take: limit,
-      select: {
-        id: true,
-        srplId: true,
-        companyName: true,
-        contactName: true,
-        email: true,
-        status: true,
-      },
-    });
-
-    for (const lead of leads) {
-      const relevance = calculateRelevance(lead.companyName, searchTerm) * 0.4 +
-        (lead.contactName ? calculateRelevance(lead.contactName, searchTerm) * 0.3 : 0) +
-        (lead.srplId && lead.srplId.toLowerCase().includes(searchTerm) ? 0.3 : 0);
-
-      results.push({
-        id: lead.id,
-        srplId: lead.srplId,
-        type: 'lead',
-        title: lead.companyName,
-        subtitle: lead.contactName || undefined,
-        description: lead.status,
-        relevanceScore: relevance,
-      });
-    }
+      const hits = await searchIndex(prisma, searchTerm, options);
+      return {
+        ...splitHits(hits),
+        incomplete: false,
+        timedOut: [],
+        failed: [],
+        timings: { index: performance.now() - startedAt },
+      };
     } catch (error) {
-      console.error('Error searching leads:', error);
+      console.error('Search index query failed, falling back to per-entity search:', error);
     }
   }
 
-  // Search Customers
-  if (!entityTypes || entityTypes.includes('customer')) {
-    try {
-      const customers = await prisma.customer.findMany({
-      where: {
-        OR: [
-          { companyName: { contains: searchTerm, mode: 'insensitive' } },
-          { contactName: { contains: searchTerm, mode: 'insensitive' } },
-          { contactEmail: { contains: searchTerm, mode: 'insensitive' } },
-          { srplId: { contains: searchTerm, mode: 'insensitive' } },
-        ],
-      },
-      take: limit,
-      select: {
-        id: true,
-        srplId: true,
-        companyName: true,
-        contactName: true,
-        contactEmail: true,
-        customerType: true,
-      },
-    });
+  return searchEntities(prisma, searchTerm, options);
+}
 
-    for (const customer of customers) {
-      const relevance = calculateRelevance(customer.companyName, searchTerm) * 0.5 +
-        (customer.srplId && customer.srplId.toLowerCase().includes(searchTerm) ? 0.5 : 0);
-
-      results.push({
-        id: customer.id,
-        srplId: customer.srplId,
-        type: 'customer',
-        title: customer.companyName,
-        subtitle: customer.contactName || customer.contactEmail || undefined,
-        description: customer.customerType,
-        relevanceScore: relevance,
-      });
-    }
-    } catch (error) {
-      console.error('Error searching customers:', error);
-    }
-  }
+/**
+ * Escape LIKE wildcards so user input is matched literally
+ */
+function escapeLikePattern(value: string): string {
+  return value.replace(/[\\%_]/g, (char) => `\\${char}`);
+}
 
-  // Search Products
-  if (!entityTypes || entityTypes.includes('product')) {
-    try {
-      const products = await prisma.product.findMany({
-      where: {
-        OR: [
-          { name: { contains: searchTerm, mode: 'insensitive' } },
-          { sku: { contains: searchTerm, mode: 'insensitive' } },
-          { srplId: { contains: searchTerm, mode: 'insensitive' } },
-        ],
-      },
-      take: limit,
-      select: {
-        id: true,
-        srplId: true,
-        name: true,
-        sku: true,
-        unitPrice: true,
-      },
-    });
+/**
+ * Single ranked query against the SearchDocument index.
+ * `LIKE '%term%'` and `<%` (word similarity) are both served by the gin_trgm_ops index.
+ */
+async function searchIndex(
+  prisma: PrismaClient,
+  searchTerm: string,
+  options: SearchOptions,
+): Promise<SearchHit[]> {
+  const { limit = 20, entityTypes, userId } = options;
+  const types = entityTypes
+    ? INDEXED_ENTITY_TYPES.filter((type) => entityTypes.includes(type))
+    : INDEXED_ENTITY_TYPES;
 
-    for (const product of products) {
-      const relevance = calculateRelevance(product.name, searchTerm) * 0.4 +
-        (product.sku && product.sku.toLowerCase().includes(searchTerm) ? 0.4 : 0) +
-        (product.srplId && product.srplId.toLowerCase().includes(searchTerm) ? 0.2 : 0);
-
-      results.push({
-        id: product.id,
-        srplId: product.srplId,
-        type: 'product',
-        title: product.name,
-        subtitle: product.sku || undefined,
-        description: product.unitPrice ? `₹${Number(product.unitPrice).toLocaleString('en-IN')}` : undefined,
-        relevanceScore: relevance,
-      });
-    }
-    } catch (error) {
-      console.error('Error searching products:', error);
-    }
+  if (types.length === 0) {
+    return [];
   }
 
-  // Search Deals
-  if (!entityTypes || entityTypes.includes('deal')) {
-    try {
-      const deals = await prisma.deal.findMany({
-      where: {
-        OR: [
-          { title: { contains: searchTerm, mode: 'insensitive' } },
-          { srplId: { contains: searchTerm, mode: 'insensitive' } },
-        ],
-      },
-      take: limit,
-      select: {
-        id: true,
-        srplId: true,
-        title: true,
-        stage: true,
-        customer: {
-          select: { companyName: true },
-        },
-      },
-    });
+  const escaped = escapeLikePattern(searchTerm);
+  const containsPattern = `%${escaped}%`;
+  const prefixPattern = `${escaped}%`;
+  const ownerId = userId ?? null;
+
+  const rows = await prisma.$queryRaw<SearchDocumentRow[]>`
+    SELECT "entityType", "entityId", "srplId", "title", "subtitle", "description", "searchText",
+      (
+        CASE
+          WHEN lower("title") = ${searchTerm} THEN 1.0
+          WHEN lower("title") LIKE ${prefixPattern} THEN 0.9
+          WHEN "searchText" LIKE ${containsPattern} THEN 0.6
+          ELSE 0
+        END
+        + 0.3 * word_similarity(${searchTerm}, "searchText")
+        + CASE WHEN lower(COALESCE("srplId", '')) LIKE ${containsPattern} THEN 0.3 ELSE 0 END
+      )::float8 AS "relevanceScore"
+    FROM "SearchDocument"
+    WHERE "entityType" = ANY(${types})
+      AND ("searchText" LIKE ${containsPattern} OR ${searchTerm} <% "searchText")
+      AND ("entityType" <> 'lead' OR ${ownerId}::text IS NULL OR "ownerId" = ${ownerId})
+    ORDER BY "relevanceScore" DESC
+    LIMIT ${limit}
+  `;
+
+  return rows.map((row) => ({
+    id: row.entityId,
+    srplId: row.srplId,
+    type: row.entityType,
+    title: row.title,
+    subtitle: row.subtitle || undefined,
+    description:
+      row.entityType === 'product' && row.description
+        ? `₹${Number(row.description).toLocaleString('en-IN')}`
+        : row.description || undefined,
+    relevanceScore: Number(row.relevanceScore),
+    matchText: row.searchText,
+  }));
+}
 
-    for (const deal of deals) {
-      const relevance = calculateRelevance(deal.title, searchTerm) * 0.5 +
-        (deal.srplId && deal.srplId.toLowerCase().includes(searchTerm) ? 0.5 : 0);
-
-      results.push({
-        id: deal.id,
-        srplId: deal.srplId,
-        type: 'deal',
-        title: deal.title,
-        subtitle: deal.customer.companyName,
-        description: deal.stage,
-        relevanceScore: relevance,
-      });
-    }
-    } catch (error) {
-      console.error('Error searching deals:', error);
-    }
-  }
+/**
+ * Lower-cased concatenation of the fields an entity is searched on
+ */
+function toMatchText(...fields: Array<string | null | undefined>): string {
+  return fields.filter(Boolean).join(' ').toLowerCase();
+}
 
-  // Search Quotes
-  if (!entityTypes || entityTypes.includes('quote')) {
-    try {
-      const quotes = await prisma.quote.findMany({
-      where: {
-        OR: [
-          { quoteNumber: { contains: searchTerm, mode: 'insensitive' } },
-          { srplId: { contains: searchTerm, mode: 'insensitive' } },
-        ],
+type EntitySearcher = (
+  prisma: PrismaClient,
+  searchTerm: string,
+  limit: number,
+  userId?: string,
+) => Promise<SearchHit[]>;
+
+const searchLeads: EntitySearcher = async (prisma, searchTerm, limit, userId) => {
+  const leads = await prisma.lead.findMany({
+    where: {
+      OR: [
+        { companyName: { contains: searchTerm, mode: 'insensitive' } },
+        { contactName: { contains: searchTerm, mode: 'insensitive' } },
+        { email: { contains: searchTerm, mode: 'insensitive' } },
+        { phone: { contains: searchTerm, mode: 'insensitive' } },
+        { srplId: { contains: searchTerm, mode: 'insensitive' } },
+      ],
+      ...(userId ? { ownerId: userId } : {}), // RBAC: only own leads if not admin
+    },
+    take: limit,
+    select: {
+      id: true,
+      srplId: true,
+      companyName: true,
+      contactName: true,
+      email: true,
+      phone: true,
+      status: true,
+    },
+  });
+
+  return leads.map((lead) => ({
+    id: lead.id,
+    srplId: lead.srplId,
+    type: 'lead' as const,
+    title: lead.companyName,
+    subtitle: lead.contactName || undefined,
+    description: lead.status,
+    relevanceScore: calculateRelevance(lead.companyName, searchTerm) * 0.4 +
+      (lead.contactName ? calculateRelevance(lead.contactName, searchTerm) * 0.3 : 0) +
+      (lead.srplId && lead.srplId.toLowerCase().includes(searchTerm) ? 0.3 : 0),
+    matchText: toMatchText(lead.companyName, lead.contactName, lead.email, lead.phone, lead.srplId),
+  }));
+};
+
+const searchCustomers: EntitySearcher = async (prisma, searchTerm, limit) => {
+  const customers = await prisma.customer.findMany({
+    where: {
+      OR: [
+        { companyName: { contains: searchTerm, mode: 'insensitive' } },
+        { contactName: { contains: searchTerm, mode: 'insensitive' } },
+        { contactEmail: { contains: searchTerm, mode: 'insensitive' } },
+        { srplId: { contains: searchTerm, mode: 'insensitive' } },
+      ],
+    },
+    take: limit,
+    select: {
+      id: true,
+      srplId: true,
+      companyName: true,
+      contactName: true,
+      contactEmail: true,
+      customerType: true,
+    },
+  });
+
+  return customers.map((customer) => ({
+    id: customer.id,
+    srplId: customer.srplId,
+    type: 'customer' as const,
+    title: customer.companyName,
+    subtitle: customer.contactName || customer.contactEmail || undefined,
+    description: customer.customerType,
+    relevanceScore: calculateRelevance(customer.companyName, searchTerm) * 0.5 +
+      (customer.srplId && customer.srplId.toLowerCase().includes(searchTerm) ? 0.5 : 0),
+    matchText: toMatchText(customer.companyName, customer.contactName, customer.contactEmail, customer.srplId),
+  }));
+};
+
+const searchProducts: EntitySearcher = async (prisma, searchTerm, limit) => {
+  const products = await prisma.product.findMany({
+    where: {
+      OR: [
+        { name: { contains: searchTerm, mode: 'insensitive' } },
+        { sku: { contains: searchTerm, mode: 'insensitive' } },
+        { srplId: { contains: searchTerm, mode: 'insensitive' } },
+      ],
+    },
+    take: limit,
+    select: {
+      id: true,
+      srplId: true,
+      name: true,
+      sku: true,
+      unitPrice: true,
+    },
+  });
+
+  return products.map((product) => ({
+    id: product.id,
+    srplId: product.srplId,
+    type: 'product' as const,
+    title: product.name,
+    subtitle: product.sku || undefined,
+    description: product.unitPrice ? `₹${Number(product.unitPrice).toLocaleString('en-IN')}` : undefined,
+    relevanceScore: calculateRelevance(product.name, searchTerm) * 0.4 +
+      (product.sku && product.sku.toLowerCase().includes(searchTerm) ? 0.4 : 0) +
+      (product.srplId && product.srplId.toLowerCase().includes(searchTerm) ? 0.2 : 0),
+    matchText: toMatchText(product.name, product.sku, product.srplId),
+  }));
+};
+
+const searchDeals: EntitySearcher = async (prisma, searchTerm, limit) => {
+  const deals = await prisma.deal.findMany({
+    where: {
+      OR: [
+        { title: { contains: searchTerm, mode: 'insensitive' } },
+        { srplId: { contains: searchTerm, mode: 'insensitive' } },
+      ],
+    },
+    take: limit,
+    select: {
+      id: true,
+      srplId: true,
+      title: true,
+      stage: true,
+      customer: {
+        select: { companyName: true },
       },
-      take: limit,
-      select: {
-        id: true,
-        srplId: true,
-        quoteNumber: true,
-        status: true,
-        customer: {
-          select: { companyName: true },
-        },
+    },
+  });
+
+  return deals.map((deal) => ({
+    id: deal.id,
+    srplId: deal.srplId,
+    type: 'deal' as const,
+    title: deal.title,
+    subtitle: deal.customer.companyName,
+    description: deal.stage,
+    relevanceScore: calculateRelevance(deal.title, searchTerm) * 0.5 +
+      (deal.srplId && deal.srplId.toLowerCase().includes(searchTerm) ? 0.5 : 0),
+    matchText: toMatchText(deal.title, deal.srplId),
+  }));
+};
+
+const searchQuotes: EntitySearcher = async (prisma, searchTerm, limit) => {
+  const quotes = await prisma.quote.findMany({
+    where: {
+      OR: [
+        { quoteNumber: { contains: searchTerm, mode: 'insensitive' } },
+        { srplId: { contains: searchTerm, mode: 'insensitive' } },
+      ],
+    },
+    take: limit,
+    select: {
+      id: true,
+      srplId: true,
+      quoteNumber: true,
+      status: true,
+      customer: {
+        select: { companyName: true },
       },
-    });
+    },
+  });
+
+  return quotes.map((quote) => ({
+    id: quote.id,
+    srplId: quote.srplId,
+    type: 'quote' as const,
+    title: quote.quoteNumber,
+    subtitle: quote.customer.companyName,
+    description: quote.status,
+    relevanceScore: calculateRelevance(quote.quoteNumber, searchTerm) * 0.5 +
+      (quote.srplId && quote.srplId.toLowerCase().includes(searchTerm) ? 0.5 : 0),
+    matchText: toMatchText(quote.quoteNumber, quote.srplId),
+  }));
+};
+
+const searchInvoices: EntitySearcher = async (prisma, searchTerm, limit) => {
+  const invoices = await prisma.invoice.findMany({
+    where: {
+      OR: [
+        { invoiceNumber: { contains: searchTerm, mode: 'insensitive' } },
+        { srplId: { contains: searchTerm, mode: 'insensitive' } },
+      ],
+    },
+    take: limit,
+    select: {
+      id: true,
+      srplId: true,
+      invoiceNumber: true,
+      status: true,
+      customer: {
+        select: { companyName: true },
+      },
+    },
+  });
+
+  return invoices.map((invoice) => ({
+    id: invoice.id,
+    srplId: invoice.srplId,
+    type: 'invoice' as const,
+    title: invoice.invoiceNumber,
+    subtitle: invoice.customer.companyName,
+    description: invoice.status,
+    relevanceScore: calculateRelevance(invoice.invoiceNumber, searchTerm) * 0.5 +
+      (invoice.srplId && invoice.srplId.toLowerCase().includes(searchTerm) ? 0.5 : 0),
+    matchText: toMatchText(invoice.invoiceNumber, invoice.srplId),
+  }));
+};
+
+const ENTITY_SEARCHERS: Record<string, EntitySearcher> = {
+  lead: searchLeads,
+  customer: searchCustomers,
+  product: searchProducts,
+  deal: searchDeals,
+  quote: searchQuotes,
+  invoice: searchInvoices,
+};
 
-    for (const quote of quotes) {
-      const relevance = calculateRelevance(quote.quoteNumber, searchTerm) * 0.5 +
-        (quote.srplId && quote.srplId.toLowerCase().includes(searchTerm) ? 0.5 : 0);
-
-      results.push({
-        id: quote.id,
-        srplId: quote.srplId,
-        type: 'quote',
-        title: quote.quoteNumber,
-        subtitle: quote.customer.companyName,
-        description: quote.status,
-        relevanceScore: relevance,
-      });
-    }
-    } catch (error) {
-      console.error('Error searching quotes:', error);
-    }
-  }
+/**
+ * Resolves with the searcher's results, or `null` if it misses the deadline.
+ * The underlying query is not cancelled; its late result is simply discarded.
+ */
+function withDeadline<T>(promise: Promise<T>, timeoutMs: number): Promise<T | null> {
+  let timer: ReturnType<typeof setTimeout>;
+  const deadline = new Promise<null>((resolve) => {
+    timer = setTimeout(() => resolve(null), timeoutMs);
+  });
+  return Promise.race([promise, deadline]).finally(() => clearTimeout(timer));
+}
 
-  // Search Invoices
-  if (!entityTypes || entityTypes.includes('invoice')) {
-    try {
-      const invoices = await prisma.invoice.findMany({
-      where: {
-        OR: [
-          { invoiceNumber: { contains: searchTerm, mode: 'insensitive' } },
-          { srplId: { contains: searchTerm, mode: 'insensitive' } },
-        ],
-      },
-      take: limit,
-      select: {
-        id: true,
-        srplId: true,
-        invoiceNumber: true,
-        status: true,
-        customer: {
-          select: { companyName: true },
-        },
-      },
-    });
+/**
+ * Per-entity search fan-out: runs every requested entity query in parallel,
+ * each with its own deadline. Entities that miss the deadline or fail are
+ * reported so the caller can flag the response as incomplete.
+ */
+async function searchEntities(
+  prisma: PrismaClient,
+  searchTerm: string,
+  options: SearchOptions,
+): Promise<GlobalSearchOutcome> {
+  const { limit = 20, entityTypes, userId, entityTimeoutMs = DEFAULT_ENTITY_TIMEOUT_MS } = options;
+  const types = Object.keys(ENTITY_SEARCHERS).filter(
+    (type) => !entityTypes || entityTypes.includes(type),
+  );
 
-    for (const invoice of invoices) {
-      const relevance = calculateRelevance(invoice.invoiceNumber, searchTerm) * 0.5 +
-        (invoice.srplId && invoice.srplId.toLowerCase().includes(searchTerm) ? 0.5 : 0);
-
-      results.push({
-        id: invoice.id,
-        srplId: invoice.srplId,
-        type: 'invoice',
-        title: invoice.invoiceNumber,
-        subtitle: invoice.customer.companyName,
-        description: invoice.status,
-        relevanceScore: relevance,
-      });
-    }
-    } catch (error) {
-      console.error('Error searching invoices:', error);
-    }
-  }
+  const timings: Record<string, number> = {};
+  const timedOut: string[] = [];
+  const failed: string[] = [];
+
+  const perEntity = await Promise.all(
+    types.map(async (type) => {
+      const startedAt = performance.now();
+      try {
+        const found = await withDeadline(
+          ENTITY_SEARCHERS[type](prisma, searchTerm, limit, userId),
+          entityTimeoutMs,
+        );
+        if (found === null) {
+          timedOut.push(type);
+          return [] as SearchHit[];
+        }
+        return found;
+      } catch (error) {
+        console.error(`Error searching ${type}:`, error);
+        failed.push(type);
+        return [] as SearchHit[];
+      } finally {
+        timings[type] = performance.now() - startedAt;
+      }
+    }),
+  );
 
   // Sort by relevance and limit
-  return results
+  const hits = perEntity
+    .flat()
     .sort((a, b) => b.relevanceScore - a.relevanceScore)
     .slice(0, limit);
+
+  return {
+    ...splitHits(hits),
+    incomplete: timedOut.length > 0 || failed.length > 0,
+    timedOut,
+    failed,
+    timings,
+  };
 }
 
 /**
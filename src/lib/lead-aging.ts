@@ -52,6 +52,72 @@ export async function trackStageChange(
   }
 }
 
+/**
+ * Batch version of trackStageChange for moving many leads to the same stage:
+ * one query for the open stage entries, one UPDATE to close them and one
+ * createMany for the new entries
+ */
+export async function trackStageChanges(
+  prisma: PrismaClient,
+  leadIds: string[],
+  newStageId: string | null,
+  newStageName: string
+): Promise<void> {
+  if (leadIds.length === 0) return;
+
+  try {
+    const openAging = await prisma.leadStageAging.findMany({
+      where: {
+        leadId: { in: leadIds },
+        exitedAt: null,
+      },
+      orderBy: { enteredAt: 'desc' },
+      select: { id: true, leadId: true, stageName: true },
+    });
+
+    // Latest open entry per lead
+    const current = new Map<string, { id: string; stageName: string }>();
+    for (const aging of openAging) {
+      if (!current.has(aging.leadId)) current.set(aging.leadId, aging);
+    }
+
+    const toExit = Array.from(current.values())
+      .filter((aging) => aging.stageName !== newStageName)
+      .map((aging) => aging.id);
+    const toEnter = leadIds.filter((leadId) => {
+      const aging = current.get(leadId);
+      return !aging || aging.stageName !== newStageName;
+    });
+
+    const exitDate = new Date();
+    const enteredAt = new Date();
+    await prisma.$transaction([
+      // daysInStage differs per row, so compute it in SQL rather than per-row updates
+      ...(toExit.length > 0
+        ? [
+            prisma.$executeRaw`
+              UPDATE "LeadStageAging"
+              SET "exitedAt" = ${exitDate},
+                  "daysInStage" = FLOOR((${exitDate.getTime() / 1000}::float8 - EXTRACT(EPOCH FROM "enteredAt")) / 86400)::int
+              WHERE id = ANY(${toExit})
+            `,
+          ]
+        : []),
+      prisma.leadStageAging.createMany({
+        data: toEnter.map((leadId) => ({
+          leadId,
+          stageId: newStageId,
+          stageName: newStageName,
+          enteredAt,
+        })),
+      }),
+    ]);
+  } catch (error) {
+    // Best-effort aging - don't block workflow
+    console.error('Failed to track stage aging:', error);
+  }
+}
+
 /**
  * Get current aging information for a lead
  */
@@ -0,0 +1,352 @@
+import type { PrismaClient } from '@prisma/client';
+import { checkDuplicatesBatch, type DuplicateMatch } from './data-hygiene';
+import { reserveSRPLIdRange } from './srpl-id-generator';
+import { leadSchema, validateInput } from './validation';
+
+export type ImportFormat = 'csv' | 'ndjson';
+
+export const DEFAULT_IMPORT_CHUNK_SIZE = 1000;
+export const MAX_IMPORT_CHUNK_SIZE = 5000;
+
+// Keep the job row small; failedRows/duplicateRows still count every row
+const MAX_STORED_ERRORS = 1000;
+const MAX_STORED_DUPLICATES = 1000;
+
+export interface ImportRowError {
+  row: number;
+  message: string;
+}
+
+export interface ImportRowDuplicates {
+  row: number;
+  matches: DuplicateMatch[];
+}
+
+export interface LeadImportOptions {
+  format: ImportFormat;
+  chunkSize: number;
+  ownerId: string | null;
+  salesScope?: string | null;
+}
+
+// Accepted column names (case-insensitive) -> Lead field
+const LEAD_COLUMNS: Record<string, string> = {
+  companyname: 'companyName',
+  contactname: 'contactName',
+  email: 'email',
+  phone: 'phone',
+  status: 'status',
+  leadsource: 'source',
+  source: 'source',
+  country: 'country',
+  state: 'state',
+  city: 'city',
+  gstno: 'gstNo',
+  billingaddress: 'billingAddress',
+  shippingaddress: 'shippingAddress',
+  productinterest: 'productInterest',
+  application: 'application',
+  monthlyrequirement: 'monthlyRequirement',
+  notes: 'notes',
+};
+
+interface ParsedRow {
+  row: number;
+  values?: Record<string, unknown>;
+  error?: string;
+}
+
+/**
+ * Incremental RFC 4180 parser: accepts text in arbitrary chunks and returns
+ * completed records, so quoted fields may span chunk boundaries and lines
+ */
+class CsvRecordParser {
+  private field = '';
+  private record: string[] = [];
+  private inQuotes = false;
+  // Saw a quote inside a quoted field; the next character decides if it was escaped
+  private quotePending = false;
+  private records: string[][] = [];
+
+  push(text: string): string[][] {
+    for (let i = 0; i < text.length; i++) {
+      const ch = text[i];
+
+      if (this.quotePending) {
+        this.quotePending = false;
+        if (ch === '"') {
+          this.field += '"';
+          continue;
+        }
+        this.inQuotes = false;
+      } else if (this.inQuotes) {
+        if (ch === '"') {
+          this.quotePending = true;
+        } else {
+          this.field += ch;
+        }
+        continue;
+      }
+
+      if (ch === '"' && this.field === '') {
+        this.inQuotes = true;
+      } else if (ch === ',') {
+        this.record.push(this.field);
+        this.field = '';
+      } else if (ch === '\n') {
+        this.endRecord();
+      } else if (ch !== '\r') {
+        this.field += ch;
+      }
+    }
+    return this.drain();
+  }
+
+  flush(): string[][] {
+    this.quotePending = false;
+    this.inQuotes = false;
+    if (this.field !== '' || this.record.length > 0) {
+      this.endRecord();
+    }
+    return this.drain();
+  }
+
+  private endRecord() {
+    this.record.push(this.field);
+    // Skip blank lines
+    if (this.record.length > 1 || this.record[0].trim() !== '') {
+      this.records.push(this.record);
+    }
+    this.record = [];
+    this.field = '';
+  }
+
+  private drain(): string[][] {
+    const records = this.records;
+    this.records = [];
+    return records;
+  }
+}
+
+/**
+ * Map input keys to Lead fields, dropping unknown columns and blank values
+ */
+function toLeadValues(input: Record<string, unknown>): Record<string, unknown> {
+  const values: Record<string, unknown> = {};
+  for (const [key, value] of Object.entries(input)) {
+    const field = LEAD_COLUMNS[key.trim().toLowerCase()];
+    if (!field || value === null || value === undefined) continue;
+    const text = String(value).trim();
+    if (text !== '') values[field] = text;
+  }
+  return values;
+}
+
+/**
+ * Parse a CSV or NDJSON byte stream into rows, reporting bytes consumed as it goes.
+ * CSV rows are numbered from the header (row 1); NDJSON rows by line.
+ */
+async function* parseImportStream(
+  stream: ReadableStream<Uint8Array>,
+  format: ImportFormat,
+  onBytes: (bytes: number) => void,
+): AsyncGenerator<ParsedRow> {
+  const reader = stream.getReader();
+  const decoder = new TextDecoder();
+  const csv = new CsvRecordParser();
+  let header: string[] | null = null;
+  let pendingLine = '';
+  let row = 0;
+
+  const fromCsv = function* (records: string[][]): Generator<ParsedRow> {
+    for (const record of records) {
+      row++;
+      if (!header) {
+        header = record;
+        if (!header.some((column) => LEAD_COLUMNS[column.trim().toLowerCase()] === 'companyName')) {
+          throw new Error('CSV header must include a companyName column');
+        }
+        continue;
+      }
+      const input: Record<string, string> = {};
+      header.forEach((column, index) => {
+        input[column] = record[index] ?? '';
+      });
+      yield { row, values: toLeadValues(input) };
+    }
+  };
+
+  const fromNdjson = function* (lines: string[]): Generator<ParsedRow> {
+    for (const line of lines) {
+      row++;
+      if (line.trim() === '') continue;
+      try {
+        const parsed = JSON.parse(line);
+        if (!parsed || typeof parsed !== 'object' || Array.isArray(parsed)) {
+          yield { row, error: 'Expected a JSON object' };
+        } else {
+          yield { row, values: toLeadValues(parsed) };
+        }
+      } catch {
+        yield { row, error: 'Invalid JSON' };
+      }
+    }
+  };
+
+  try {
+    while (true) {
+      const { done, value } = await reader.read();
+      const text = done ? decoder.decode() : decoder.decode(value, { stream: true });
+
+      if (format === 'csv') {
+        yield* fromCsv(csv.push(text));
+        if (done) yield* fromCsv(csv.flush());
+      } else {
+        const lines = (pendingLine + text).split('\n');
+        pendingLine = done ? '' : lines.pop() ?? '';
+        yield* fromNdjson(lines);
+      }
+
+      if (value) onBytes(value.byteLength);
+      if (done) break;
+    }
+  } finally {
+    reader.releaseLock();
+  }
+}
+
+/**
+ * Validate one row against the lead create rules
+ */
+function validateRow(values: Record<string, unknown>, salesScope?: string | null) {
+  const validation = validateInput(leadSchema, { status: 'New', ...values });
+  if (!validation.success) {
+    return {
+      error: validation.error.errors.map((e) => `${e.path.join('.')}: ${e.message}`).join('; '),
+    };
+  }
+
+  const data = validation.data;
+  if (salesScope === 'domestic_sales' && data.country !== 'India') {
+    return { error: 'Domestic Sales users can only create leads for India' };
+  }
+  if (salesScope === 'export_sales' && data.country === 'India') {
+    return { error: 'Export Sales users can only create leads for countries other than India' };
+  }
+  return { data };
+}
+
+/**
+ * Import leads from a CSV or NDJSON stream into an existing ImportJob.
+ * Rows are validated, checked for duplicates with one batch lookup per chunk, and
+ * inserted with one createMany per chunk. The job row is updated after every chunk
+ * so clients can poll progress. If a chunk insert fails, its rows are retried one
+ * by one to isolate the bad rows.
+ */
+export async function runLeadImport(
+  prisma: PrismaClient,
+  jobId: string,
+  stream: ReadableStream<Uint8Array>,
+  options: LeadImportOptions,
+): Promise<void> {
+  const p = prisma as any;
+  const errors: ImportRowError[] = [];
+  const duplicates: ImportRowDuplicates[] = [];
+  const counters = { processedRows: 0, createdRows: 0, failedRows: 0, duplicateRows: 0, bytesProcessed: 0 };
+  let chunk: Array<{ row: number; data: Record<string, any> }> = [];
+
+  const recordError = (row: number, message: string) => {
+    counters.failedRows++;
+    if (errors.length < MAX_STORED_ERRORS) errors.push({ row, message });
+  };
+
+  const saveProgress = (extra: Record<string, unknown> = {}) =>
+    p.importJob.update({
+      where: { id: jobId },
+      data: {
+        ...counters,
+        errors: JSON.stringify(errors),
+        duplicates: JSON.stringify(duplicates),
+        ...extra,
+      },
+    });
+
+  const flushChunk = async () => {
+    if (chunk.length === 0) return;
+    const rows = chunk;
+    chunk = [];
+
+    // Report (but still import) rows matching existing leads/customers, checked before
+    // the insert so rows don't match themselves
+    const matches = await checkDuplicatesBatch(prisma, rows.map((r) => r.data));
+    matches.forEach((rowMatches, index) => {
+      if (rowMatches.length === 0) return;
+      counters.duplicateRows++;
+      if (duplicates.length < MAX_STORED_DUPLICATES) duplicates.push({ row: rows[index].row, matches: rowMatches });
+    });
+
+    // One counter round trip per chunk; the SRPL middleware leaves preset IDs alone
+    const { ids } = await reserveSRPLIdRange({ moduleCode: 'LEAD', prisma, count: rows.length });
+    const now = new Date();
+    const data = rows.map((r, index) => ({
+      ...r.data,
+      srplId: ids[index],
+      ownerId: options.ownerId,
+      lastActivityDate: now,
+    }));
+
+    try {
+      const result = await prisma.lead.createMany({ data });
+      counters.createdRows += result.count;
+    } catch (error) {
+      console.error(`Lead import ${jobId}: chunk insert failed, retrying rows individually:`, error);
+      for (let i = 0; i < rows.length; i++) {
+        try {
+          await prisma.lead.create({ data: data[i] });
+          counters.createdRows++;
+        } catch (rowError) {
+          recordError(rows[i].row, rowError instanceof Error ? rowError.message : 'Insert failed');
+        }
+      }
+    }
+
+    await saveProgress();
+  };
+
+  await p.importJob.update({ where: { id: jobId }, data: { status: 'running', startedAt: new Date() } });
+
+  try {
+    const rows = parseImportStream(stream, options.format, (bytes) => {
+      counters.bytesProcessed += bytes;
+    });
+
+    for await (const parsed of rows) {
+      counters.processedRows++;
+      if (parsed.error || !parsed.values) {
+        recordError(parsed.row, parsed.error || 'Empty row');
+        continue;
+      }
+
+      const { data, error } = validateRow(parsed.values, options.salesScope);
+      if (error || !data) {
+        recordError(parsed.row, error || 'Invalid row');
+        continue;
+      }
+
+      chunk.push({ row: parsed.row, data });
+      if (chunk.length >= options.chunkSize) {
+        await flushChunk();
+      }
+    }
+    await flushChunk();
+
+    await saveProgress({ status: 'completed', completedAt: new Date() });
+  } catch (error) {
+    console.error(`Lead import ${jobId} failed:`, error);
+    await saveProgress({
+      status: 'failed',
+      message: error instanceof Error ? error.message : 'Import failed',
+      completedAt: new Date(),
+    });
+  }
+}
@@ -26,6 +26,33 @@ const DEFAULT_TEMPERATURE_THRESHOLDS = {
   cold: 0,
 };
 
+// Relations the scoring rules read
+const SCORING_INCLUDE = {
+  owner: true,
+  quotes: {
+    select: { id: true, createdAt: true },
+    orderBy: { createdAt: 'desc' as const },
+  },
+  stageAging: {
+    orderBy: { enteredAt: 'desc' as const },
+    take: 1,
+  },
+};
+
+/**
+ * Load the active default scoring config, falling back to the built-in rules
+ */
+async function loadScoringConfig(prisma: PrismaClient): Promise<ScoringConfig> {
+  const defaultConfig = await prisma.leadScoringConfig.findFirst({
+    where: { isActive: true, isDefault: true },
+  });
+  if (defaultConfig) {
+    return JSON.parse(defaultConfig.rules) as ScoringConfig;
+  }
+  // Fallback to default scoring logic
+  return getDefaultScoringConfig();
+}
+
 /**
  * Calculate lead score based on configurable rules
  */
@@ -37,17 +64,7 @@ export async function calculateLeadScore(
   // Get the lead with related data
   const lead = await prisma.lead.findUnique({
     where: { id: leadId },
-    include: {
-      owner: true,
-      quotes: {
-        select: { id: true, createdAt: true },
-        orderBy: { createdAt: 'desc' },
-      },
-      stageAging: {
-        orderBy: { enteredAt: 'desc' },
-        take: 1,
-      },
-    },
+    include: SCORING_INCLUDE,
   });
 
   if (!lead) {
@@ -56,17 +73,19 @@ export async function calculateLeadScore(
 
   // Get active scoring config if not provided
   if (!config) {
-    const defaultConfig = await prisma.leadScoringConfig.findFirst({
-      where: { isActive: true, isDefault: true },
-    });
-    if (defaultConfig) {
-      config = JSON.parse(defaultConfig.rules) as ScoringConfig;
-    } else {
-      // Fallback to default scoring logic
-      config = getDefaultScoringConfig();
-    }
+    config = await loadScoringConfig(prisma);
   }
 
+  return scoreLead(lead, config);
+}
+
+/**
+ * Score an already-loaded lead (with SCORING_INCLUDE relations)
+ */
+function scoreLead(
+  lead: any,
+  config: ScoringConfig
+): { score: number; temperature: string; reason?: string } {
   const thresholds = config.temperatureThresholds || DEFAULT_TEMPERATURE_THRESHOLDS;
   let totalScore = 0;
   const reasons: string[] = [];
@@ -283,3 +302,60 @@ export async function updateLeadScore(
   }
 }
 
+
+/**
+ * Batch version of updateLeadScore for bulk actions: loads all leads and the config
+ * once, writes one updateMany per distinct (score, temperature) pair and the
+ * history rows with a single createMany
+ */
+export async function updateLeadScores(
+  prisma: PrismaClient,
+  leadIds: string[],
+  config?: ScoringConfig | null
+): Promise<void> {
+  if (leadIds.length === 0) return;
+
+  try {
+    const [leads, activeConfig] = await Promise.all([
+      prisma.lead.findMany({
+        where: { id: { in: leadIds } },
+        include: SCORING_INCLUDE,
+      }),
+      config ? Promise.resolve(config) : loadScoringConfig(prisma),
+    ]);
+
+    const results = leads.map((lead) => ({ leadId: lead.id, ...scoreLead(lead, activeConfig) }));
+
+    // Scores cluster on few values, so grouping keeps this to a handful of statements
+    const groups = new Map<string, { score: number; temperature: string; ids: string[] }>();
+    for (const result of results) {
+      const key = `${result.score}|${result.temperature}`;
+      const group = groups.get(key);
+      if (group) {
+        group.ids.push(result.leadId);
+      } else {
+        groups.set(key, { score: result.score, temperature: result.temperature, ids: [result.leadId] });
+      }
+    }
+
+    await prisma.$transaction([
+      ...Array.from(groups.values()).map((group) =>
+        prisma.lead.updateMany({
+          where: { id: { in: group.ids } },
+          data: { score: group.score, temperature: group.temperature },
+        })
+      ),
+      prisma.leadScoreHistory.createMany({
+        data: results.map((result) => ({
+          leadId: result.leadId,
+          score: result.score,
+          temperature: result.temperature,
+          reason: result.reason,
+        })),
+      }),
+    ]);
+  } catch (error) {
+    // Best-effort scoring - don't block workflow
+    console.error('Failed to update lead scores:', error);
+  }
+}
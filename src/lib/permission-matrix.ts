@@ -0,0 +1,210 @@
+import type { PrismaClient } from '@prisma/client';
+import { CACHE_TAGS, getCacheBackend, invalidateTags } from './cache';
+import type { FieldPermission } from './rbac';
+
+// How often a process checks the shared version stamp; between checks,
+// permission lookups never leave memory
+const VERSION_CHECK_INTERVAL_MS = 5 * 1000;
+// Reload at least this often whatever the stamp says. Without REDIS_URL the stamp
+// is per-process, so this bounds how long another instance's (or a script's)
+// permission changes go unseen; it also applies when the stamp can't be read.
+const MAX_MATRIX_AGE_MS = 30 * 1000;
+
+const SCOPE_BITS: Record<string, number> = {
+  own: 1,
+  team: 2,
+  all: 4,
+};
+
+interface PermissionRow {
+  role: string;
+  userId: string | null;
+  permission: { resource: string; action: string; scope: string; field: string | null };
+}
+
+const NO_FIELD_RESTRICTIONS: ReadonlyMap<string, FieldPermission> = new Map();
+
+/**
+ * Role and user permission grants compiled into one bitset per principal.
+ * Each (resource, action) pair gets a slot; a slot's bits are the scopes granted.
+ * Field-level grants are kept per principal and resource.
+ */
+export class PermissionMatrix {
+  private slots = new Map<string, number>();
+  private grants = new Map<string, Uint8Array>();
+  // principal -> resource -> field -> grant
+  private fieldGrants = new Map<string, Map<string, Map<string, FieldPermission>>>();
+  // `${role}:${resource}` -> merged field permissions, for users without their own grants
+  private compiledFields = new Map<string, ReadonlyMap<string, FieldPermission>>();
+
+  constructor(rows: PermissionRow[]) {
+    for (const row of rows) {
+      const key = `${row.permission.resource}:${row.permission.action}`;
+      if (!this.slots.has(key)) this.slots.set(key, this.slots.size);
+    }
+
+    for (const row of rows) {
+      const slot = this.slots.get(`${row.permission.resource}:${row.permission.action}`)!;
+      const bit = SCOPE_BITS[row.permission.scope] ?? 0;
+      this.grant(`role:${row.role}`, slot, bit);
+      if (row.userId) this.grant(`user:${row.userId}`, slot, bit);
+
+      if (row.permission.field) {
+        this.grantField(`role:${row.role}`, row.permission);
+        if (row.userId) this.grantField(`user:${row.userId}`, row.permission);
+      }
+    }
+  }
+
+  private grantField(principal: string, permission: PermissionRow['permission']) {
+    const field = permission.field!;
+    const action = permission.action;
+    let resources = this.fieldGrants.get(principal);
+    if (!resources) {
+      resources = new Map();
+      this.fieldGrants.set(principal, resources);
+    }
+    let fields = resources.get(permission.resource);
+    if (!fields) {
+      fields = new Map();
+      resources.set(permission.resource, fields);
+    }
+    const existing = fields.get(field) ?? { field, view: false, edit: false };
+    fields.set(field, {
+      field,
+      view: existing.view || action === 'view' || action === 'view_all' || action === 'edit_all',
+      edit: existing.edit || action === 'edit_all' || action === 'update',
+    });
+  }
+
+  private mergeFields(principals: string[], resource: string): ReadonlyMap<string, FieldPermission> {
+    const merged = new Map<string, FieldPermission>();
+    for (const principal of principals) {
+      const fields = this.fieldGrants.get(principal)?.get(resource);
+      if (!fields) continue;
+      for (const perm of fields.values()) {
+        const existing = merged.get(perm.field);
+        merged.set(perm.field, {
+          field: perm.field,
+          view: perm.view || !!existing?.view,
+          edit: perm.edit || !!existing?.edit,
+        });
+      }
+    }
+    return merged.size > 0 ? merged : NO_FIELD_RESTRICTIONS;
+  }
+
+  /**
+   * Field permissions of a role (plus the user's own grants, if any) on a resource.
+   * A field is viewable/editable if any grant allows it. The returned map is
+   * shared and must not be modified; it is the same object for every call with
+   * the same role and resource while this matrix is current.
+   */
+  fieldPermissions(role: string, userId: string, resource: string): ReadonlyMap<string, FieldPermission> {
+    const principals = [`role:${role}`, `user:${userId}`];
+    if (this.fieldGrants.get(principals[1])?.has(resource)) {
+      return this.mergeFields(principals, resource);
+    }
+
+    const key = `${role}:${resource}`;
+    let compiled = this.compiledFields.get(key);
+    if (!compiled) {
+      compiled = this.mergeFields(principals.slice(0, 1), resource);
+      this.compiledFields.set(key, compiled);
+    }
+    return compiled;
+  }
+
+  private grant(principal: string, slot: number, bit: number) {
+    let bits = this.grants.get(principal);
+    if (!bits) {
+      bits = new Uint8Array(this.slots.size);
+      this.grants.set(principal, bits);
+    }
+    bits[slot] |= bit;
+  }
+
+  /**
+   * Whether the role/user principal holds the action at `scope` or at 'all'
+   */
+  allows(principal: string, resource: string, action: string, scope: string): boolean {
+    const slot = this.slots.get(`${resource}:${action}`);
+    const bits = slot === undefined ? undefined : this.grants.get(principal);
+    if (!bits || slot === undefined) return false;
+    return (bits[slot] & ((SCOPE_BITS[scope] ?? 0) | SCOPE_BITS.all)) !== 0;
+  }
+}
+
+let matrix: PermissionMatrix | null = null;
+let loadedVersion: number | null = null;
+let loadedAt = 0;
+let checkedAt = 0;
+let loading: Promise<PermissionMatrix> | null = null;
+// Bumped by local invalidation so loads started before a write are discarded
+let generation = 0;
+
+async function currentVersion(): Promise<number | null> {
+  try {
+    const versions = await getCacheBackend().getTagVersions([CACHE_TAGS.PERMISSIONS]);
+    return versions[CACHE_TAGS.PERMISSIONS] ?? 0;
+  } catch (error) {
+    console.error('Permission version check failed:', error);
+    return null;
+  }
+}
+
+/**
+ * The compiled permission matrix, loaded once per process and reloaded when the
+ * shared version stamp changes (checked at most every few seconds) or when it
+ * reaches its maximum age
+ */
+export async function getPermissionMatrix(prisma: PrismaClient): Promise<PermissionMatrix> {
+  const fresh = matrix !== null && Date.now() - loadedAt < MAX_MATRIX_AGE_MS;
+  if (fresh && Date.now() - checkedAt < VERSION_CHECK_INTERVAL_MS) return matrix!;
+
+  // Snapshot the version before loading: a write during the load leaves us stale,
+  // so the next check reloads
+  const version = await currentVersion();
+  checkedAt = Date.now();
+  // If the version can't be read, keep serving what we have until it expires
+  if (fresh && (version === null || version === loadedVersion)) return matrix!;
+
+  if (!loading) {
+    const p: any = prisma;
+    const loadGeneration = generation;
+    const startedAt = Date.now();
+    loading = p.rolePermission
+      .findMany({
+        select: {
+          role: true,
+          userId: true,
+          permission: { select: { resource: true, action: true, scope: true, field: true } },
+        },
+      })
+      .then((rows: any[]) => {
+        const compiled = new PermissionMatrix(rows);
+        if (loadGeneration === generation) {
+          matrix = compiled;
+          loadedVersion = version;
+          loadedAt = startedAt;
+        }
+        return compiled;
+      })
+      .finally(() => {
+        if (loadGeneration === generation) loading = null;
+      });
+  }
+  return loading!;
+}
+
+/**
+ * Bump the permission version stamp after permission or role-permission writes.
+ * This process reloads on its next check; other processes within the check
+ * interval when the stamp is shared (REDIS_URL), otherwise at the maximum age.
+ */
+export async function invalidatePermissionMatrix(): Promise<void> {
+  generation++;
+  matrix = null;
+  loading = null;
+  await invalidateTags([CACHE_TAGS.PERMISSIONS]);
+}
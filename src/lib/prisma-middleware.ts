@@ -1,6 +1,7 @@
 import { Prisma } from '@prisma/client';
 import { getPrismaClient } from './prisma';
-import { generateSRPLId, ModuleCode } from './srpl-id-generator';
+import { generateSRPLId, reserveSRPLIdRange, ModuleCode } from './srpl-id-generator';
+import { invalidateSearchCache } from './search-cache';
 
 // Map Prisma model names to module codes
 const MODEL_TO_MODULE_CODE: Record<string, ModuleCode> = {
@@ -47,19 +48,21 @@ export function setupSRPLIdMiddleware(prisma: any) {
     if (params.action === 'createMany' && MODEL_TO_MODULE_CODE[params.model]) {
       const moduleCode = MODEL_TO_MODULE_CODE[params.model];
       
-      // For createMany, we need to generate IDs for each record
+      // For createMany, reserve one contiguous range for all records missing an ID
       if (Array.isArray(params.args.data)) {
-        for (const record of params.args.data) {
-          if (!record.srplId) {
-            try {
-              const srplId = await generateSRPLId({
-                moduleCode,
-                prisma,
-              });
-              record.srplId = srplId;
-            } catch (error) {
-              console.error(`Failed to generate SRPL ID for ${params.model}:`, error);
-            }
+        const pending = params.args.data.filter((record: any) => !record.srplId);
+        if (pending.length > 0) {
+          try {
+            const { ids } = await reserveSRPLIdRange({
+              moduleCode,
+              prisma,
+              count: pending.length,
+            });
+            pending.forEach((record: any, index: number) => {
+              record.srplId = ids[index];
+            });
+          } catch (error) {
+            console.error(`Failed to generate SRPL IDs for ${params.model}:`, error);
           }
         }
       }
@@ -69,3 +72,22 @@ export function setupSRPLIdMiddleware(prisma: any) {
   });
 }
 
+// Models whose rows appear in global search results
+const SEARCHABLE_MODELS = new Set(['Lead', 'Customer', 'Product', 'Deal', 'Quote', 'Invoice']);
+
+const WRITE_ACTIONS = new Set(['create', 'createMany', 'update', 'updateMany', 'upsert', 'delete', 'deleteMany']);
+
+/**
+ * Sets up Prisma middleware to invalidate the global search cache after writes to searchable models
+ */
+export function setupSearchCacheInvalidation(prisma: any) {
+  prisma.$use(async (params: any, next: any) => {
+    const result = await next(params);
+
+    if (SEARCHABLE_MODELS.has(params.model) && WRITE_ACTIONS.has(params.action)) {
+      invalidateSearchCache();
+    }
+
+    return result;
+  });
+}
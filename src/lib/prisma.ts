@@ -25,6 +25,14 @@ export async function getPrismaClient() {
       // Do not fail Prisma initialization if middleware wiring has an issue
     }
 
+    // Drop cached global search results whenever searchable entities change
+    try {
+      const { setupSearchCacheInvalidation } = await import('./prisma-middleware');
+      setupSearchCacheInvalidation(prismaSingleton);
+    } catch (error) {
+      console.error('Failed to initialize search cache invalidation middleware:', error);
+    }
+
     // Initialize sequence counters on first connection
     try {
       const { initializeSequenceCounters } = await import('./srpl-id-generator');
@@ -1,4 +1,4 @@
-import type { PrismaClient } from '@prisma/client';
+import { Prisma, type PrismaClient } from '@prisma/client';
 
 export interface ProductAnalyticsFilters {
   startDate?: Date;
@@ -48,290 +48,373 @@ export interface ProductTimeSeriesData {
   revenue: number;
 }
 
+export interface ProductConversionData {
+  productId: string;
+  productName: string;
+  productSku?: string | null;
+  funnel: {
+    leads: number;
+    deals: number;
+    quotes: number;
+    salesOrders: number;
+    invoices: number;
+  };
+  conversionRates: {
+    leadToDeal: number;
+    dealToQuote: number;
+    quoteToSO: number;
+    soToInvoice: number;
+    overall: number;
+  };
+}
+
+export interface ProductSalesTrendPoint {
+  period: string; // 'YYYY-MM' or 'YYYY-QX'
+  quantity: number;
+  revenue: number;
+  invoiceCount: number;
+}
+
+type LineItemSource = 'deal' | 'quote' | 'salesOrder' | 'invoice';
+
+interface LineItemTable {
+  itemTable: string;
+  documentTable: string;
+  foreignKey: string;
+  dateColumn: string;
+  hasSalesRep: boolean;
+  hasPrice: boolean;
+}
+
+const LINE_ITEM_TABLES: Record<LineItemSource, LineItemTable> = {
+  deal: { itemTable: 'DealItem', documentTable: 'Deal', foreignKey: 'dealId', dateColumn: 'createdAt', hasSalesRep: false, hasPrice: false },
+  quote: { itemTable: 'QuoteItem', documentTable: 'Quote', foreignKey: 'quoteId', dateColumn: 'issueDate', hasSalesRep: true, hasPrice: true },
+  salesOrder: { itemTable: 'SalesOrderItem', documentTable: 'SalesOrder', foreignKey: 'salesOrderId', dateColumn: 'orderDate', hasSalesRep: true, hasPrice: true },
+  // Invoice has no salesRepId; it is not filtered by rep (same as before)
+  invoice: { itemTable: 'InvoiceItem', documentTable: 'Invoice', foreignKey: 'invoiceId', dateColumn: 'issueDate', hasSalesRep: false, hasPrice: true },
+};
+
+interface LineItemAggregate {
+  documentCount: number;
+  quantity: number;
+  revenue: number;
+}
+
 /**
- * Aggregates product demand across all modules (Leads, Deals, Quotes, SO, Invoices)
+ * Sum quantity/revenue and count distinct documents per product for one line item table
  */
-export async function getProductDemand(
+async function aggregateLineItems(
   prisma: PrismaClient,
-  filters: ProductAnalyticsFilters = {},
-): Promise<ProductDemandData[]> {
+  source: LineItemSource,
+  filters: ProductAnalyticsFilters,
+): Promise<Map<string, LineItemAggregate>> {
+  const { itemTable, documentTable, foreignKey, dateColumn, hasSalesRep, hasPrice } = LINE_ITEM_TABLES[source];
   const { startDate, endDate, customerType, salesRepId, productId } = filters;
 
-  // Build base where clauses
-  const leadWhere: any = {};
-  const dealWhere: any = {};
-  const quoteWhere: any = {};
-  const soWhere: any = {};
-  const invoiceWhere: any = {};
+  // Identifiers come from the constant table map above, never from input
+  const item = Prisma.raw(`"${itemTable}"`);
+  const document = Prisma.raw(`"${documentTable}"`);
+  const fk = Prisma.raw(`"${foreignKey}"`);
+  const date = Prisma.raw(`d."${dateColumn}"`);
+
+  const conditions: Prisma.Sql[] = [];
+  if (productId) conditions.push(Prisma.sql`i."productId" = ${productId}`);
+  if (startDate) conditions.push(Prisma.sql`${date} >= ${startDate}`);
+  if (endDate) conditions.push(Prisma.sql`${date} <= ${endDate}`);
+  if (customerType) conditions.push(Prisma.sql`c."customerType" = ${customerType}`);
+  if (salesRepId && hasSalesRep) conditions.push(Prisma.sql`d."salesRepId" = ${salesRepId}`);
+
+  const revenue = hasPrice
+    ? Prisma.sql`COALESCE(SUM(i."unitPrice" * i.quantity * (1 - COALESCE(i."discountPct", 0) / 100)), 0)::float8`
+    : Prisma.sql`0::float8`;
+
+  const rows: Array<{ productId: string } & LineItemAggregate> = await prisma.$queryRaw`
+    SELECT
+      i."productId" AS "productId",
+      COUNT(DISTINCT i.${fk})::int AS "documentCount",
+      COALESCE(SUM(i.quantity), 0)::float8 AS "quantity",
+      ${revenue} AS "revenue"
+    FROM ${item} i
+    JOIN ${document} d ON d.id = i.${fk}
+    ${customerType ? Prisma.sql`JOIN "Customer" c ON c.id = d."customerId"` : Prisma.empty}
+    ${conditions.length > 0 ? Prisma.sql`WHERE ${Prisma.join(conditions, ' AND ')}` : Prisma.empty}
+    GROUP BY i."productId"
+  `;
+
+  return new Map(rows.map(({ productId: id, ...aggregate }) => [id, aggregate]));
+}
+
+/**
+ * Count interested leads and sum their monthly requirement per product,
+ * using the normalized LeadProductInterest table (one row per lead/product)
+ */
+async function aggregateLeadInterest(
+  prisma: PrismaClient,
+  filters: ProductAnalyticsFilters,
+): Promise<Map<string, { leadCount: number; leadQuantity: number }>> {
+  const { startDate, endDate, productId } = filters;
 
+  // Lead has no customerType column, so that filter does not apply to lead demand
+  const leadWhere: any = {};
   if (startDate || endDate) {
-    const dateFilter: any = {};
-    if (startDate) dateFilter.gte = startDate;
-    if (endDate) dateFilter.lte = endDate;
-    leadWhere.createdAt = dateFilter;
-    dealWhere.createdAt = dateFilter;
-    quoteWhere.issueDate = dateFilter;
-    soWhere.orderDate = dateFilter;
-    invoiceWhere.issueDate = dateFilter;
+    leadWhere.createdAt = {};
+    if (startDate) leadWhere.createdAt.gte = startDate;
+    if (endDate) leadWhere.createdAt.lte = endDate;
   }
 
-  if (customerType) {
-    leadWhere.customerType = customerType;
-    dealWhere.customer = { customerType };
-    quoteWhere.customer = { customerType };
-    soWhere.customer = { customerType };
-    invoiceWhere.customer = { customerType };
-  }
+  const groups = await prisma.leadProductInterest.groupBy({
+    by: ['productId'],
+    where: {
+      ...(productId && { productId }),
+      ...(Object.keys(leadWhere).length > 0 && { lead: leadWhere }),
+    },
+    _count: { _all: true },
+    _sum: { monthlyRequirement: true },
+  });
 
-  if (salesRepId) {
-    // Deal doesn't have ownerId, but we can filter via customer's owner if needed
-    // For now, we'll skip deal filtering by salesRepId
-    quoteWhere.salesRepId = salesRepId;
-    soWhere.salesRepId = salesRepId;
-    // Invoice might not have salesRepId directly, but can trace via salesOrder
-  }
+  return new Map(
+    groups.map((group) => [
+      group.productId,
+      { leadCount: group._count._all, leadQuantity: group._sum.monthlyRequirement ?? 0 },
+    ]),
+  );
+}
+
+/**
+ * Aggregates product demand across all modules (Leads, Deals, Quotes, SO, Invoices).
+ * Runs one grouped query per source table, independent of the number of products.
+ */
+export async function getProductDemand(
+  prisma: PrismaClient,
+  filters: ProductAnalyticsFilters = {},
+): Promise<ProductDemandData[]> {
+  const { productId } = filters;
 
   // Fetch all products (or specific product)
   const products = await prisma.product.findMany({
     where: productId ? { id: productId } : {},
-    select: { id: true, name: true, sku: true },
+    select: { id: true, name: true, sku: true, unitPrice: true },
   });
 
-  const results: ProductDemandData[] = [];
-
-  for (const product of products) {
-    // 1. Aggregate from Leads (productInterest JSON)
-    const leads = await prisma.lead.findMany({
-      where: {
-        ...leadWhere,
-        productInterest: { not: null },
-      },
-      select: { id: true, productInterest: true, monthlyRequirement: true },
-    });
-
-    let leadCount = 0;
-    let leadQuantity = 0;
-
-    for (const lead of leads) {
-      if (!lead.productInterest) continue;
-      try {
-        const products = JSON.parse(lead.productInterest);
-        if (Array.isArray(products)) {
-          const hasProduct = products.some((p: any) => p.productId === product.id);
-          if (hasProduct) {
-            leadCount++;
-            const productEntry = products.find((p: any) => p.productId === product.id);
-            if (productEntry?.monthlyRequirement) {
-              const qty = parseFloat(productEntry.monthlyRequirement) || 0;
-              leadQuantity += qty;
-            }
-          }
-        }
-      } catch {
-        // Legacy: treat as string product name match
-        if (lead.productInterest === product.name || lead.productInterest === product.id) {
-          leadCount++;
-          if (lead.monthlyRequirement) {
-            leadQuantity += parseFloat(lead.monthlyRequirement) || 0;
-          }
-        }
-      }
-    }
-
-    // 2. Aggregate from Deals
-    const dealItems = await prisma.dealItem.findMany({
-      where: {
-        productId: product.id,
-        deal: dealWhere,
-      },
-      include: {
-        deal: {
-          select: { id: true, stage: true },
-        },
-      },
-    });
-
-    const dealCount = new Set(dealItems.map((item) => item.dealId)).size;
-    const dealQuantity = dealItems.reduce((sum, item) => sum + Number(item.quantity), 0);
-
-    // 3. Aggregate from Quotes
-    const quoteItems = await prisma.quoteItem.findMany({
-      where: {
-        productId: product.id,
-        quote: quoteWhere,
-      },
-      include: {
-        quote: {
-          select: { id: true, status: true },
-        },
-      },
-    });
-
-    const quoteCount = new Set(quoteItems.map((item) => item.quoteId)).size;
-    const quoteQuantity = quoteItems.reduce((sum, item) => sum + item.quantity, 0);
+  if (products.length === 0) return [];
 
-    // 4. Aggregate from Sales Orders
-    const soItems = await prisma.salesOrderItem.findMany({
-      where: {
-        productId: product.id,
-        salesOrder: soWhere,
-      },
-      include: {
-        salesOrder: {
-          select: { id: true, status: true },
-        },
-      },
-    });
+  const [leadTotals, dealTotals, quoteTotals, soTotals, invoiceTotals] = await Promise.all([
+    aggregateLeadInterest(prisma, filters),
+    aggregateLineItems(prisma, 'deal', filters),
+    aggregateLineItems(prisma, 'quote', filters),
+    aggregateLineItems(prisma, 'salesOrder', filters),
+    aggregateLineItems(prisma, 'invoice', filters),
+  ]);
 
-    const salesOrderCount = new Set(soItems.map((item) => item.salesOrderId)).size;
-    const salesOrderQuantity = soItems.reduce((sum, item) => sum + item.quantity, 0);
+  const empty: LineItemAggregate = { documentCount: 0, quantity: 0, revenue: 0 };
 
-    // 5. Aggregate from Invoices (actual sales)
-    const invoiceItems = await prisma.invoiceItem.findMany({
-      where: {
-        productId: product.id,
-        invoice: invoiceWhere,
-      },
-      include: {
-        invoice: {
-          select: { id: true, status: true },
-        },
-      },
-    });
-
-    const invoiceCount = new Set(invoiceItems.map((item) => item.invoiceId)).size;
-    const invoiceQuantity = invoiceItems.reduce((sum, item) => sum + item.quantity, 0);
+  return products.map((product) => {
+    const { leadCount, leadQuantity } = leadTotals.get(product.id) ?? { leadCount: 0, leadQuantity: 0 };
+    const deals = dealTotals.get(product.id) ?? empty;
+    const quotes = quoteTotals.get(product.id) ?? empty;
+    const salesOrders = soTotals.get(product.id) ?? empty;
+    const invoices = invoiceTotals.get(product.id) ?? empty;
 
     // Calculate metrics
-    const totalDemandQuantity = leadQuantity + dealQuantity + quoteQuantity + salesOrderQuantity;
-    const totalSoldQuantity = invoiceQuantity;
+    const totalDemandQuantity = leadQuantity + deals.quantity + quotes.quantity + salesOrders.quantity;
+    const totalSoldQuantity = invoices.quantity;
     const conversionRate = leadQuantity > 0 ? (totalSoldQuantity / leadQuantity) * 100 : 0;
 
-    // Calculate average deal size (using product unitPrice as estimate)
     // Note: DealItem doesn't store unitPrice, so we use Product.unitPrice as approximation
-    const product = await prisma.product.findUnique({
-      where: { id: product.id },
-      select: { unitPrice: true },
-    });
-
     const avgDealSize =
-      dealCount > 0 && product
-        ? (dealQuantity * Number(product.unitPrice || 0)) / dealCount
+      deals.documentCount > 0
+        ? (deals.quantity * Number(product.unitPrice || 0)) / deals.documentCount
         : 0;
 
-    const totalRevenue = invoiceItems.reduce((sum, item) => {
-      const price = Number(item.unitPrice) || 0;
-      const qty = item.quantity;
-      const discount = (item.discountPct || 0) / 100;
-      return sum + price * qty * (1 - discount);
-    }, 0);
-
-    results.push({
+    return {
       productId: product.id,
       productName: product.name,
       productSku: product.sku,
       leadCount,
       leadQuantity,
-      dealCount,
-      dealQuantity,
-      quoteCount,
-      quoteQuantity,
-      salesOrderCount,
-      salesOrderQuantity,
-      invoiceCount,
-      invoiceQuantity,
+      dealCount: deals.documentCount,
+      dealQuantity: deals.quantity,
+      quoteCount: quotes.documentCount,
+      quoteQuantity: quotes.quantity,
+      salesOrderCount: salesOrders.documentCount,
+      salesOrderQuantity: salesOrders.quantity,
+      invoiceCount: invoices.documentCount,
+      invoiceQuantity: invoices.quantity,
       totalDemandQuantity,
       totalSoldQuantity,
       conversionRate: isNaN(conversionRate) ? 0 : conversionRate,
       avgDealSize,
-      totalRevenue,
-    });
-  }
-
-  return results;
+      totalRevenue: invoices.revenue,
+    };
+  });
 }
 
 /**
- * Get time-series data for products (monthly or quarterly)
+ * Conversion funnel per product (Leads -> Deals -> Quotes -> SO -> Invoices)
  */
-export async function getProductTimeSeries(
+export async function getProductConversion(
   prisma: PrismaClient,
-  filters: ProductAnalyticsFilters & { groupBy: 'month' | 'quarter' } = { groupBy: 'month' },
-): Promise<ProductTimeSeriesData[]> {
-  const { startDate, endDate, groupBy, productId } = filters;
+  filters: Pick<ProductAnalyticsFilters, 'startDate' | 'endDate' | 'productId'> = {},
+): Promise<ProductConversionData[]> {
+  const products = await prisma.product.findMany({
+    where: filters.productId ? { id: filters.productId } : {},
+    select: { id: true, name: true, sku: true },
+  });
+
+  if (products.length === 0) return [];
+
+  const [leadTotals, dealTotals, quoteTotals, soTotals, invoiceTotals] = await Promise.all([
+    aggregateLeadInterest(prisma, filters),
+    aggregateLineItems(prisma, 'deal', filters),
+    aggregateLineItems(prisma, 'quote', filters),
+    aggregateLineItems(prisma, 'salesOrder', filters),
+    aggregateLineItems(prisma, 'invoice', filters),
+  ]);
+
+  const rate = (numerator: number, denominator: number) => {
+    const value = denominator > 0 ? (numerator / denominator) * 100 : 0;
+    return isNaN(value) ? 0 : value;
+  };
+
+  return products.map((product) => {
+    const leads = leadTotals.get(product.id)?.leadCount ?? 0;
+    const deals = dealTotals.get(product.id)?.documentCount ?? 0;
+    const quotes = quoteTotals.get(product.id)?.documentCount ?? 0;
+    const salesOrders = soTotals.get(product.id)?.documentCount ?? 0;
+    const invoices = invoiceTotals.get(product.id)?.documentCount ?? 0;
+
+    return {
+      productId: product.id,
+      productName: product.name,
+      productSku: product.sku,
+      funnel: { leads, deals, quotes, salesOrders, invoices },
+      conversionRates: {
+        leadToDeal: rate(deals, leads),
+        dealToQuote: rate(quotes, deals),
+        quoteToSO: rate(salesOrders, quotes),
+        soToInvoice: rate(invoices, salesOrders),
+        overall: rate(invoices, leads),
+      },
+    };
+  });
+}
+
+type TimeSeriesFilters = ProductAnalyticsFilters & { groupBy: 'month' | 'quarter' };
+
+/**
+ * WHERE clause and period bucket for reads from the ProductSalesRollup table.
+ * Rollups are monthly, so the range is widened to whole months.
+ */
+function buildRollupQuery(filters: TimeSeriesFilters) {
+  const { startDate, endDate, groupBy, productId, customerType } = filters;
 
   // Default to last 12 months if no date range
   const now = new Date();
-  const defaultStart = new Date(now.getFullYear(), now.getMonth() - 12, 1);
-  const actualStart = startDate || defaultStart;
+  const actualStart = startDate || new Date(now.getFullYear(), now.getMonth() - 12, 1);
   const actualEnd = endDate || now;
 
-  const formatPeriod = (date: Date): string => {
-    if (groupBy === 'quarter') {
-      const quarter = Math.floor(date.getMonth() / 3) + 1;
-      return `${date.getFullYear()}-Q${quarter}`;
-    }
-    return `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
-  };
+  const conditions: Prisma.Sql[] = [
+    Prisma.sql`r."period" >= date_trunc('month', ${actualStart}::timestamp)::date`,
+    Prisma.sql`r."period" <= ${actualEnd}::date`,
+  ];
+  if (productId) conditions.push(Prisma.sql`r."productId" = ${productId}`);
+  if (customerType) conditions.push(Prisma.sql`r."customerType" = ${customerType}`);
 
-  // Fetch products
-  const products = await prisma.product.findMany({
-    where: productId ? { id: productId } : {},
-    select: { id: true, name: true },
-  });
+  const period = groupBy === 'quarter'
+    ? Prisma.sql`to_char(r."period", 'YYYY-"Q"Q')`
+    : Prisma.sql`to_char(r."period", 'YYYY-MM')`;
 
-  const results: ProductTimeSeriesData[] = [];
-
-  for (const product of products) {
-    // Aggregate by period from Invoices (actual sales)
-    const invoiceItems = await prisma.invoiceItem.findMany({
-      where: {
-        productId: product.id,
-        invoice: {
-          issueDate: {
-            gte: actualStart,
-            lte: actualEnd,
-          },
-        },
-      },
-      include: {
-        invoice: {
-          select: { id: true, issueDate: true },
-        },
-      },
-    });
-
-    // Group by period
-    const periodMap: Record<string, ProductTimeSeriesData> = {};
-
-    for (const item of invoiceItems) {
-      const period = formatPeriod(item.invoice.issueDate);
-      if (!periodMap[period]) {
-        periodMap[period] = {
-          period,
-          productId: product.id,
-          productName: product.name,
-          leadCount: 0,
-          dealCount: 0,
-          quoteCount: 0,
-          salesOrderCount: 0,
-          invoiceCount: 0,
-          quantity: 0,
-          revenue: 0,
-        };
-      }
-
-      periodMap[period].invoiceCount++;
-      periodMap[period].quantity += item.quantity;
-      const price = Number(item.unitPrice) || 0;
-      const discount = (item.discountPct || 0) / 100;
-      periodMap[period].revenue += price * item.quantity * (1 - discount);
-    }
+  return { where: Prisma.join(conditions, ' AND '), period };
+}
 
-    results.push(...Object.values(periodMap));
-  }
+/**
+ * Get time-series data for products (monthly or quarterly), read from the
+ * ProductSalesRollup table so cost depends on the number of periods, not invoices
+ */
+export async function getProductTimeSeries(
+  prisma: PrismaClient,
+  filters: TimeSeriesFilters = { groupBy: 'month' },
+): Promise<ProductTimeSeriesData[]> {
+  const { where, period } = buildRollupQuery(filters);
+
+  const rows: Array<{
+    period: string;
+    productId: string;
+    productName: string;
+    invoiceCount: number;
+    quantity: number;
+    revenue: number;
+  }> = await prisma.$queryRaw`
+    SELECT
+      ${period} AS "period",
+      r."productId" AS "productId",
+      p."name" AS "productName",
+      SUM(r."orderCount")::int AS "invoiceCount",
+      SUM(r."quantity")::float8 AS "quantity",
+      SUM(r."revenue")::float8 AS "revenue"
+    FROM "ProductSalesRollup" r
+    JOIN "Product" p ON p."id" = r."productId"
+    WHERE ${where}
+    GROUP BY 1, r."productId", p."name"
+    ORDER BY 1, r."productId"
+  `;
+
+  return rows.map((row) => ({
+    ...row,
+    leadCount: 0,
+    dealCount: 0,
+    quoteCount: 0,
+    salesOrderCount: 0,
+  }));
+}
 
-  return results.sort((a, b) => a.period.localeCompare(b.period));
+/**
+ * Sales quantity/revenue per period summed across products (dashboard trend line)
+ */
+export async function getProductSalesTrend(
+  prisma: PrismaClient,
+  filters: TimeSeriesFilters = { groupBy: 'month' },
+): Promise<ProductSalesTrendPoint[]> {
+  const { where, period } = buildRollupQuery(filters);
+
+  return prisma.$queryRaw`
+    SELECT
+      ${period} AS "period",
+      SUM(r."orderCount")::int AS "invoiceCount",
+      SUM(r."quantity")::float8 AS "quantity",
+      SUM(r."revenue")::float8 AS "revenue"
+    FROM "ProductSalesRollup" r
+    WHERE ${where}
+    GROUP BY 1
+    ORDER BY 1
+  `;
+}
+
+/**
+ * Recompute the ProductSalesRollup table from invoice items.
+ * Triggers keep it current; this is for recovery after bulk fixes or trigger changes.
+ */
+export async function rebuildProductSalesRollups(prisma: PrismaClient): Promise<number> {
+  const [, inserted] = await prisma.$transaction([
+    prisma.$executeRaw`DELETE FROM "ProductSalesRollup"`,
+    prisma.$executeRaw`
+      INSERT INTO "ProductSalesRollup" ("productId", "period", "customerType", "quantity", "revenue", "orderCount", "updatedAt")
+      SELECT
+        i."productId",
+        date_trunc('month', inv."issueDate")::date,
+        c."customerType",
+        SUM(i."quantity"),
+        SUM(i."unitPrice" * i."quantity" * (1 - COALESCE(i."discountPct", 0) / 100)),
+        COUNT(DISTINCT inv."id"),
+        NOW()
+      FROM "InvoiceItem" i
+      JOIN "Invoice" inv ON inv."id" = i."invoiceId"
+      JOIN "Customer" c ON c."id" = inv."customerId"
+      GROUP BY i."productId", date_trunc('month', inv."issueDate")::date, c."customerType"
+    `,
+  ]);
+
+  return inserted;
 }
 
 /**
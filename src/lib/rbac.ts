@@ -1,5 +1,7 @@
 import type { PrismaClient } from '@prisma/client';
 import type { AuthContext } from './auth';
+import { getPermissionMatrix } from './permission-matrix';
+import { getTeamMemberIds } from './team-hierarchy';
 
 export type PermissionScope = 'own' | 'team' | 'all';
 export type PermissionAction = 'view' | 'create' | 'update' | 'delete' | 'view_all' | 'edit_all';
@@ -12,7 +14,8 @@ export interface FieldPermission {
 }
 
 /**
- * RBAC utility: Check if user has permission for a resource/action
+ * RBAC utility: Check if user has permission for a resource/action.
+ * Answered from the in-memory permission matrix (see permission-matrix.ts).
  */
 export async function hasPermission(
   prisma: PrismaClient,
@@ -26,8 +29,6 @@ export async function hasPermission(
   // Admin always has all permissions
   if (auth.role === 'admin') return true;
 
-  const p: any = prisma;
-
   // For users with salesScope, check permissions based on their sales scope role
   // Map salesScope to role for permission checking
   let permissionRole = auth.role;
@@ -37,88 +38,73 @@ export async function hasPermission(
     permissionRole = 'domestic_sales';
   }
 
-  // Check role-based permissions
-  const rolePerm = await p.rolePermission.findFirst({
-    where: {
-      role: permissionRole,
-      permission: {
-        resource,
-        action,
-        scope: { in: [scope, 'all'] }, // 'all' scope grants access to all scopes
-      },
-    },
-  });
-
-  if (rolePerm) return true;
-
-  // Check user-specific permissions (if any)
-  const userPerm = await p.rolePermission.findFirst({
-    where: {
-      userId: auth.userId,
-      permission: {
-        resource,
-        action,
-        scope: { in: [scope, 'all'] },
-      },
-    },
-  });
+  const matrix = await getPermissionMatrix(prisma);
 
-  return !!userPerm;
+  // Check role-based permissions, then user-specific permissions (if any);
+  // 'all' scope grants access to all scopes
+  return (
+    matrix.allows(`role:${permissionRole}`, resource, action, scope) ||
+    matrix.allows(`user:${auth.userId}`, resource, action, scope)
+  );
 }
 
+const NO_FIELD_RESTRICTIONS: ReadonlyMap<string, FieldPermission> = new Map();
+
 /**
- * RBAC utility: Get field-level permissions for a resource
+ * RBAC utility: Get field-level permissions for a resource.
+ * Served from the compiled permission matrix; the returned map is shared per role
+ * and resource and must not be modified.
  */
 export async function getFieldPermissions(
   prisma: PrismaClient,
   auth: AuthContext,
   resource: PermissionResource,
-): Promise<Map<string, FieldPermission>> {
-  const fieldPerms = new Map<string, FieldPermission>();
+): Promise<ReadonlyMap<string, FieldPermission>> {
+  // Unauthenticated callers are rejected by the routes; admin can view and edit
+  // all fields. Empty map = no restrictions.
+  if (!auth.userId || auth.role === 'admin') return NO_FIELD_RESTRICTIONS;
 
-  if (!auth.userId) return fieldPerms;
-
-  // Admin can view and edit all fields
-  if (auth.role === 'admin') {
-    // Return empty map = no restrictions (all fields allowed)
-    return fieldPerms;
-  }
-
-  const p: any = prisma;
-
-  // Get all field-level permissions for this resource and role
-  const permissions = await p.rolePermission.findMany({
-    where: {
-      OR: [
-        { role: auth.role },
-        { userId: auth.userId },
-      ],
-      permission: {
-        resource,
-        field: { not: null },
-      },
-    },
-    include: {
-      permission: true,
-    },
-  });
-
-  for (const rp of permissions) {
-    const perm = rp.permission;
-    if (!perm.field) continue;
+  const matrix = await getPermissionMatrix(prisma);
+  return matrix.fieldPermissions(auth.role, auth.userId, resource);
+}
 
-    const action = perm.action;
-    const canView = action === 'view' || action === 'view_all' || action === 'edit_all';
-    const canEdit = action === 'edit_all' || action === 'update';
+// field permissions -> base select -> projected select. Keyed by object identity:
+// both are stable while the permission matrix is current, and entries go away
+// with the matrix when it is reloaded.
+const selectCache = new WeakMap<object, WeakMap<object, Record<string, unknown>>>();
 
-    fieldPerms.set(perm.field, {
-      field: perm.field,
-      view: canView,
-      edit: canEdit,
-    });
+/**
+ * RBAC utility: Narrow a Prisma `select` to the fields the user may view, so hidden
+ * columns are never read. Projections are cached per role, resource and base select;
+ * pass a module-level constant as `baseSelect`.
+ */
+export async function getFieldSelect<S extends Record<string, unknown>>(
+  prisma: PrismaClient,
+  auth: AuthContext,
+  resource: PermissionResource,
+  baseSelect: S,
+): Promise<S> {
+  const fieldPerms = await getFieldPermissions(prisma, auth, resource);
+  if (fieldPerms.size === 0) return baseSelect;
+
+  let projections = selectCache.get(fieldPerms);
+  if (!projections) {
+    projections = new WeakMap();
+    selectCache.set(fieldPerms, projections);
   }
 
-  return fieldPerms;
+  let projected = projections.get(baseSelect);
+  if (!projected) {
+    projected = {};
+    for (const [field, value] of Object.entries(baseSelect)) {
+      // id is always needed to address the record
+      if (field === 'id' || fieldPerms.get(field)?.view !== false) {
+        projected[field] = value;
+      }
+    }
+    projections.set(baseSelect, projected);
+  }
+  return projected as S;
 }
 
 /**
@@ -131,78 +117,36 @@ export async function getVisibilityFilter(
   resource: PermissionResource,
   scope: PermissionScope = 'own',
 ): Promise<any> {
-  try {
-    if (!auth.userId) {
-      // No access if not authenticated
-      return { id: 'impossible-id-that-will-never-match' };
-    }
-
-    // Admin can see all (no filtering)
-    if (auth.role === 'admin') {
-      return {};
-    }
-
-    // Get user's sales scope for country-based filtering
-    let user;
-    try {
-      user = await prisma.user.findUnique({
-        where: { id: auth.userId },
-        select: { id: true, salesScope: true, managerId: true },
-      });
-    } catch (error: any) {
-      console.error('Error fetching user for visibility filter:', error);
-      console.error('User fetch error details:', error.message, error.stack);
-      // Return empty filter on error (allow access, but log the issue)
-      return {};
-    }
-
-    if (!user) {
-      console.warn(`User not found for userId: ${auth.userId}`);
-      return {};
-    }
-
-    // Build country filter based on sales scope
-    let countryFilter: any = {};
-    if (user.salesScope === 'domestic_sales') {
-      // Domestic sales users only see India records
-      countryFilter = { country: 'India' };
-    } else if (user.salesScope === 'export_sales') {
-      // Export sales users only see non-India records
-      countryFilter = { country: { not: 'India' } };
-    }
-    // If no salesScope, no country filtering (backward compatibility)
+  const userId = auth.userId;
+  if (!userId) {
+    // No access if not authenticated
+    return { id: 'impossible-id-that-will-never-match' };
+  }
 
-    // For 'all' scope, only apply country filtering (no ownership filtering)
-    if (scope === 'all') {
-      return countryFilter;
-    }
-  } catch (error: any) {
-    console.error('Unexpected error in getVisibilityFilter:', error);
-    console.error('getVisibilityFilter error stack:', error.stack);
-    // Return empty filter on unexpected error (fail open for now, but log)
+  // Admin can see all (no filtering)
+  if (auth.role === 'admin') {
     return {};
   }
 
-  // Get user's manager and team members for 'team' scope
-  if (scope === 'team') {
-    const user = await prisma.user.findUnique({
-      where: { id: auth.userId },
-      select: { id: true, managerId: true },
-    });
+  // Build country filter from the session's sales scope
+  let countryFilter: any = {};
+  if (auth.salesScope === 'domestic_sales') {
+    // Domestic sales users only see India records
+    countryFilter = { country: 'India' };
+  } else if (auth.salesScope === 'export_sales') {
+    // Export sales users only see non-India records
+    countryFilter = { country: { not: 'India' } };
+  }
+  // If no salesScope, no country filtering (backward compatibility)
 
-    if (!user) return { id: 'impossible-id-that-will-never-match' };
+  // For 'all' scope, only apply country filtering (no ownership filtering)
+  if (scope === 'all') {
+    return countryFilter;
+  }
 
-    // Get all team members (users with same manager, or user's direct reports)
-    const teamMemberIds = await prisma.user.findMany({
-      where: {
-        OR: [
-          { managerId: user.managerId }, // Same manager
-          { managerId: auth.userId }, // Direct reports
-          { id: auth.userId }, // Self
-        ],
-      },
-      select: { id: true },
-    }).then((users) => users.map((u) => u.id));
+  // Team members for 'team' scope: self, reports at any depth, and peers (cached)
+  if (scope === 'team') {
+    const teamMemberIds = await getTeamMemberIds(prisma, userId);
 
     // Apply filter based on resource type
     switch (resource) {
@@ -302,7 +246,7 @@ export async function getVisibilityFilter(
  */
 export function applyFieldPermissions<T extends Record<string, any>>(
   data: T,
-  fieldPerms: Map<string, FieldPermission>,
+  fieldPerms: ReadonlyMap<string, FieldPermission>,
   mode: 'view' | 'edit' = 'view',
 ): T {
   const result = { ...data };
@@ -1,4 +1,4 @@
-import type { PrismaClient } from '@prisma/client';
+import { Prisma, type PrismaClient } from '@prisma/client';
 
 export interface WeightedPipelineData {
   totalDeals: number;
@@ -221,27 +221,23 @@ export async function calculateRevenueProjection(
   const now = new Date();
   const historicalStart = new Date(now.getFullYear(), now.getMonth() - 6, 1);
 
-  const historicalInvoices = await prisma.invoice.findMany({
-    where: {
-      issueDate: { gte: historicalStart },
-    },
-    include: {
-      items: true,
-    },
-  });
+  // Monthly revenue from stored invoice subtotals
+  const historicalMonths: Array<{ month: string; invoiceCount: number; revenue: number }> = await prisma.$queryRaw`
+    SELECT
+      to_char("issueDate", 'YYYY-MM') AS "month",
+      COUNT(*)::int AS "invoiceCount",
+      COALESCE(SUM("subtotal"), 0)::float8 AS "revenue"
+    FROM "Invoice"
+    WHERE "issueDate" >= ${historicalStart}
+    GROUP BY 1
+  `;
 
   // Calculate monthly averages
   const monthlyRevenue: Record<string, number> = {};
-  for (const invoice of historicalInvoices) {
-    const month = `${invoice.issueDate.getFullYear()}-${String(invoice.issueDate.getMonth() + 1).padStart(2, '0')}`;
-    const total = invoice.items.reduce((sum, item) => {
-      const price = Number(item.unitPrice) || 0;
-      const qty = item.quantity;
-      const discount = (item.discountPct || 0) / 100;
-      return sum + price * qty * (1 - discount);
-    }, 0);
-    monthlyRevenue[month] = (monthlyRevenue[month] || 0) + total;
+  for (const { month, revenue } of historicalMonths) {
+    monthlyRevenue[month] = revenue;
   }
+  const historicalInvoiceCount = historicalMonths.reduce((sum, m) => sum + m.invoiceCount, 0);
 
   const monthlyValues = Object.values(monthlyRevenue);
   const historicalAverage = monthlyValues.length > 0 ? monthlyValues.reduce((a, b) => a + b, 0) / monthlyValues.length : 0;
@@ -270,8 +266,8 @@ export async function calculateRevenueProjection(
 
     // Confidence based on data quality
     let confidence: 'high' | 'medium' | 'low' = 'medium';
-    if (historicalInvoices.length > 20 && weightedPipeline.totalDeals > 10) confidence = 'high';
-    else if (historicalInvoices.length < 5 || weightedPipeline.totalDeals < 3) confidence = 'low';
+    if (historicalInvoiceCount > 20 && weightedPipeline.totalDeals > 10) confidence = 'high';
+    else if (historicalInvoiceCount < 5 || weightedPipeline.totalDeals < 3) confidence = 'low';
 
     projections.push({
       period,
@@ -470,7 +466,8 @@ export async function calculateSalesCycleMetrics(
 }
 
 /**
- * Calculate salesperson performance metrics
+ * Calculate salesperson performance metrics.
+ * Uses a fixed number of queries (reps, grouped quote totals, pipeline) regardless of team size.
  */
 export async function calculateSalespersonPerformance(
   prisma: PrismaClient,
@@ -491,61 +488,35 @@ export async function calculateSalespersonPerformance(
     select: { id: true, name: true, email: true },
   });
 
-  const performance: SalespersonPerformance[] = [];
-
-  for (const rep of salesReps) {
-    // Get deals for this sales rep
-    // Note: Deal doesn't have ownerId, so we'll use quotes/sales orders as proxy
-    const quotes = await prisma.quote.findMany({
-      where: {
-        ...(rep.id ? { salesRepId: rep.id } : {}),
-        ...(startDate || endDate
-          ? {
-              issueDate: {
-                ...(startDate ? { gte: startDate } : {}),
-                ...(endDate ? { lte: endDate } : {}),
-              },
-            }
-          : {}),
-      },
-      include: {
-        items: {
-          include: {
-            product: {
-              select: { unitPrice: true },
-            },
-          },
-        },
-      },
-    });
-
-    // Calculate metrics
-    const totalDeals = quotes.length;
-    // For now, we'll use quotes as proxy for deals
-    // In a real system, you'd track deal ownership separately
-
-    const totalRevenue = quotes.reduce((sum, quote) => {
-      return (
-        sum +
-        quote.items.reduce((itemSum, item) => {
-          const price = Number(item.product.unitPrice) || 0;
-          const qty = item.quantity;
-          const discount = (item.discountPct || 0) / 100;
-          return itemSum + price * qty * (1 - discount);
-        }, 0)
-      );
-    }, 0);
-
+  if (salesReps.length === 0) return [];
+
+  // Note: Deal doesn't have ownerId, so quotes are used as a proxy for deals.
+  // Quote value is priced at the product's list price, as before.
+  const conditions: Prisma.Sql[] = [Prisma.sql`q."salesRepId" IN (${Prisma.join(salesReps.map((rep) => rep.id))})`];
+  if (startDate) conditions.push(Prisma.sql`q."issueDate" >= ${startDate}`);
+  if (endDate) conditions.push(Prisma.sql`q."issueDate" <= ${endDate}`);
+
+  const quoteTotals: Array<{ salesRepId: string; totalDeals: number; totalRevenue: number }> = await prisma.$queryRaw`
+    SELECT
+      q."salesRepId" AS "salesRepId",
+      COUNT(DISTINCT q."id")::int AS "totalDeals",
+      COALESCE(SUM(p."unitPrice" * qi."quantity" * (1 - COALESCE(qi."discountPct", 0) / 100)), 0)::float8 AS "totalRevenue"
+    FROM "Quote" q
+    LEFT JOIN "QuoteItem" qi ON qi."quoteId" = q."id"
+    LEFT JOIN "Product" p ON p."id" = qi."productId"
+    WHERE ${Prisma.join(conditions, ' AND ')}
+    GROUP BY q."salesRepId"
+  `;
+  const totalsByRep = new Map(quoteTotals.map((row) => [row.salesRepId, row]));
+
+  // Deals carry no owner, so the weighted pipeline is the same for every rep; compute it once
+  const weightedPipeline = await calculateWeightedPipeline(prisma, { startDate, endDate });
+
+  const performance: SalespersonPerformance[] = salesReps.map((rep) => {
+    const { totalDeals = 0, totalRevenue = 0 } = totalsByRep.get(rep.id) ?? {};
     const avgDealSize = totalDeals > 0 ? totalRevenue / totalDeals : 0;
 
-    // Get weighted pipeline (simplified)
-    const weightedPipeline = await calculateWeightedPipeline(prisma, {
-      salesRepId: rep.id,
-      startDate,
-      endDate,
-    });
-
-    performance.push({
+    return {
       salespersonId: rep.id,
       salespersonName: rep.name || rep.email || 'Unknown',
       totalDeals,
@@ -556,9 +527,146 @@ export async function calculateSalespersonPerformance(
       avgDealSize,
       avgCycleDuration: 0, // TODO: Calculate from actual deals
       weightedPipelineValue: weightedPipeline.weightedValue,
+    };
+  });
+
+  return performance.sort((a, b) => b.totalRevenue - a.totalRevenue);
+}
+
+export interface SalesOrderPerformance {
+  salesRepId: string;
+  salesRepName: string;
+  salesRepEmail: string;
+  totalOrders: number;
+  totalOrderValue: number;
+  totalInvoiced: number;
+  totalPendingDispatch: number;
+  invoiceRate: number;
+  orders: Array<{
+    id: string;
+    orderNumber: string;
+    orderDate: string;
+    customerName: string;
+    value: number;
+  }>;
+}
+
+/**
+ * Sales order value, invoiced amount and pending dispatch per sales rep.
+ * Values come from stored document subtotals; quantities are summed in the database.
+ */
+export async function calculateSalesOrderPerformance(
+  prisma: PrismaClient,
+  filters: {
+    startDate?: Date;
+    endDate?: Date;
+    salesRepId?: string;
+  } = {},
+): Promise<SalesOrderPerformance[]> {
+  const { startDate, endDate, salesRepId } = filters;
+
+  const conditions: Prisma.Sql[] = [];
+  if (startDate) conditions.push(Prisma.sql`so."orderDate" >= ${startDate}`);
+  if (endDate) conditions.push(Prisma.sql`so."orderDate" <= ${endDate}`);
+  if (salesRepId) conditions.push(Prisma.sql`so."salesRepId" = ${salesRepId}`);
+  const where = conditions.length > 0 ? Prisma.sql`WHERE ${Prisma.join(conditions, ' AND ')}` : Prisma.empty;
+
+  const orders: Array<{
+    id: string;
+    orderNumber: string;
+    orderDate: Date;
+    customerName: string;
+    salesRepId: string;
+    salesRepName: string | null;
+    salesRepEmail: string | null;
+    orderValue: number;
+    orderedQty: number;
+    invoicedValue: number;
+    invoicedQty: number;
+  }> = await prisma.$queryRaw`
+    WITH orders AS (
+      SELECT so."id", so."orderNumber", so."orderDate", so."customerId", so."salesRepId", so."subtotal"
+      FROM "SalesOrder" so
+      ${where}
+    ),
+    order_items AS (
+      SELECT i."salesOrderId", SUM(i."quantity") AS qty
+      FROM "SalesOrderItem" i
+      JOIN orders o ON o."id" = i."salesOrderId"
+      GROUP BY i."salesOrderId"
+    ),
+    invoice_totals AS (
+      SELECT inv."salesOrderId", SUM(inv."subtotal") AS value
+      FROM "Invoice" inv
+      JOIN orders o ON o."id" = inv."salesOrderId"
+      GROUP BY inv."salesOrderId"
+    ),
+    invoice_items AS (
+      SELECT inv."salesOrderId", SUM(i."quantity") AS qty
+      FROM "InvoiceItem" i
+      JOIN "Invoice" inv ON inv."id" = i."invoiceId"
+      JOIN orders o ON o."id" = inv."salesOrderId"
+      GROUP BY inv."salesOrderId"
+    )
+    SELECT
+      o."id",
+      o."orderNumber",
+      o."orderDate",
+      c."companyName" AS "customerName",
+      u."id" AS "salesRepId",
+      u."name" AS "salesRepName",
+      u."email" AS "salesRepEmail",
+      o."subtotal"::float8 AS "orderValue",
+      COALESCE(oi.qty, 0)::float8 AS "orderedQty",
+      COALESCE(it.value, 0)::float8 AS "invoicedValue",
+      COALESCE(ii.qty, 0)::float8 AS "invoicedQty"
+    FROM orders o
+    JOIN "User" u ON u."id" = o."salesRepId"
+    JOIN "Customer" c ON c."id" = o."customerId"
+    LEFT JOIN order_items oi ON oi."salesOrderId" = o."id"
+    LEFT JOIN invoice_totals it ON it."salesOrderId" = o."id"
+    LEFT JOIN invoice_items ii ON ii."salesOrderId" = o."id"
+  `;
+
+  // Aggregate by sales person
+  const performanceMap = new Map<string, SalesOrderPerformance>();
+
+  for (const order of orders) {
+    let performance = performanceMap.get(order.salesRepId);
+    if (!performance) {
+      performance = {
+        salesRepId: order.salesRepId,
+        salesRepName: order.salesRepName || order.salesRepEmail || 'Unknown',
+        salesRepEmail: order.salesRepEmail || '',
+        totalOrders: 0,
+        totalOrderValue: 0,
+        totalInvoiced: 0,
+        totalPendingDispatch: 0,
+        invoiceRate: 0,
+        orders: [],
+      };
+      performanceMap.set(order.salesRepId, performance);
+    }
+
+    performance.totalOrders++;
+    performance.totalOrderValue += order.orderValue;
+    performance.totalInvoiced += order.invoicedValue;
+    // Pending dispatch = ordered - invoiced quantities
+    performance.totalPendingDispatch += order.orderedQty - order.invoicedQty;
+    performance.orders.push({
+      id: order.id,
+      orderNumber: order.orderNumber,
+      orderDate: order.orderDate.toISOString(),
+      customerName: order.customerName,
+      value: order.orderValue,
     });
   }
 
-  return performance.sort((a, b) => b.totalRevenue - a.totalRevenue);
+  return Array.from(performanceMap.values())
+    .map((perf) => ({
+      ...perf,
+      invoiceRate: perf.totalOrderValue > 0 ? (perf.totalInvoiced / perf.totalOrderValue) * 100 : 0,
+    }))
+    .sort((a, b) => b.totalOrderValue - a.totalOrderValue);
 }
 
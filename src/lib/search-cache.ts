@@ -0,0 +1,204 @@
+import type { PrismaClient } from '@prisma/client';
+import {
+  getSearchResultKey,
+  globalSearchWithStats,
+  type GlobalSearchOutcome,
+  type SearchOptions,
+} from './global-search';
+
+// Short TTL: other instances' writes are only seen once entries expire
+const CACHE_TTL_MS = 30 * 1000;
+const MAX_QUERIES_PER_USER = 50;
+const MAX_USERS = 500;
+
+export type SearchCacheStatus = 'hit' | 'narrowed' | 'miss' | 'bypass';
+
+interface CachedSearch {
+  query: string;
+  outcome: GlobalSearchOutcome;
+  // True when refinements can be answered by filtering: every match was returned
+  // (fewer than `limit`) by the index query, and each contains the query text
+  narrowable: boolean;
+  generation: number;
+  expiresAt: number;
+}
+
+// userId -> (scope|query -> entry); Map insertion order doubles as LRU order
+const userCaches = new Map<string, Map<string, CachedSearch>>();
+
+// Bumped on every write to a searchable entity; older entries are treated as stale
+let generation = 0;
+
+const stats = {
+  hits: 0,
+  narrowedHits: 0,
+  misses: 0,
+  bypasses: 0,
+  invalidations: 0,
+};
+
+/**
+ * Invalidate all cached search results (call after writes to searchable entities)
+ */
+export function invalidateSearchCache(): void {
+  generation++;
+  stats.invalidations++;
+}
+
+/**
+ * Hit-rate counters for the search cache
+ */
+export function getSearchCacheStats() {
+  const lookups = stats.hits + stats.narrowedHits + stats.misses;
+  let entries = 0;
+  for (const cache of userCaches.values()) {
+    entries += cache.size;
+  }
+
+  return {
+    ...stats,
+    lookups,
+    hitRate: lookups > 0 ? (stats.hits + stats.narrowedHits) / lookups : 0,
+    users: userCaches.size,
+    entries,
+    ttlMs: CACHE_TTL_MS,
+  };
+}
+
+function getScopeKey(options: SearchOptions): string {
+  const types = options.entityTypes ? [...options.entityTypes].sort().join(',') : '*';
+  return `${options.limit ?? 20}|${types}|${options.mode ?? 'index'}`;
+}
+
+function isFresh(entry: CachedSearch): boolean {
+  return entry.generation === generation && entry.expiresAt > Date.now();
+}
+
+function getUserCache(userId: string): Map<string, CachedSearch> {
+  let cache = userCaches.get(userId);
+  if (cache) {
+    // Refresh LRU position
+    userCaches.delete(userId);
+  } else {
+    cache = new Map();
+  }
+  userCaches.set(userId, cache);
+
+  if (userCaches.size > MAX_USERS) {
+    const oldestUser = userCaches.keys().next().value;
+    if (oldestUser !== undefined) userCaches.delete(oldestUser);
+  }
+
+  return cache;
+}
+
+/**
+ * Find the longest fresh, narrowable cached query that the new query refines
+ */
+function findSuperset(
+  cache: Map<string, CachedSearch>,
+  scopeKey: string,
+  searchTerm: string,
+): CachedSearch | null {
+  let best: CachedSearch | null = null;
+  for (const [key, entry] of cache) {
+    if (!key.startsWith(`${scopeKey}|`) || !entry.narrowable || !isFresh(entry)) continue;
+    if (!searchTerm.includes(entry.query)) continue;
+    if (!best || entry.query.length > best.query.length) {
+      best = entry;
+    }
+  }
+  return best;
+}
+
+/**
+ * Answer a refinement from a cached superset. Every substring match of the longer
+ * query is also a substring match of the cached one, so a substring filter over the
+ * superset's match text finds them all. Results keep the superset's relevance
+ * order; fuzzy (`<%`) matches of the longer query are not evaluated, which is why
+ * only supersets without fuzzy-only rows are narrowed.
+ */
+function narrow(superset: CachedSearch, searchTerm: string): GlobalSearchOutcome {
+  const matchText: Record<string, string> = {};
+  const results = superset.outcome.results.filter((result) => {
+    const key = getSearchResultKey(result);
+    const text = superset.outcome.matchText[key];
+    if (!text || !text.includes(searchTerm)) return false;
+    matchText[key] = text;
+    return true;
+  });
+
+  return {
+    results,
+    incomplete: false,
+    timedOut: [],
+    failed: [],
+    timings: { cache: 0 },
+    matchText,
+  };
+}
+
+/**
+ * Global search with a per-user LRU of recent queries.
+ * Exact repeats are served from cache; refinements of a narrowable cached query
+ * (e.g. "acm" -> "acme") are answered by narrowing the cached results.
+ */
+export async function cachedGlobalSearch(
+  prisma: PrismaClient,
+  query: string,
+  options: SearchOptions = {},
+): Promise<GlobalSearchOutcome & { cacheStatus: SearchCacheStatus }> {
+  const searchTerm = query.toLowerCase().trim();
+
+  if (!options.userId || searchTerm.length < 2) {
+    stats.bypasses++;
+    return { ...(await globalSearchWithStats(prisma, query, options)), cacheStatus: 'bypass' };
+  }
+
+  const scopeKey = getScopeKey(options);
+  const cacheKey = `${scopeKey}|${searchTerm}`;
+  const cache = getUserCache(options.userId);
+
+  const cached = cache.get(cacheKey);
+  if (cached && isFresh(cached)) {
+    stats.hits++;
+    cache.delete(cacheKey);
+    cache.set(cacheKey, cached);
+    return { ...cached.outcome, cacheStatus: 'hit' };
+  }
+
+  const superset = findSuperset(cache, scopeKey, searchTerm);
+  if (superset) {
+    stats.narrowedHits++;
+    return { ...narrow(superset, searchTerm), cacheStatus: 'narrowed' };
+  }
+
+  stats.misses++;
+  const generationAtStart = generation;
+  const outcome = await globalSearchWithStats(prisma, query, options);
+
+  // Don't cache partial results, or results that raced with a write
+  if (!outcome.incomplete && generationAtStart === generation) {
+    // Fan-out results (index unavailable) rank differently, so they are only reused as exact repeats
+    const fromIndex = 'index' in outcome.timings;
+    const hasFuzzyOnly = outcome.results.some(
+      (result) => !outcome.matchText[getSearchResultKey(result)]?.includes(searchTerm),
+    );
+
+    cache.delete(cacheKey);
+    cache.set(cacheKey, {
+      query: searchTerm,
+      outcome,
+      narrowable: fromIndex && !hasFuzzyOnly && outcome.results.length < (options.limit ?? 20),
+      generation,
+      expiresAt: Date.now() + CACHE_TTL_MS,
+    });
+
+    if (cache.size > MAX_QUERIES_PER_USER) {
+      const oldestKey = cache.keys().next().value;
+      if (oldestKey !== undefined) cache.delete(oldestKey);
+    }
+  }
+
+  return { ...outcome, cacheStatus: 'miss' };
+}
@@ -0,0 +1,118 @@
+import { getPrismaClient } from '@/lib/prisma';
+
+export const SESSION_TIMEOUT_MS = 30 * 60 * 1000; // 30 minutes of inactivity
+// Activity is recorded at most this often per session
+export const ACTIVITY_UPDATE_INTERVAL_MS = 60 * 1000;
+const FLUSH_INTERVAL_MS = 5 * 1000;
+const FLUSH_CHUNK_SIZE = 1000;
+
+// How far the stored lastActivityAt can trail real activity on some instance:
+// one recording interval plus one flush interval. Inactivity checks that only
+// have the stored value allow for this, so a session still in use on another
+// instance is never timed out.
+export const SESSION_ACTIVITY_MAX_LAG_MS = ACTIVITY_UPDATE_INTERVAL_MS + FLUSH_INTERVAL_MS;
+
+// sessionId -> latest activity (epoch ms) not yet written
+let pending = new Map<string, number>();
+let flushTimer: ReturnType<typeof setTimeout> | null = null;
+let flushing: Promise<void> | null = null;
+let shutdownHooksInstalled = false;
+
+/**
+ * Record activity for a session. Writes are coalesced per session and flushed
+ * in one batched UPDATE every few seconds.
+ */
+export function recordSessionActivity(sessionId: string, at: number = Date.now()): void {
+  const previous = pending.get(sessionId);
+  if (previous === undefined || at > previous) {
+    pending.set(sessionId, at);
+  }
+  installShutdownHooks();
+  scheduleFlush();
+}
+
+/**
+ * Activity recorded in this process but not yet written, if any
+ */
+export function getPendingSessionActivity(sessionId: string): number | undefined {
+  return pending.get(sessionId);
+}
+
+function scheduleFlush() {
+  if (flushTimer) return;
+  flushTimer = setTimeout(() => {
+    flushTimer = null;
+    flushSessionActivity().catch(() => {});
+  }, FLUSH_INTERVAL_MS);
+  // Don't keep the process alive just for this timer
+  flushTimer.unref?.();
+}
+
+/**
+ * Write all buffered activity timestamps. lastActivityAt only moves forward, so
+ * instances flushing in any order leave the newest value. Failed batches are
+ * put back and retried on the next flush.
+ */
+export async function flushSessionActivity(): Promise<void> {
+  if (flushing) await flushing;
+  if (pending.size === 0) return;
+
+  const batch = pending;
+  pending = new Map();
+
+  flushing = (async () => {
+    const entries = Array.from(batch.entries());
+    const prisma = await getPrismaClient();
+
+    for (let i = 0; i < entries.length; i += FLUSH_CHUNK_SIZE) {
+      const chunk = entries.slice(i, i + FLUSH_CHUNK_SIZE);
+      const ids = chunk.map(([sessionId]) => sessionId);
+      // Columns are timestamp without time zone holding UTC
+      const timestamps = chunk.map(([, at]) => new Date(at).toISOString());
+
+      try {
+        await prisma.$executeRaw`
+          UPDATE "Session" AS s
+          SET "lastActivityAt" = v.at
+          FROM (
+            SELECT UNNEST(${ids}::text[]) AS id, UNNEST(${timestamps}::timestamp(3)[]) AS at
+          ) AS v
+          WHERE s.id = v.id AND s."lastActivityAt" < v.at
+        `;
+      } catch (error) {
+        console.error('Failed to flush session activity:', error);
+        for (const [sessionId, at] of chunk) {
+          const newer = pending.get(sessionId);
+          if (newer === undefined || at > newer) pending.set(sessionId, at);
+        }
+      }
+    }
+  })();
+
+  try {
+    await flushing;
+  } finally {
+    flushing = null;
+    if (pending.size > 0) scheduleFlush();
+  }
+}
+
+function installShutdownHooks() {
+  if (shutdownHooksInstalled || typeof process === 'undefined' || typeof process.once !== 'function') return;
+  shutdownHooksInstalled = true;
+
+  process.once('beforeExit', () => {
+    flushSessionActivity().catch(() => {});
+  });
+
+  const flushOnSignal = (signal: NodeJS.Signals) => {
+    flushSessionActivity()
+      .catch(() => {})
+      .finally(() => {
+        // Our listener suppressed the default exit; re-raise if nobody else handles it
+        if (process.listenerCount(signal) === 0) process.kill(process.pid, signal);
+      });
+  };
+  process.once('SIGTERM', flushOnSignal);
+  process.once('SIGINT', flushOnSignal);
+}
@@ -0,0 +1,76 @@
+import { createHash } from 'crypto';
+import type { AuthContext } from './auth';
+
+// Short enough that changes made on another instance (which can't reach this
+// process's cache) are picked up quickly; local changes invalidate explicitly
+const SESSION_CACHE_TTL_MS = 30 * 1000;
+const MAX_SESSION_CACHE_ENTRIES = 5000;
+
+export interface CachedSession {
+  sessionId: string;
+  userId: string;
+  expiresAt: number;
+  lastActivityAt: number;
+  context: AuthContext;
+}
+
+// token hash -> entry; raw tokens are never kept in memory longer than a request
+const entries = new Map<string, { session: CachedSession; cachedAt: number }>();
+
+export function hashSessionToken(token: string): string {
+  return createHash('sha256').update(token).digest('hex');
+}
+
+/**
+ * Cached session for a token, or null if absent or older than the TTL
+ */
+export function getCachedSession(token: string): CachedSession | null {
+  const key = hashSessionToken(token);
+  const entry = entries.get(key);
+  if (!entry) return null;
+  if (Date.now() - entry.cachedAt > SESSION_CACHE_TTL_MS) {
+    entries.delete(key);
+    return null;
+  }
+  return entry.session;
+}
+
+export function cacheSession(token: string, session: CachedSession): void {
+  const key = hashSessionToken(token);
+  entries.delete(key);
+  entries.set(key, { session, cachedAt: Date.now() });
+
+  // Map insertion order is oldest-first
+  while (entries.size > MAX_SESSION_CACHE_ENTRIES) {
+    const oldestKey = entries.keys().next().value;
+    if (oldestKey === undefined) break;
+    entries.delete(oldestKey);
+  }
+}
+
+/**
+ * Drop the cached session for a token (logout)
+ */
+export function invalidateSessionToken(token: string): void {
+  entries.delete(hashSessionToken(token));
+}
+
+/**
+ * Drop the cached session with this session id (session terminated by id)
+ */
+export function invalidateSessionById(sessionId: string): void {
+  for (const [key, entry] of entries) {
+    if (entry.session.sessionId === sessionId) entries.delete(key);
+  }
+}
+
+/**
+ * Drop every cached session of a user (role, scope, email or password change,
+ * or sessions terminated in bulk). `exceptToken` keeps the caller's own session.
+ */
+export function invalidateUserSessions(userId: string, exceptToken?: string): void {
+  const keep = exceptToken ? hashSessionToken(exceptToken) : null;
+  for (const [key, entry] of entries) {
+    if (entry.session.userId === userId && key !== keep) entries.delete(key);
+  }
+}
@@ -1,4 +1,5 @@
 import type { PrismaClient } from '@prisma/client';
+import { invalidateSessionById, invalidateUserSessions } from './session-cache';
 import { parseUserAgent } from './user-agent-parser';
 
 export interface SessionInfo {
@@ -108,6 +109,7 @@ export async function terminateSession(
       userId, // Ensure user can only delete their own sessions (unless admin)
     },
   });
+  invalidateSessionById(sessionId);
 
   return result.count > 0;
 }
@@ -126,6 +128,7 @@ export async function terminateAllOtherSessions(
       token: { not: currentToken },
     },
   });
+  invalidateUserSessions(userId, currentToken);
 
   return result.count;
 }
@@ -1,6 +1,5 @@
 import { getPrismaClient } from '@/lib/prisma';
-
-const SESSION_TIMEOUT_MS = 30 * 60 * 1000; // 30 minutes of inactivity
+import { SESSION_ACTIVITY_MAX_LAG_MS, SESSION_TIMEOUT_MS } from '@/lib/session-activity';
 
 /**
  * Update session last activity timestamp
@@ -34,7 +33,7 @@ export async function isSessionTimedOut(token: string): Promise<boolean> {
 
   // Check if session has timed out due to inactivity
   const timeSinceLastActivity = Date.now() - session.lastActivityAt.getTime();
-  return timeSinceLastActivity > SESSION_TIMEOUT_MS;
+  return timeSinceLastActivity > SESSION_TIMEOUT_MS + SESSION_ACTIVITY_MAX_LAG_MS;
 }
 
 /**
@@ -43,7 +42,8 @@ export async function isSessionTimedOut(token: string): Promise<boolean> {
 export async function cleanupExpiredSessions(): Promise<number> {
   const prisma = await getPrismaClient();
   const now = new Date();
-  const timeoutThreshold = new Date(now.getTime() - SESSION_TIMEOUT_MS);
+  // Allow for activity buffered on other instances but not yet written
+  const timeoutThreshold = new Date(now.getTime() - SESSION_TIMEOUT_MS - SESSION_ACTIVITY_MAX_LAG_MS);
 
   // Delete sessions that are expired or timed out
   const result = await prisma.session.deleteMany({
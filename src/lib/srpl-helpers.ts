@@ -1,5 +1,5 @@
 import { PrismaClient } from '@prisma/client';
-import { generateSRPLId, ModuleCode } from './srpl-id-generator';
+import { generateSRPLId, reserveSRPLIdRange, ModuleCode } from './srpl-id-generator';
 
 /**
  * Helper function to create a record with auto-generated SRPL ID
@@ -39,14 +39,17 @@ export async function createManyWithSRPLId<T extends { srplId?: string | null }>
   moduleCode: ModuleCode,
   data: any[]
 ): Promise<{ count: number }> {
-  // Generate SRPL IDs for all records
-  for (const record of data) {
-    if (!record.srplId) {
-      record.srplId = await generateSRPLId({
-        moduleCode,
-        prisma,
-      });
-    }
+  // Reserve SRPL IDs for all records in a single round trip
+  const pending = data.filter((record) => !record.srplId);
+  if (pending.length > 0) {
+    const { ids } = await reserveSRPLIdRange({
+      moduleCode,
+      prisma,
+      count: pending.length,
+    });
+    pending.forEach((record, index) => {
+      record.srplId = ids[index];
+    });
   }
 
   const modelClient = (prisma as any)[model];
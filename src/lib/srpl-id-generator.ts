@@ -26,11 +26,276 @@ interface GenerateSRPLIdOptions {
   financialYear?: string;
 }
 
+/**
+ * Modules whose numbers appear on statutory/financial documents.
+ * These stay gapless by default; every other module may skip values.
+ */
+export const FISCAL_MODULE_CODES: ReadonlySet<ModuleCode> = new Set<ModuleCode>([
+  'PI', 'INV', 'CN', 'DN', 'DC', 'RCPT', 'PAY', 'PROF',
+]);
+
+// Default number of values a process reserves at once for gap-tolerant modules
+export const DEFAULT_ALLOCATION_BLOCK_SIZE = 50;
+
+// How long a SequenceConfig row is reused before it is re-read from the database
+const CONFIG_CACHE_TTL_MS = 60 * 1000;
+
+interface SequenceConfigRecord {
+  moduleCode: string;
+  useYearPrefix: boolean;
+  useFinancialYear: boolean;
+  financialYearStart: number;
+  padding: number;
+  allowGaps: boolean;
+  allocationBlockSize: number;
+}
+
+// Identifies one SequenceCounter row (module + optional year/FY segment)
+export interface CounterScope {
+  moduleCode: string;
+  year: number | null;
+  financialYear: string | null;
+}
+
+// Values reserved in the database but not yet handed out by this process
+interface SequenceBlock {
+  next: number;
+  end: number;
+}
+
+const configCache = new Map<string, { config: SequenceConfigRecord; expiresAt: number }>();
+const sequenceBlocks = new Map<string, SequenceBlock>();
+const pendingBlockReservations = new Map<string, Promise<SequenceBlock>>();
+
+/**
+ * Default SequenceConfig values for a module.
+ * Non-fiscal modules allow gaps and use block allocation; fiscal modules stay strictly sequential.
+ */
+export function getDefaultSequenceConfig(moduleCode: ModuleCode) {
+  const allowGaps = !FISCAL_MODULE_CODES.has(moduleCode);
+  return {
+    moduleCode,
+    useYearPrefix: false,
+    useFinancialYear: false,
+    financialYearStart: 4, // April
+    padding: 6,
+    allowGaps,
+    allocationBlockSize: allowGaps ? DEFAULT_ALLOCATION_BLOCK_SIZE : 1,
+  };
+}
+
+/**
+ * Drops cached sequence configuration so the next ID generation re-reads it.
+ * Call after SequenceConfig rows are changed.
+ */
+export function invalidateSequenceConfigCache(moduleCode?: string): void {
+  if (moduleCode) {
+    configCache.delete(moduleCode);
+  } else {
+    configCache.clear();
+  }
+}
+
+async function getSequenceConfig(p: any, moduleCode: ModuleCode): Promise<SequenceConfigRecord> {
+  const cached = configCache.get(moduleCode);
+  if (cached && cached.expiresAt > Date.now()) {
+    return cached.config;
+  }
+
+  let config = await p.sequenceConfig.findUnique({
+    where: { moduleCode },
+  });
+
+  if (!config) {
+    // Create default configuration
+    config = await p.sequenceConfig.upsert({
+      where: { moduleCode },
+      create: getDefaultSequenceConfig(moduleCode),
+      update: {},
+    });
+  }
+
+  configCache.set(moduleCode, { config, expiresAt: Date.now() + CONFIG_CACHE_TTL_MS });
+  return config;
+}
+
+function usesBlockAllocation(config: SequenceConfigRecord): boolean {
+  return config.allowGaps && config.allocationBlockSize > 1;
+}
+
+function getCounterKey(scope: CounterScope): string {
+  return `${scope.moduleCode}|${scope.year ?? ''}|${scope.financialYear ?? ''}`;
+}
+
+function formatSRPLId(scope: CounterScope, value: number, padding: number): string {
+  const sequence = String(value).padStart(padding, '0');
+
+  if (scope.financialYear) {
+    return `SRPL-${scope.moduleCode}-${scope.financialYear}-${sequence}`;
+  } else if (scope.year) {
+    return `SRPL-${scope.moduleCode}-${scope.year}-${sequence}`;
+  } else {
+    return `SRPL-${scope.moduleCode}-${sequence}`;
+  }
+}
+
+/**
+ * Creates the counter row for a scope if it does not exist yet.
+ * A transaction-scoped advisory lock serialises concurrent creators, since the
+ * (moduleCode, year, financialYear) unique index does not cover NULL segments.
+ *
+ * @param getInitialValue - Optional seed for the new counter (e.g. highest number already in use)
+ */
+async function ensureCounter(
+  p: any,
+  scope: CounterScope,
+  getInitialValue?: (tx: any) => Promise<number>
+): Promise<void> {
+  await p.$transaction(async (tx: any) => {
+    await tx.$executeRaw`SELECT pg_advisory_xact_lock(hashtext(${getCounterKey(scope)}))`;
+
+    const existing = await tx.sequenceCounter.findFirst({
+      where: {
+        moduleCode: scope.moduleCode,
+        year: scope.year,
+        financialYear: scope.financialYear,
+      },
+      select: { id: true },
+    });
+
+    if (existing) {
+      return;
+    }
+
+    await tx.sequenceCounter.create({
+      data: {
+        moduleCode: scope.moduleCode,
+        currentValue: getInitialValue ? await getInitialValue(tx) : 0,
+        year: scope.year,
+        financialYear: scope.financialYear,
+        lastResetAt: new Date(),
+      },
+    });
+  });
+}
+
+/**
+ * Atomically advances a counter by `count` and returns the first value of the reserved range.
+ * A single UPDATE ... RETURNING is used, so no explicit lock or Serializable transaction is needed.
+ * The stored currentValue is the high-water mark: every value up to it has been handed out or discarded.
+ *
+ * @param getInitialValue - Seed used if the counter row has to be created first
+ */
+export async function reserveCounterValues(
+  prisma: PrismaClient,
+  scope: CounterScope,
+  count: number,
+  getInitialValue?: (tx: any) => Promise<number>
+): Promise<number> {
+  const p: any = prisma;
+
+  for (let attempt = 0; attempt < 2; attempt++) {
+    const updated: Array<{ currentValue: number }> = await p.$queryRaw`
+      UPDATE "SequenceCounter"
+      SET "currentValue" = "currentValue" + ${count}, "updatedAt" = NOW()
+      WHERE id = (
+        SELECT id FROM "SequenceCounter"
+        WHERE "moduleCode" = ${scope.moduleCode}
+          AND "year" IS NOT DISTINCT FROM ${scope.year}
+          AND "financialYear" IS NOT DISTINCT FROM ${scope.financialYear}
+        ORDER BY "createdAt" ASC
+        LIMIT 1
+      )
+      RETURNING "currentValue"
+    `;
+
+    if (updated.length > 0) {
+      return Number(updated[0].currentValue) - count + 1;
+    }
+
+    await ensureCounter(p, scope, getInitialValue);
+  }
+
+  throw new Error(`Unable to reserve sequence values for ${scope.moduleCode}`);
+}
+
+/**
+ * Raises a counter to at least `value`, so values up to it are never handed out.
+ * Use when a number was assigned outside the counter (e.g. entered manually).
+ *
+ * @param getInitialValue - Seed used if the counter row has to be created first
+ */
+export async function advanceCounterTo(
+  prisma: PrismaClient,
+  scope: CounterScope,
+  value: number,
+  getInitialValue?: (tx: any) => Promise<number>
+): Promise<void> {
+  const p: any = prisma;
+
+  for (let attempt = 0; attempt < 2; attempt++) {
+    const updated: number = await p.$executeRaw`
+      UPDATE "SequenceCounter"
+      SET "currentValue" = GREATEST("currentValue", ${value}), "updatedAt" = NOW()
+      WHERE id = (
+        SELECT id FROM "SequenceCounter"
+        WHERE "moduleCode" = ${scope.moduleCode}
+          AND "year" IS NOT DISTINCT FROM ${scope.year}
+          AND "financialYear" IS NOT DISTINCT FROM ${scope.financialYear}
+        ORDER BY "createdAt" ASC
+        LIMIT 1
+      )
+    `;
+
+    if (updated > 0) {
+      return;
+    }
+
+    await ensureCounter(p, scope, getInitialValue);
+  }
+
+  throw new Error(`Unable to advance sequence counter for ${scope.moduleCode}`);
+}
+
+/**
+ * Hands out the next value from this process's in-memory block, reserving a new
+ * block from the database when the current one is exhausted. Concurrent callers
+ * share a single in-flight reservation per counter.
+ */
+async function takeBlockValue(p: any, scope: CounterScope, blockSize: number): Promise<number> {
+  const key = getCounterKey(scope);
+
+  for (;;) {
+    const block = sequenceBlocks.get(key);
+    if (block && block.next <= block.end) {
+      return block.next++;
+    }
+
+    let pending = pendingBlockReservations.get(key);
+    if (!pending) {
+      pending = reserveCounterValues(p, scope, blockSize)
+        .then((start) => {
+          const reserved = { next: start, end: start + blockSize - 1 };
+          sequenceBlocks.set(key, reserved);
+          return reserved;
+        })
+        .finally(() => {
+          pendingBlockReservations.delete(key);
+        });
+      pendingBlockReservations.set(key, pending);
+    }
+
+    await pending;
+  }
+}
+
 /**
  * Generates a unique SRPL ID for a module using atomic database operations.
  * Format: SRPL-<MODULE-CODE>-<SEQUENCE> or SRPL-<MODULE-CODE>-FY<YY>-<SEQUENCE>
  * 
  * This function is thread-safe and uses database-level locking to prevent race conditions.
+ * Modules configured with `allowGaps` and an `allocationBlockSize` > 1 are served from an
+ * in-memory block reserved with a single atomic UPDATE; unused values are skipped on restart.
  * 
  * @param options - Configuration options
  * @returns The generated SRPL ID
@@ -40,26 +305,10 @@ export async function generateSRPLId(
 ): Promise<string> {
   const { moduleCode, prisma, year, financialYear } = options;
 
-  // Get or create sequence configuration
   // Cast to any to access extended Prisma models (SequenceConfig, SequenceCounter)
   const p: any = prisma;
 
-  let config = await p.sequenceConfig.findUnique({
-    where: { moduleCode },
-  });
-
-  if (!config) {
-    // Create default configuration
-    config = await p.sequenceConfig.create({
-      data: {
-        moduleCode,
-        useYearPrefix: false,
-        useFinancialYear: false,
-        financialYearStart: 4, // April
-        padding: 6,
-      },
-    });
-  }
+  const config = await getSequenceConfig(p, moduleCode);
 
   // Determine if we need year/FY prefix
   const useYear = config.useYearPrefix && year;
@@ -67,6 +316,17 @@ export async function generateSRPLId(
   const currentYear = year || new Date().getFullYear();
   const currentFY = financialYear || getFinancialYear(new Date(), config.financialYearStart);
 
+  // Gap-tolerant modules are served from a per-process block of reserved values
+  if (usesBlockAllocation(config)) {
+    const scope: CounterScope = {
+      moduleCode,
+      year: useYear ? currentYear : null,
+      financialYear: useFY ? currentFY : null,
+    };
+    const value = await takeBlockValue(p, scope, config.allocationBlockSize);
+    return formatSRPLId(scope, value, config.padding);
+  }
+
   // Use a transaction with row-level locking to ensure atomicity
   const result = await prisma.$transaction(async (tx: any) => {
     // Build where clause for finding counter
@@ -144,6 +404,50 @@ export async function generateSRPLId(
   return result;
 }
 
+interface ReserveSRPLIdRangeOptions extends GenerateSRPLIdOptions {
+  count: number;
+}
+
+export interface SRPLIdRange {
+  start: number;
+  end: number;
+  ids: string[];
+}
+
+/**
+ * Reserves `count` contiguous SRPL IDs for a module in a single atomic statement.
+ * Use this for bulk inserts (createMany, imports) instead of calling generateSRPLId per row.
+ * The range is taken directly from the counter, so it is contiguous even for block-allocated modules.
+ *
+ * @param options - Configuration options plus the number of IDs to reserve
+ * @returns The first/last sequence values and the formatted IDs in order
+ */
+export async function reserveSRPLIdRange(
+  options: ReserveSRPLIdRangeOptions
+): Promise<SRPLIdRange> {
+  const { moduleCode, prisma, year, financialYear, count } = options;
+
+  if (!Number.isInteger(count) || count < 1) {
+    throw new Error(`Invalid SRPL ID range size: ${count}`);
+  }
+
+  const p: any = prisma;
+  const config = await getSequenceConfig(p, moduleCode);
+
+  const useYear = config.useYearPrefix && year;
+  const useFY = config.useFinancialYear && financialYear;
+  const scope: CounterScope = {
+    moduleCode,
+    year: useYear ? year : null,
+    financialYear: useFY ? financialYear : null,
+  };
+
+  const start = await reserveCounterValues(p, scope, count);
+  const ids = Array.from({ length: count }, (_, i) => formatSRPLId(scope, start + i, config.padding));
+
+  return { start, end: start + count - 1, ids };
+}
+
 /**
  * Gets the financial year string (e.g., 'FY25') for a given date
  */
@@ -174,13 +478,7 @@ export async function initializeSequenceCounters(prisma: PrismaClient): Promise<
     // Create config if it doesn't exist
     await (prisma as any).sequenceConfig.upsert({
       where: { moduleCode },
-      create: {
-        moduleCode,
-        useYearPrefix: false,
-        useFinancialYear: false,
-        financialYearStart: 4,
-        padding: 6,
-      },
+      create: getDefaultSequenceConfig(moduleCode),
       update: {},
     });
 
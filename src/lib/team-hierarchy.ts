@@ -0,0 +1,42 @@
+import type { PrismaClient } from '@prisma/client';
+import { CACHE_TAGS, getOrSet, invalidateTags } from './cache';
+
+// Reporting lines rarely change; changes made outside the app (SQL, seed) are
+// picked up within this TTL
+const TEAM_CACHE_TTL_MS = 5 * 60 * 1000;
+
+/**
+ * Ids of the users whose records count as `userId`'s team: the user, everyone
+ * reporting to them at any depth, and peers sharing their manager.
+ * Read from the UserReportingClosure table and cached per user.
+ */
+export async function getTeamMemberIds(prisma: PrismaClient, userId: string): Promise<string[]> {
+  const { value } = await getOrSet(
+    `team-members:${userId}`,
+    { ttlMs: TEAM_CACHE_TTL_MS, tags: [CACHE_TAGS.REPORTING_LINES] },
+    async () => {
+      const p: any = prisma;
+      const rows: Array<{ id: string }> = await p.$queryRaw`
+        SELECT c."descendantId" AS id
+        FROM "UserReportingClosure" c
+        WHERE c."ancestorId" = ${userId}
+        UNION
+        SELECT peer.id
+        FROM "User" me
+        JOIN "User" peer ON peer."managerId" = me."managerId"
+        WHERE me.id = ${userId}
+      `;
+      const ids = rows.map((row) => row.id);
+      // The closure is rebuilt by trigger; include self even if it lags a new user
+      return ids.includes(userId) ? ids : [userId, ...ids];
+    },
+  );
+  return value;
+}
+
+/**
+ * Drop cached teams after users are added, removed or change manager
+ */
+export async function invalidateTeamHierarchy(): Promise<void> {
+  await invalidateTags([CACHE_TAGS.REPORTING_LINES]);
+}